@@ -1,7 +1,35 @@
 """
 Actions module initialization
+
+Exports are resolved on first access (PEP 562), like the data and agents packages.
 """
 
-from .action_executor import ActionExecutor
+import importlib
+
+# Exported name -> submodule defining it
+_EXPORTS = {
+    'ActionExecutor': 'action_executor',
+    'ActionDispatcher': 'dispatcher',
+    'ACTION_CHANNELS': 'dispatcher',
+    'local_transports': 'dispatcher',
+    'ActionRequest': 'transports',
+    'Transport': 'transports',
+    'TransportError': 'transports',
+    'AuditTrailTransport': 'transports',
+    'SimulatedTransport': 'transports'
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
 
-__all__ = ['ActionExecutor']
\ No newline at end of file
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -2,17 +2,43 @@
 Action Execution Module (AEM)
 Simulates the execution of resolution actions based on adjudicator decisions
 
+Actions are written to the audit trail inline, or handed to an
+ActionDispatcher that delivers them to downstream channels asynchronously.
+With a ProgressJournal, every action is claimed by its idempotency key
+first, so an action journaled by an earlier (crashed) run is not repeated.
 """
 
-from utils import AuditLogger
-from data import KYC_DB
+from time import perf_counter
+
+from utils import AuditLogger, get_metrics, idempotency_key
+from data import get_kyc_store
+from .transports import ActionRequest
+
+# The histogram's _count doubles as the per-action execution counter (with a
+# dispatcher it measures hand-off only; see aars_dispatch_batch_seconds)
+_LATENCY = get_metrics().histogram(
+    "aars_action_seconds", "Action execution latency", ("action",)
+)
 
 
 class ActionExecutor:
     """Executes actions based on adjudication decisions"""
     
-    def __init__(self):
+    def __init__(self, store=None, dispatcher=None, journal=None):
+        """
+        Args:
+            store: KycStore to read profiles from (defaults to the process-wide store)
+            dispatcher: ActionDispatcher delivering actions asynchronously
+                        (None executes them inline on the audit trail)
+            journal: ProgressJournal recording executed actions (skips journaled ones)
+        """
         self.logger = AuditLogger()
+        self.store = store
+        self.dispatcher = dispatcher
+        self.journal = journal
+        if dispatcher is not None and journal is not None:
+            # An action only counts as executed once it was delivered
+            dispatcher.subscribe(self._delivered, self._failed)
     
     def execute(self, decision, alert_data):
         """
@@ -27,57 +53,87 @@ class ActionExecutor:
         subject_id = alert_data["subject_id"]
         scenario_code = alert_data["scenario_code"]
         
-        # Get customer name for personalization
-        customer_name = KYC_DB.get(subject_id, {}).get("name", subject_id)
-        risk = KYC_DB.get(subject_id, {}).get("risk_rating", "LOW")
+        # Get customer name for personalization (single profile lookup)
+        store = self.store if self.store is not None else get_kyc_store()
+        profile = store.get(subject_id) or {}
+        customer_name = profile.get("name", subject_id)
+        risk = profile.get("risk_rating", "LOW")
         # Route to appropriate action simulator
         if recommendation == "ESCALATE_FOR_SAR":
-            self._execute_sar_prep(alert_id, customer_name, decision)
+            action, render = "SAR_PREP", self._sar_prep_message
         elif recommendation == "REQUEST_INFORMATION":
             # IVR is specifically for dormant account verification (A-005)
             if risk == "LOW" or risk == "MEDIUM":
-                self._execute_rfi(alert_id, customer_name, decision)
+                action, render = "RFI_EMAIL", self._rfi_message
             else:
-                self._execute_ivr(alert_id, customer_name, decision)
+                action, render = "IVR_CALL", self._ivr_message
         elif recommendation == "CLOSE_FALSE_POSITIVE":
-            self._execute_close(alert_id, customer_name, decision)
-    
-    def _execute_sar_prep(self, alert_id, customer_name, decision):
-        """Simulate SAR (Suspicious Activity Report) preparation"""
-        print("\n" + "="*70)
-        print("ACTION EXECUTION")
-        print("="*70)
-        print(f"Action Executed: SAR Preparer Module Activated.")
-        print(f"Case [{alert_id}] pre-populated and routed to Human Queue.")
-        print(f"Rationale: {decision['rationale']}")
-        print("="*70 + "\n")
+            action, render = "CLOSE", self._close_message
+        else:
+            return
+
+        started = perf_counter()
+        journal, dispatcher = self.journal, self.dispatcher
+        key = None
+        if journal is not None or dispatcher is not None:
+            key = idempotency_key(alert_id, action)
+        if journal is not None and not journal.claim(key):
+            self.logger.log_agent_action(
+                "Action Executor", "Skipping %s for %s - already executed (key %s)", action, alert_id, key
+            )
+            return
+        try:
+            if dispatcher is not None:
+                lines = render(alert_id, customer_name, decision)
+                dispatcher.submit(
+                    ActionRequest(action, alert_id, subject_id, customer_name, decision, lines, key)
+                )
+            elif self.logger.enabled():
+                # Messages quote the rationale - only render them for an audit trail that shows them
+                self.logger.log_action_result(alert_id, action, render(alert_id, customer_name, decision))
+        except Exception:
+            if journal is not None:
+                journal.release(key)
+            raise
+        if journal is not None and dispatcher is None:
+            journal.record_action(key, alert_id, action)
+        _LATENCY.labels(action).observe(perf_counter() - started)
+
+    def _delivered(self, request):
+        if request.idempotency_key is not None:
+            self.journal.record_action(request.idempotency_key, request.alert_id, request.action)
+
+    def _failed(self, request, error):
+        if request.idempotency_key is not None:
+            self.journal.release(request.idempotency_key)
     
-    def _execute_rfi(self, alert_id, customer_name, decision):
-        """Simulate Request for Information (RFI) via email"""
-        print("\n" + "="*70)
-        print("ACTION EXECUTION")
-        print("="*70)
-        print(f"Action Executed: RFI via Email.")
-        print(f"Drafted message for Customer: {customer_name} requesting Source of Funds.")
-        print("="*70 + "\n")
+    def _sar_prep_message(self, alert_id, customer_name, decision):
+        """SAR (Suspicious Activity Report) preparation - case routed to the human queue"""
+        return [
+            "Action Executed: SAR Preparer Module Activated.",
+            f"Case [{alert_id}] pre-populated and routed to Human Queue.",
+            f"Rationale: {decision['rationale']}"
+        ]
     
-    def _execute_ivr(self, alert_id, customer_name, decision):
-        """Simulate IVR (Interactive Voice Response) call for verification"""
-        print("\n" + "="*70)
-        print("ACTION EXECUTION")
-        print("="*70)
-        print(f"Action Executed: IVR Call Initiated.")
-        print(f"Script ID 3 used for simple verification.")
-        print(f"Awaiting Customer Response...")
-        print("="*70 + "\n")
+    def _rfi_message(self, alert_id, customer_name, decision):
+        """Request for Information (RFI) via email"""
+        return [
+            "Action Executed: RFI via Email.",
+            f"Drafted message for Customer: {customer_name} requesting Source of Funds."
+        ]
     
-    def _execute_close(self, alert_id, customer_name, decision):
-        """Simulate closing alert as false positive"""
-        print("\n" + "="*70)
-        print("ACTION EXECUTION")
-        print("="*70)
-        print(f"Action Executed: Alert [{alert_id}] Closed as False Positive.")
-        print(f"Customer: {customer_name}")
-        print(f"Reason: {decision['rationale']}")
-        print("="*70 + "\n")
+    def _ivr_message(self, alert_id, customer_name, decision):
+        """IVR (Interactive Voice Response) call for verification"""
+        return [
+            "Action Executed: IVR Call Initiated.",
+            "Script ID 3 used for simple verification.",
+            "Awaiting Customer Response..."
+        ]
     
+    def _close_message(self, alert_id, customer_name, decision):
+        """Close the alert as a false positive"""
+        return [
+            f"Action Executed: Alert [{alert_id}] Closed as False Positive.",
+            f"Customer: {customer_name}",
+            f"Reason: {decision['rationale']}"
+        ]
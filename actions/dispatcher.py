@@ -0,0 +1,276 @@
+"""
+Action Dispatcher
+Asynchronous, batched delivery of resolution actions over per-channel worker pools
+
+Actions are routed to a channel (case management, email, IVR), each with
+its own bounded queue and a small pool of worker threads. A worker holds
+one transport connection and reuses it across batches; it drains whatever
+has queued up (up to the transport's max_batch) into a single send, so a
+slow channel batches more instead of falling further behind. Failed sends
+are retried with exponential backoff and jitter on a fresh connection.
+
+submit() only enqueues - it blocks solely when a channel's queue is full -
+so adjudication throughput is not gated by downstream latency. flush()
+waits for everything submitted so far; close() flushes, stops the workers
+and returns every action that could not be delivered, so a caller without
+a failure callback still learns about them.
+"""
+
+import queue
+import random
+import threading
+import time
+from time import perf_counter
+
+from utils import get_metrics
+from .transports import AuditTrailTransport, TransportError
+
+# Resolution action -> downstream channel
+ACTION_CHANNELS = {
+    "SAR_PREP": "case_management",
+    "CLOSE": "case_management",
+    "RFI_EMAIL": "email",
+    "IVR_CALL": "ivr"
+}
+
+_BATCH_LATENCY = get_metrics().histogram(
+    "aars_dispatch_batch_seconds", "Transport send latency per batch", ("channel",)
+)
+_DISPATCHED = get_metrics().counter(
+    "aars_dispatched_total", "Actions dispatched by outcome", ("channel", "status")
+)
+_RETRIES = get_metrics().counter(
+    "aars_dispatch_retries_total", "Batch send retries", ("channel",)
+)
+
+_STOP = object()
+
+
+def local_transports(latency=0.0):
+    """Stand-in transports for every channel, writing actions to the audit trail"""
+    return {
+        "case_management": AuditTrailTransport(max_batch=50, latency=latency),
+        "email": AuditTrailTransport(max_batch=100, latency=latency),
+        "ivr": AuditTrailTransport(max_batch=1, latency=latency)
+    }
+
+
+class _Channel:
+    """Bounded queue and worker threads delivering one channel's actions"""
+
+    def __init__(self, name, transport, dispatcher, workers, max_queue):
+        self.name = name
+        self.transport = transport
+        self.dispatcher = dispatcher
+        self.queue = queue.Queue(maxsize=max_queue)
+        self.batch_size = max(1, min(dispatcher.batch_size or transport.max_batch, transport.max_batch))
+        self.delivered = 0
+        self.failed = 0
+        self.retries = 0
+        self.failures = []      # (request, error) of every undelivered action
+        self._random = random.Random()
+        self._lock = threading.Lock()
+        self._workers = [
+            threading.Thread(target=self._run, name=f"aars-dispatch-{name}-{index}", daemon=True)
+            for index in range(workers)
+        ]
+        for worker in self._workers:
+            worker.start()
+
+    def stop(self):
+        for _ in self._workers:
+            self.queue.put(_STOP)
+        for worker in self._workers:
+            worker.join()
+
+    def _run(self):
+        connection = None
+        stopping = False
+        linger = self.dispatcher.linger
+        while not stopping:
+            item = self.queue.get()
+            if item is _STOP:
+                self.queue.task_done()
+                break
+            batch = [item]
+            deadline = time.monotonic() + linger
+            while len(batch) < self.batch_size:
+                try:
+                    remaining = deadline - time.monotonic()
+                    item = self.queue.get(timeout=remaining) if remaining > 0 else self.queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+            connection = self._deliver(batch, connection)
+            for _ in range(len(batch) + stopping):
+                self.queue.task_done()
+        if connection is not None:
+            self._disconnect(connection)
+
+    def _deliver(self, batch, connection):
+        """Send one batch with retries - returns the connection to reuse (or None)"""
+        dispatcher = self.dispatcher
+        attempt = 0
+        while True:
+            try:
+                if connection is None:
+                    connection = self.transport.connect()
+                started = perf_counter()
+                self.transport.send(connection, batch)
+            except Exception as error:
+                if connection is not None:
+                    self._disconnect(connection)
+                    connection = None
+                if not isinstance(error, TransportError) or attempt >= dispatcher.retries:
+                    self._fail(batch, error)
+                    return None
+                # Exponential backoff with jitter so workers do not retry in lockstep
+                delay = min(dispatcher.max_backoff, dispatcher.backoff * 2 ** attempt)
+                attempt += 1
+                with self._lock:
+                    self.retries += 1
+                _RETRIES.labels(self.name).inc()
+                time.sleep(delay * self._random.uniform(0.5, 1.0))
+                continue
+            _BATCH_LATENCY.labels(self.name).observe(perf_counter() - started)
+            _DISPATCHED.labels(self.name, "delivered").inc(len(batch))
+            with self._lock:
+                self.delivered += len(batch)
+            self._notify(dispatcher._delivered_callbacks, batch)
+            return connection
+
+    def _fail(self, batch, error):
+        _DISPATCHED.labels(self.name, "failed").inc(len(batch))
+        with self._lock:
+            self.failed += len(batch)
+            self.failures.extend((request, error) for request in batch)
+        self._notify(self.dispatcher._failure_callbacks, batch, error)
+
+    @staticmethod
+    def _notify(callbacks, batch, *args):
+        for callback in callbacks:
+            for request in batch:
+                try:
+                    callback(request, *args)
+                except Exception:
+                    pass
+
+    def _disconnect(self, connection):
+        try:
+            self.transport.disconnect(connection)
+        except Exception:
+            pass
+
+
+class ActionDispatcher:
+    """Routes ActionRequests to per-channel queues drained by pooled transport workers"""
+
+    def __init__(self, transports=None, workers=2, max_queue=1000, batch_size=None,
+                 linger=0.0, retries=3, backoff=0.1, max_backoff=5.0,
+                 on_delivered=None, on_failure=None):
+        """
+        Args:
+            transports: Dict of channel -> Transport (defaults to local_transports())
+            workers: Worker threads (and pooled connections) per channel, or a
+                     dict of channel -> count
+            max_queue: Capacity of each channel queue - submit() blocks when full
+            batch_size: Cap on batch size (defaults to each transport's max_batch)
+            linger: Seconds a worker waits for a partial batch to fill
+            retries: Retries per batch after a TransportError
+            backoff: Initial retry delay in seconds (doubles per attempt)
+            max_backoff: Upper bound on the retry delay
+            on_delivered: Callable (request) for every delivered action
+            on_failure: Callable (request, error) for actions that could not be delivered
+        """
+        transports = local_transports() if transports is None else transports
+        missing = set(ACTION_CHANNELS.values()) - set(transports)
+        if missing:
+            raise ValueError(f"no transport for channels: {', '.join(sorted(missing))}")
+        self.batch_size = batch_size
+        self.linger = linger
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self._delivered_callbacks = []
+        self._failure_callbacks = []
+        self.subscribe(on_delivered, on_failure)
+        self._closed = False
+        self._channels = {
+            name: _Channel(
+                name, transport, self,
+                workers.get(name, 1) if isinstance(workers, dict) else workers,
+                max_queue
+            )
+            for name, transport in transports.items()
+        }
+
+    def subscribe(self, on_delivered=None, on_failure=None):
+        """Add delivery / failure callbacks (called from worker threads, per request)"""
+        if on_delivered is not None:
+            self._delivered_callbacks.append(on_delivered)
+        if on_failure is not None:
+            self._failure_callbacks.append(on_failure)
+
+    def submit(self, request):
+        """
+        Queue one ActionRequest for delivery
+
+        Raises:
+            ValueError: Unknown action
+            RuntimeError: Dispatcher already closed
+        """
+        if self._closed:
+            raise RuntimeError("dispatcher is closed")
+        channel = ACTION_CHANNELS.get(request.action)
+        if channel is None:
+            raise ValueError(f"no channel for action {request.action}")
+        self._channels[channel].queue.put(request)
+
+    def flush(self):
+        """Block until every action submitted so far was delivered or failed"""
+        for channel in self._channels.values():
+            channel.queue.join()
+
+    def close(self):
+        """
+        Deliver outstanding actions, stop the workers and close the transports
+
+        Returns:
+            List of (ActionRequest, exception) for every action that could not be
+            delivered, retries included (also on repeated calls)
+        """
+        if not self._closed:
+            self._closed = True
+            for channel in self._channels.values():
+                channel.stop()
+                channel.transport.close()
+        return self.failures()
+
+    def failures(self):
+        """(ActionRequest, exception) of every action that failed so far"""
+        failures = []
+        for channel in self._channels.values():
+            with channel._lock:
+                failures.extend(channel.failures)
+        return failures
+
+    def stats(self):
+        """Per-channel delivered / failed / retries / queued counts"""
+        return {
+            name: {
+                "delivered": channel.delivered,
+                "failed": channel.failed,
+                "retries": channel.retries,
+                "queued": channel.queue.qsize()
+            }
+            for name, channel in self._channels.items()
+        }
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
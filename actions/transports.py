@@ -0,0 +1,117 @@
+"""
+Action Transports
+Pluggable delivery of resolution actions to downstream channels (case management, email, IVR)
+
+A transport opens connections with connect() and delivers a batch of
+ActionRequests over one of them with send(). The dispatcher keeps one
+connection per channel worker and reuses it across batches, so connect()
+is where a real transport builds its session / client. send() raises
+TransportError for failures worth retrying; any other exception fails the
+batch immediately.
+
+The local transports stand in for the real systems: AuditTrailTransport
+writes the action to the audit trail exactly as the synchronous executor
+does, SimulatedTransport adds latency and injected failures and records
+what it delivered.
+"""
+
+import random
+import threading
+import time
+from collections import namedtuple
+
+from utils import AuditLogger
+
+# One action bound for a downstream channel - lines are the rendered message,
+# idempotency_key lets the downstream system drop a repeat after a restart
+ActionRequest = namedtuple(
+    "ActionRequest",
+    ["action", "alert_id", "subject_id", "customer_name", "decision", "lines", "idempotency_key"],
+    defaults=(None,)
+)
+
+
+class TransportError(Exception):
+    """Retryable delivery failure (timeouts, 5xx, dropped connections)"""
+
+
+class Transport:
+    """Base transport - delivers batches of ActionRequests to one channel"""
+
+    # Largest batch the downstream system accepts in one request
+    max_batch = 1
+
+    def connect(self):
+        """Open a connection (returned object is passed back to send / disconnect)"""
+        return None
+
+    def send(self, connection, requests):
+        """
+        Deliver a batch of requests
+
+        Args:
+            connection: Object returned by connect()
+            requests: List of ActionRequest (at most max_batch)
+
+        Raises:
+            TransportError: Delivery failed and may be retried
+        """
+        raise NotImplementedError
+
+    def disconnect(self, connection):
+        """Release a connection (also called after a failed send)"""
+
+    def close(self):
+        """Release resources shared by all connections"""
+
+
+class AuditTrailTransport(Transport):
+    """Local stand-in writing each action to the audit trail"""
+
+    def __init__(self, max_batch=100, latency=0.0):
+        """
+        Args:
+            max_batch: Largest batch per send
+            latency: Simulated round-trip seconds per send
+        """
+        self.max_batch = max_batch
+        self.latency = latency
+        self.logger = AuditLogger()
+
+    def send(self, connection, requests):
+        if self.latency:
+            time.sleep(self.latency)
+        for request in requests:
+            self.logger.log_action_result(request.alert_id, request.action, request.lines)
+
+
+class SimulatedTransport(Transport):
+    """
+    Local stand-in for a slow, flaky downstream system
+
+    Each send() sleeps latency + per_item * len(batch) and fails with
+    probability failure_rate (raising TransportError). Delivered requests are
+    appended to `delivered`; `connections` counts connections opened.
+    """
+
+    def __init__(self, latency=0.05, per_item=0.0, failure_rate=0.0, max_batch=50, seed=None):
+        self.latency = latency
+        self.per_item = per_item
+        self.failure_rate = failure_rate
+        self.max_batch = max_batch
+        self.delivered = []
+        self.connections = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def connect(self):
+        with self._lock:
+            self.connections += 1
+            return self.connections
+
+    def send(self, connection, requests):
+        time.sleep(self.latency + self.per_item * len(requests))
+        with self._lock:
+            if self.failure_rate and self._random.random() < self.failure_rate:
+                raise TransportError(f"simulated failure on connection {connection}")
+            self.delivered.extend(requests)
@@ -1,16 +1,52 @@
 """
 Agents module initialization
 Exports all agent classes
+
+Exports are resolved on first access (PEP 562), as in the data package:
+a command only imports the agents - and their asyncio, multiprocessing
+and SQLite dependencies - it actually uses.
 """
 
-from .orchestrator import OrchestratorAgent
-from .investigator import InvestigatorAgent
-from .context_agent import ContextGathererAgent
-from .adjudicator import AdjudicatorAgent
-
-__all__ = [
-    'OrchestratorAgent',
-    'InvestigatorAgent', 
-    'ContextGathererAgent',
-    'AdjudicatorAgent'
-]
\ No newline at end of file
+import importlib
+
+# Exported name -> submodule defining it
+_EXPORTS = {
+    'OrchestratorAgent': 'orchestrator',
+    'InvestigatorAgent': 'investigator',
+    'ContextGathererAgent': 'context_agent',
+    'AdjudicatorAgent': 'adjudicator',
+    'AlertCoalescer': 'coalescer',
+    'AlertScheduler': 'scheduler',
+    'DecisionMemo': 'decision_memo',
+    'get_decision_memo': 'decision_memo',
+    'set_decision_memo': 'decision_memo',
+    'RuleCompileError': 'rule_engine',
+    'RuleSet': 'rule_engine',
+    'compile_rules': 'rule_engine',
+    'RuleSetWatcher': 'rule_sets',
+    'get_rule_set': 'rule_sets',
+    'set_rule_set': 'rule_sets',
+    'load_rule_set': 'rule_sets',
+    'write_rule_set': 'rule_sets',
+    'ReplayReport': 'replay',
+    'replay': 'replay',
+    'Broker': 'broker',
+    'LocalBroker': 'broker',
+    'ShardCoordinator': 'sharding',
+    'shard_of': 'sharding'
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
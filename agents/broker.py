@@ -0,0 +1,161 @@
+"""
+Shard Broker
+Named FIFO topics connecting the shard coordinator with its shard node processes
+
+The coordinator publishes alert chunks to one topic per shard and reads
+results from a shared topic; nodes do the opposite. A broker is started by
+the coordinator and handed to each node process, where it reconnects - so
+it must survive pickling (and forking) as a client of the same topics.
+
+LocalBroker serves the topics from a thread of the coordinating process
+over TCP on localhost (multiprocessing.connection, authenticated with a
+random key). In that process put / get go straight to the queues; node
+processes keep one connection each. Implement Broker.start/put/get/close
+against a real message system to spread nodes over several hosts.
+"""
+
+import os
+import queue
+import socket
+import threading
+from multiprocessing.connection import Client, Listener
+
+
+class Broker:
+    """Base broker - unbounded FIFO topics created on first use"""
+
+    def start(self):
+        """Start serving topics (called once, by the coordinator)"""
+
+    def put(self, topic, message):
+        """Append a picklable message to a topic"""
+        raise NotImplementedError
+
+    def get(self, topic, timeout=None):
+        """
+        Remove and return the oldest message of a topic
+
+        Args:
+            topic: Topic name
+            timeout: Seconds to wait for a message (None waits indefinitely)
+
+        Raises:
+            queue.Empty: No message arrived within timeout
+        """
+        raise NotImplementedError
+
+    def close(self):
+        """Stop serving topics / drop connections"""
+
+
+class LocalBroker(Broker):
+    """Broker served over TCP on localhost by a thread of the coordinating process"""
+
+    def __init__(self, host="127.0.0.1", port=0, authkey=None):
+        """
+        Args:
+            host: Interface to listen on
+            port: TCP port (0 picks a free one)
+            authkey: Shared secret of the connections (random by default)
+        """
+        self.address = (host, port)
+        self.authkey = authkey or os.urandom(16)
+        self._owner = None          # pid serving the topics
+        self._topics = {}
+        self._topics_lock = threading.Lock()
+        self._listener = None
+        self._client = None
+        self._client_pid = None
+
+    def start(self):
+        self._listener = Listener(self.address, authkey=self.authkey)
+        self.address = self._listener.address
+        self._owner = os.getpid()
+        threading.Thread(target=self._accept, name="aars-broker", daemon=True).start()
+
+    def put(self, topic, message):
+        if self._owner == os.getpid():
+            self._topic(topic).put(message)
+        else:
+            # No reply - messages on one connection stay in order
+            self._connection().send(("put", topic, message))
+
+    def get(self, topic, timeout=None):
+        if self._owner == os.getpid():
+            return self._topic(topic).get(timeout=timeout)
+        connection = self._connection()
+        connection.send(("get", topic, timeout))
+        found, message = connection.recv()
+        if not found:
+            raise queue.Empty
+        return message
+
+    def close(self):
+        if self._client is not None and self._client_pid == os.getpid():
+            self._client.close()
+        self._client = None
+        if self._listener is not None and self._owner == os.getpid():
+            self._listener.close()
+            self._listener = None
+
+    def __getstate__(self):
+        # Spawned nodes get a client of the same topics, never the server side
+        return {"address": self.address, "authkey": self.authkey, "owner": self._owner}
+
+    def __setstate__(self, state):
+        self.__init__(state["address"][0], state["address"][1], state["authkey"])
+        self._owner = state["owner"]
+
+    def _connection(self):
+        # Forked nodes inherit the object - connect anew in every process
+        if self._client is None or self._client_pid != os.getpid():
+            self._client = Client(self.address, authkey=self.authkey)
+            _no_delay(self._client)
+            self._client_pid = os.getpid()
+        return self._client
+
+    def _topic(self, name):
+        topic = self._topics.get(name)
+        if topic is None:
+            with self._topics_lock:
+                topic = self._topics.setdefault(name, queue.Queue())
+        return topic
+
+    def _accept(self):
+        while True:
+            try:
+                connection = self._listener.accept()
+            except Exception:
+                # Listener closed (or a client failed authentication)
+                if self._listener is None:
+                    return
+                continue
+            _no_delay(connection)
+            threading.Thread(
+                target=self._serve, args=(connection,), name="aars-broker-client", daemon=True
+            ).start()
+
+    def _serve(self, connection):
+        with connection:
+            while True:
+                try:
+                    op, topic, payload = connection.recv()
+                except (EOFError, OSError):
+                    return
+                if op == "put":
+                    self._topic(topic).put(payload)
+                    continue
+                try:
+                    reply = (True, self._topic(topic).get(timeout=payload))
+                except queue.Empty:
+                    reply = (False, None)
+                try:
+                    connection.send(reply)
+                except OSError:
+                    return
+
+
+def _no_delay(connection):
+    """Disable Nagle's algorithm - an unanswered put followed by a get would stall on delayed ACKs"""
+    with socket.fromfd(connection.fileno(), socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
@@ -0,0 +1,141 @@
+"""
+Alert Coalescer
+Investigates duplicate (subject_id, scenario_code) alerts once and fans the decision out
+
+The first alert for a subject / scenario opens a group that stays open for
+`window` seconds; later alerts with the same key inside the window join it
+instead of being investigated. Once the leader's result is known, every
+member gets a copy of the decision (with its own alert_id and a
+coalesced_with reference) and is linked to the leader in the audit trail.
+A leader failure is fanned out as the members' error.
+
+Time comes from the alert's `timestamp` field (epoch seconds or ISO 8601)
+when present, otherwise from arrival time.
+"""
+
+import time
+from collections import deque
+
+from data.feature_engine import parse_timestamp
+from data.records import Decision
+from utils import AuditLogger, get_metrics
+
+_COALESCED = get_metrics().counter(
+    "aars_alerts_coalesced_total", "Alerts answered by an earlier alert's decision", ("scenario",)
+)
+
+
+class _Group:
+    """Leader alert, its result once known, and members still waiting for it"""
+
+    def __init__(self, leader, start):
+        self.leader = leader
+        self.start = start
+        self.result = None
+        self.waiting = []
+
+
+class AlertCoalescer:
+    """Groups duplicate alerts in a time window so only the first is processed"""
+
+    def __init__(self, window=300.0, time_field="timestamp", clock=time.monotonic):
+        """
+        Args:
+            window: Seconds after a group's first alert during which duplicates join it
+            time_field: Alert field holding the event time (arrival time if absent)
+            clock: Arrival-time source for alerts without time_field
+        """
+        self.window = window
+        self.time_field = time_field
+        self.clock = clock
+        self.coalesced = 0
+        self.logger = AuditLogger()
+        self._open = {}          # (subject_id, scenario_code) -> open _Group
+        self._expiry = deque()   # (start, key, group) in arrival order
+        self._leaders = {}       # id(leader alert) -> _Group awaiting its result
+        self._ready = deque()    # (member, group) whose leader result is known
+        self._watermark = None
+
+    def leaders(self, alerts):
+        """
+        Yield only the alerts that must be processed (group leaders)
+
+        Members are held back and released by fan_out() with the leader's result.
+        """
+        for alert in alerts:
+            now = self._time(alert)
+            self._expire(now)
+            key = (alert["subject_id"], alert["scenario_code"])
+            group = self._open.get(key)
+            if group is not None and abs(now - group.start) <= self.window:
+                self.coalesced += 1
+                if group.result is None:
+                    group.waiting.append(alert)
+                else:
+                    self._ready.append((alert, group))
+                continue
+            group = _Group(alert, now)
+            self._open[key] = group
+            self._expiry.append((now, key, group))
+            self._leaders[id(alert)] = group
+            yield alert
+
+    def fan_out(self, results):
+        """
+        Pass leader BatchResults through, each followed by its members' results
+
+        Args:
+            results: BatchResults for the alerts yielded by leaders()
+
+        Yields:
+            BatchResult for every input alert (members right after their leader,
+            or after the next result when they arrived once it was known)
+        """
+        for result in results:
+            yield result
+            group = self._leaders.pop(id(result.alert), None)
+            if group is not None:
+                group.result = result
+                waiting, group.waiting = group.waiting, []
+                for member in waiting:
+                    yield self._member_result(member, result)
+            yield from self._drain_ready()
+        # Trailing duplicates of leaders already answered arrive after the last result
+        yield from self._drain_ready()
+
+    def _drain_ready(self):
+        while self._ready:
+            member, group = self._ready.popleft()
+            yield self._member_result(member, group.result)
+
+    def _member_result(self, member, result):
+        leader = result.alert
+        _COALESCED.labels(member["scenario_code"]).inc()
+        self.logger.log_alert_linked(
+            member["alert_id"], leader["alert_id"], member["subject_id"], member["scenario_code"]
+        )
+        if result.error is not None:
+            return type(result)(member, None, f"coalesced with {leader['alert_id']}: {result.error}")
+        decision = Decision.from_dict(result.decision).replace(
+            alert_id=member["alert_id"], coalesced_with=leader["alert_id"]
+        )
+        return type(result)(member, decision, None)
+
+    def _time(self, alert):
+        value = alert.get(self.time_field)
+        if value in (None, ""):
+            return self.clock()
+        try:
+            return parse_timestamp(value)
+        except (TypeError, ValueError):
+            return self.clock()
+
+    def _expire(self, now):
+        # Groups are closed against the latest time seen, so late events do not reopen them
+        if self._watermark is None or now > self._watermark:
+            self._watermark = now
+        expiry, open_groups = self._expiry, self._open
+        while expiry and self._watermark - expiry[0][0] > self.window:
+            _, key, group = expiry.popleft()
+            if open_groups.get(key) is group:
+                del open_groups[key]
@@ -3,50 +3,118 @@ Context Gatherer Agent (Spoke)
 Responsible for retrieving customer KYC profiles and contextual information
 """
 
-from data import KYC_DB
-from utils import AuditLogger
+from time import perf_counter
+
+from data import get_kyc_store
+from data.records import Evidence
+from utils import AuditLogger, WARNING, get_metrics
+
+_LATENCY = get_metrics().histogram(
+    "aars_context_seconds", "Context Gatherer Agent latency per alert"
+)
+_LOOKUPS = get_metrics().counter(
+    "aars_context_lookups_total", "KYC profile lookups by status", ("status",)
+)
 
 
 class ContextGathererAgent:
     """Retrieves customer profile and risk context"""
-    
-    def __init__(self):
+
+    def __init__(self, store=None):
+        """
+        Args:
+            store: KycStore to read from (defaults to the process-wide store)
+        """
         self.name = "Context Gatherer Agent"
         self.logger = AuditLogger()
-    
+        self.store = store
+        self._prefetched = {}
+
     def gather_context(self, alert_data):
         """
         Simulate querying the KYC database
-        
+
         Args:
             alert_data: Dictionary containing alert_id, scenario_code, subject_id
-            
+
         Returns:
-            Dictionary of customer context
+            Evidence record (status, data, source) of the customer's KYC profile
         """
+        started = perf_counter()
         subject_id = alert_data["subject_id"]
-        
+
+        self._log_query(subject_id)
+        kyc_profile = self._lookup(subject_id)
+        return self._record(started, self._build_result(subject_id, kyc_profile))
+
+    async def gather_context_async(self, alert_data, executor=None):
+        """
+        Async variant of gather_context - the KYC lookup runs off the event loop
+
+        Args:
+            alert_data: Dictionary containing alert_id, scenario_code, subject_id
+            executor: Optional executor for the blocking lookup (loop default if None)
+
+        Returns:
+            Evidence record (status, data, source) of the customer's KYC profile
+        """
+        import asyncio
+
+        started = perf_counter()
+        subject_id = alert_data["subject_id"]
+
+        self._log_query(subject_id)
+        loop = asyncio.get_running_loop()
+        kyc_profile = await loop.run_in_executor(executor, self._lookup, subject_id)
+        return self._record(started, self._build_result(subject_id, kyc_profile))
+
+    def blocking(self, subject_id):
+        """True when looking up subject_id would wait on I/O (a store declared blocking)"""
+        return subject_id not in self._prefetched and getattr(self._get_store(), "blocking", False)
+
+    def prefetch(self, subject_ids):
+        """
+        Resolve a batch of subjects with one bulk store query
+
+        Replaces any earlier prefetch; subsequent lookups for these subjects
+        (including unknown ones) are answered without touching the store.
+        """
+        subject_ids = list(dict.fromkeys(subject_ids))
+        found = self._get_store().get_many(subject_ids)
+        self._prefetched = {subject_id: found.get(subject_id) for subject_id in subject_ids}
+
+    def clear_prefetch(self):
+        """Drop prefetched profiles"""
+        self._prefetched = {}
+
+    def _get_store(self):
+        return self.store if self.store is not None else get_kyc_store()
+
+    def _log_query(self, subject_id):
         self.logger.log_agent_action(
-            self.name, 
-            f"Retrieving KYC profile for {subject_id}"
+            self.name,
+            "Retrieving KYC profile for %s", subject_id
         )
-        
-        # Simulate KYC lookup
-        try:
-            kyc_profile = KYC_DB[subject_id]
+
+    def _lookup(self, subject_id):
+        """Blocking KYC query - returns None when no profile exists"""
+        if subject_id in self._prefetched:
+            return self._prefetched[subject_id]
+        return self._get_store().get(subject_id)
+
+    def _record(self, started, result):
+        _LATENCY.labels().observe(perf_counter() - started)
+        _LOOKUPS.labels(result["status"]).inc()
+        return result
+
+    def _build_result(self, subject_id, kyc_profile):
+        if kyc_profile is not None:
             self.logger.log_data_retrieval("KYC Database", kyc_profile)
-            return {
-                "status": "success",
-                "data": kyc_profile,
-                "source": "KYC_DB"
-            }
-        except KeyError:
-            self.logger.log_agent_action(
-                self.name, 
-                f"⚠️  No KYC profile found for {subject_id}"
-            )
-            return {
-                "status": "not_found",
-                "data": {},
-                "source": "KYC_DB"
-            }
\ No newline at end of file
+            return Evidence("success", kyc_profile, "KYC_DB")
+
+        self.logger.log_agent_action(
+            self.name,
+            "⚠️  No KYC profile found for %s", subject_id,
+            level=WARNING
+        )
+        return Evidence("not_found", {}, "KYC_DB")
@@ -0,0 +1,243 @@
+"""
+Decision Memoization
+Reuses adjudication decisions when a rule sees exactly the same evidence again
+
+A compiled SOP rule is a pure function of the facts it declares as inputs,
+so the memo key is the scenario, the rule's content version and the values
+of just those facts - unrelated fields in the spoke results do not defeat
+it. Any change to a rule definition changes its version, so stale decisions
+are never served; on disk they are purged the first time the new version
+is used.
+
+Tiers:
+    memory  - bounded LRU (ContextCache without expiry), per process
+    disk    - optional SQLite file keyed by a SHA-256 of the canonical JSON
+              inputs, shared across runs (re-runs, retries, backlog replays)
+"""
+
+import hashlib
+import json
+import os
+import threading
+
+from data.context_cache import MISSING, ContextCache
+from data.records import Decision
+from utils import get_metrics
+
+_LOOKUPS = get_metrics().counter(
+    "aars_decision_memo_total", "Decision memo lookups by result", ("result",)
+)
+_MEMORY_HITS = _LOOKUPS.labels("memory_hit")
+_DISK_HITS = _LOOKUPS.labels("disk_hit")
+_MISSES = _LOOKUPS.labels("miss")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS decisions (
+    key TEXT PRIMARY KEY,
+    scenario_code TEXT NOT NULL,
+    version TEXT NOT NULL,
+    decision TEXT NOT NULL
+)
+"""
+
+
+def _freeze(value):
+    """Hashable form of an input value that keeps its type (1, 1.0 and True differ)"""
+    kind = type(value)
+    if kind is list or kind is tuple:
+        return (kind, tuple(_freeze(item) for item in value))
+    if kind is dict:
+        return (kind, tuple(sorted((key, _freeze(item)) for key, item in value.items())))
+    return (kind, value)
+
+
+def memory_key(rule, inputs):
+    """
+    In-memory memo key - the input types are part of it, since 1 == 1.0 == True
+
+    Keyed on the CompiledRule object itself: a recompiled rule set never
+    matches decisions cached for the previous one.
+    """
+    try:
+        hash(inputs)
+    except TypeError:
+        # Lists / dicts among the inputs
+        return (rule, tuple(_freeze(value) for value in inputs))
+    return (rule, inputs, tuple(map(type, inputs)))
+
+
+def stable_key(scenario_code, version, inputs):
+    """SHA-256 of the canonical JSON of a rule's scenario, version and input values"""
+    canonical = json.dumps(
+        [scenario_code, version, inputs], sort_keys=True, separators=(",", ":"), default=repr
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class DecisionMemo:
+    """Two-tier (memory / optional SQLite) cache of decisions per rule version and inputs"""
+
+    def __init__(self, max_size=100000, path=None, flush_every=256):
+        """
+        Args:
+            max_size: Decisions kept in memory (least recently used evicted)
+            path: SQLite file for the persistent tier (None keeps memory only)
+            flush_every: New decisions buffered before they are written to disk
+        """
+        self.cache = ContextCache(max_size, ttl=None)
+        self.path = path
+        self.flush_every = flush_every
+        self.disk_hits = 0
+        self.computed = 0
+        self._checked = set()   # (scenario_code, version) purged of older versions
+        self._pending = []
+        self._db = None
+        self._lock = threading.Lock()
+        if path is not None:
+            self._open()
+            if hasattr(os, "register_at_fork"):
+                os.register_at_fork(after_in_child=self._after_fork)
+
+    def decide(self, rule, alert_data, investigation_result, context_result):
+        """
+        Decision of `rule` for these spoke results, computed only on a miss
+
+        Returns:
+            Decision record, identical to rule.decide()'s
+        """
+        inputs = rule.inputs_of(alert_data, investigation_result, context_result)
+        key = memory_key(rule, inputs)
+        cached = self.cache.get(key)
+        if cached is not MISSING:
+            _MEMORY_HITS.inc()
+            return cached.replace(alert_id=alert_data["alert_id"])
+
+        if self._db is not None:
+            cached = self._load(rule, inputs)
+            if cached is not None:
+                self.disk_hits += 1
+                _DISK_HITS.inc()
+                self.cache.put(key, cached)
+                return cached.replace(alert_id=alert_data["alert_id"])
+
+        decision = rule.decide(alert_data, investigation_result, context_result)
+        self.computed += 1
+        _MISSES.inc()
+        # Decisions are immutable records, so the cache can hold the returned one
+        self.cache.put(key, decision)
+        if self._db is not None:
+            self._store(rule, inputs, decision)
+        return decision
+
+    def stats(self):
+        """Hit / miss counters across both tiers"""
+        memory = self.cache.stats()
+        hits = memory["hits"] + self.disk_hits
+        lookups = hits + self.computed
+        return {
+            "size": memory["size"],
+            "memory_hits": memory["hits"],
+            "disk_hits": self.disk_hits,
+            "misses": self.computed,
+            "hit_rate": hits / lookups if lookups else 0.0,
+            "evictions": memory["evictions"]
+        }
+
+    def flush(self):
+        """Write buffered decisions to the disk tier"""
+        with self._lock:
+            self._flush_locked()
+
+    def close(self):
+        """Flush and close the disk tier"""
+        with self._lock:
+            if self._db is None:
+                return
+            self._flush_locked()
+            self._db.close()
+            self._db = None
+
+    def _load(self, rule, inputs):
+        version_key = (rule.scenario_code, rule.version)
+        with self._lock:
+            if version_key not in self._checked:
+                # First use of this rule version - drop decisions of older versions
+                self._flush_locked()
+                self._db.execute(
+                    "DELETE FROM decisions WHERE scenario_code = ? AND version != ?", version_key
+                )
+                self._db.commit()
+                self._checked.add(version_key)
+            row = self._db.execute(
+                "SELECT decision FROM decisions WHERE key = ?",
+                (stable_key(rule.scenario_code, rule.version, inputs),)
+            ).fetchone()
+        if row is None:
+            return None
+        stored = json.loads(row[0])
+        rationale = stored.get("rationale")
+        if rationale.__class__ is list:
+            # Stored unrendered as [template, params]
+            stored["rationale"] = (rationale[0], tuple(rationale[1]))
+        decision = Decision.from_dict(stored)
+        # Stored without the rule set tag - the same rule may live on in later rule sets
+        if rule.rule_set_version is not None:
+            decision = decision.replace(rule_set_version=rule.rule_set_version)
+        return decision
+
+    def _store(self, rule, inputs, decision):
+        with self._lock:
+            self._pending.append((
+                stable_key(rule.scenario_code, rule.version, inputs),
+                rule.scenario_code, rule.version,
+                # The rationale is kept as its template and params - storing it
+                # must not render it
+                json.dumps({
+                    name: value for name, value in decision.to_dict(render=False).items()
+                    if name != "alert_id" and name != "rule_set_version"
+                })
+            ))
+            if len(self._pending) >= self.flush_every:
+                self._flush_locked()
+
+    def _flush_locked(self):
+        if self._db is None or not self._pending:
+            return
+        self._db.executemany("INSERT OR REPLACE INTO decisions VALUES (?, ?, ?, ?)", self._pending)
+        self._db.commit()
+        self._pending = []
+
+    def _open(self):
+        import sqlite3
+
+        self._db = sqlite3.connect(self.path, check_same_thread=False, timeout=30.0)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(_SCHEMA)
+        self._db.commit()
+
+    def _after_fork(self):
+        import multiprocessing.util
+
+        # Forked workers must not share the parent's SQLite connection; the
+        # inherited one is kept referenced, never closed, so the parent's locks survive
+        self._lock = threading.Lock()
+        self._pending = []
+        if self._db is not None:
+            self._inherited, self._db = self._db, None
+            self._open()
+            multiprocessing.util.Finalize(self, self.close, exitpriority=10)
+
+
+_memo = None
+
+
+def get_decision_memo():
+    """The process-wide decision memo (None unless set_decision_memo was called)"""
+    return _memo
+
+
+def set_decision_memo(memo):
+    """Replace the process-wide decision memo (returns the previous one)"""
+    global _memo
+    previous, _memo = _memo, memo
+    return previous
@@ -3,51 +3,189 @@ Investigator Agent (Spoke)
 Responsible for querying historic transaction data and providing facts
 """
 
-from data import HISTORIC_TRANSACTIONS_DB
-from utils import AuditLogger
+from time import perf_counter
+
+from data import get_fact_index, get_feature_engine, get_sanctions_screener
+from data.records import Evidence
+from utils import AuditLogger, WARNING, get_metrics
+
+_LATENCY = get_metrics().histogram(
+    "aars_investigation_seconds", "Investigator Agent latency per alert", ("scenario",)
+)
+_LOOKUPS = get_metrics().counter(
+    "aars_investigations_total", "Investigations by scenario and lookup status", ("scenario", "status")
+)
 
 
 class InvestigatorAgent:
     """Queries and analyzes historic transaction patterns"""
-    
-    def __init__(self):
+
+    # Counterparty similarity below this is reported as 0.0
+    MIN_SANCTIONS_SCORE = 0.5
+
+    def __init__(self, features=None, facts=None, screener=None):
+        """
+        Args:
+            features: FeatureEngine deriving facts from the raw ledger
+                      (defaults to the process-wide engine, if any)
+            facts: FactIndex of precomputed historic facts
+                   (defaults to the process-wide index)
+            screener: SanctionsScreener scoring counterparty names
+                      (defaults to the process-wide screener)
+        """
         self.name = "Investigator Agent"
         self.logger = AuditLogger()
-    
+        self.features = features
+        self.facts = facts
+        self.screener = screener
+        self._prefetched = {}
+        self._screened = {}
+
     def investigate(self, alert_data):
         """
         Simulate querying the historic transactions database
-        
+
+        Args:
+            alert_data: Dictionary containing alert_id, scenario_code, subject_id
+
+        Returns:
+            Evidence record (status, data, source) of the investigation findings
+        """
+        started = perf_counter()
+        scenario_code = alert_data["scenario_code"]
+        subject_id = alert_data["subject_id"]
+
+        self._log_query(scenario_code, subject_id)
+        findings = self._lookup(scenario_code, subject_id)
+        return self._record(scenario_code, started, self._build_result(subject_id, findings))
+
+    async def investigate_async(self, alert_data, executor=None):
+        """
+        Async variant of investigate - the store lookup runs off the event loop
+
         Args:
             alert_data: Dictionary containing alert_id, scenario_code, subject_id
-            
+            executor: Optional executor for the blocking lookup (loop default if None)
+
         Returns:
-            Dictionary of investigation findings
+            Evidence record (status, data, source) of the investigation findings
         """
+        import asyncio
+
+        started = perf_counter()
         scenario_code = alert_data["scenario_code"]
         subject_id = alert_data["subject_id"]
-        
+
+        self._log_query(scenario_code, subject_id)
+        loop = asyncio.get_running_loop()
+        findings = await loop.run_in_executor(
+            executor, self._lookup, scenario_code, subject_id
+        )
+        return self._record(scenario_code, started, self._build_result(subject_id, findings))
+
+    def blocking(self, subject_id):
+        """True when looking up subject_id would wait on I/O (a fact index declared blocking)"""
+        return subject_id not in self._prefetched and getattr(self._get_facts(), "blocking", False)
+
+    def subject_history(self, subject_id):
+        """
+        Every historic feature group of a customer, from one index read
+
+        Args:
+            subject_id: Customer identifier
+
+        Returns:
+            Dict of scenario_code -> facts (empty when the customer has no history)
+        """
+        if subject_id in self._prefetched:
+            groups = self._prefetched[subject_id]
+        else:
+            groups = self._get_facts().get_subject(subject_id)
+        return dict(groups) if groups else {}
+
+    def prefetch(self, subject_ids):
+        """
+        Read all feature groups of a batch of subjects, one index read per subject
+
+        Replaces any earlier prefetch; subsequent lookups for these subjects
+        (under any scenario) are answered without touching the index.
+        """
+        index = self._get_facts()
+        self._prefetched = {
+            subject_id: index.get_subject(subject_id)
+            for subject_id in dict.fromkeys(subject_ids)
+        }
+        # Screen the batch's sanctions counterparties in one pass
+        names = [
+            groups["SANCTIONS_MATCH"]["counterparty_name"]
+            for groups in self._prefetched.values()
+            if groups and groups.get("SANCTIONS_MATCH", {}).get("counterparty_name")
+        ]
+        self._screened = {}
+        if names:
+            matches = self._get_screener().screen_many(
+                names, top_k=1, min_score=self.MIN_SANCTIONS_SCORE
+            )
+            self._screened = {
+                name: found[0].score if found else 0.0
+                for name, found in zip(names, matches)
+            }
+
+    def clear_prefetch(self):
+        """Drop prefetched facts"""
+        self._prefetched = {}
+        self._screened = {}
+
+    def _get_facts(self):
+        return self.facts if self.facts is not None else get_fact_index()
+
+    def _get_screener(self):
+        return self.screener if self.screener is not None else get_sanctions_screener()
+
+    def _screen(self, findings):
+        """Replace the stored similarity_score with a live screening of the counterparty"""
+        name = findings.get("counterparty_name")
+        if not name:
+            return findings
+        score = self._screened.get(name)
+        if score is None:
+            score = self._get_screener().best_score(name, self.MIN_SANCTIONS_SCORE)
+        return {**findings, "similarity_score": score}
+
+    def _log_query(self, scenario_code, subject_id):
         self.logger.log_agent_action(
-            self.name, 
-            f"Querying transaction history for {subject_id} (Scenario: {scenario_code})"
+            self.name,
+            "Querying transaction history for %s (Scenario: %s)", subject_id, scenario_code
         )
-        
-        # Simulate database query
-        try:
-            findings = HISTORIC_TRANSACTIONS_DB[scenario_code][subject_id]
+
+    def _lookup(self, scenario_code, subject_id):
+        """Blocking store query - returns None when no history exists"""
+        if subject_id in self._prefetched:
+            facts = (self._prefetched[subject_id] or {}).get(scenario_code)
+        else:
+            facts = self._get_facts().get(scenario_code, subject_id)
+        engine = self.features if self.features is not None else get_feature_engine()
+        derived = engine.lookup(scenario_code, subject_id) if engine is not None else None
+        if derived is not None:
+            # Ledger-derived features supersede the precomputed facts
+            facts = {**facts, **derived} if facts else derived
+        if facts and scenario_code == "SANCTIONS_MATCH":
+            facts = self._screen(facts)
+        return facts
+
+    def _record(self, scenario_code, started, result):
+        _LATENCY.labels(scenario_code).observe(perf_counter() - started)
+        _LOOKUPS.labels(scenario_code, result["status"]).inc()
+        return result
+
+    def _build_result(self, subject_id, findings):
+        if findings is not None:
             self.logger.log_data_retrieval("Historic Transactions DB", findings)
-            return {
-                "status": "success",
-                "data": findings,
-                "source": "HISTORIC_TRANSACTIONS_DB"
-            }
-        except KeyError:
-            self.logger.log_agent_action(
-                self.name, 
-                f"⚠️  No transaction history found for {subject_id}"
-            )
-            return {
-                "status": "not_found",
-                "data": {},
-                "source": "HISTORIC_TRANSACTIONS_DB"
-            }
\ No newline at end of file
+            return Evidence("success", findings, "HISTORIC_TRANSACTIONS_DB")
+
+        self.logger.log_agent_action(
+            self.name,
+            "⚠️  No transaction history found for %s", subject_id,
+            level=WARNING
+        )
+        return Evidence("not_found", {}, "HISTORIC_TRANSACTIONS_DB")
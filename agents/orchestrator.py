@@ -1,65 +1,352 @@
 """
 Orchestrator Agent (Hub)
 Routes alerts to appropriate spoke agents and coordinates the investigation workflow
+
+asyncio, concurrent.futures and multiprocessing are imported on first use:
+alerts whose lookups never block are decided without an event loop, and a
+single-process run never starts a pool, so neither pays for them at startup.
 """
 
-from utils import AuditLogger
+import os
+from collections import deque, namedtuple
+from itertools import islice
+from time import perf_counter
+
+from data import warm_up
+from data.records import Decision
+from utils import AuditLogger, WARNING, get_metrics
 from .investigator import InvestigatorAgent
 from .context_agent import ContextGathererAgent
 from .adjudicator import AdjudicatorAgent
 
 
+# Outcome of one alert in a batch run - exactly one of decision / error is set
+BatchResult = namedtuple("BatchResult", ["alert", "decision", "error"])
+
+_LATENCY = get_metrics().histogram(
+    "aars_alert_seconds", "End-to-end orchestration latency per alert", ("scenario",)
+)
+_ALERTS = get_metrics().counter(
+    "aars_alerts_total", "Alerts orchestrated by outcome", ("scenario", "outcome")
+)
+
+
 class OrchestratorAgent:
     """Central hub that coordinates multi-agent alert resolution workflow"""
-    
-    def __init__(self):
+
+    def __init__(self, io_workers=2):
         self.name = "Orchestrator Agent"
         self.logger = AuditLogger()
-        
+
         # Initialize spoke agents
         self.investigator = InvestigatorAgent()
         self.context_gatherer = ContextGathererAgent()
         self.adjudicator = AdjudicatorAgent()
-    
+
+        # Event loop and I/O threads are created on first use
+        self.io_workers = io_workers
+        self._io_executor = None
+        self._loop = None
+
     def process_alert(self, alert_data):
         """
         Main orchestration method - delegates to spokes and returns final decision
-        
+
+        When either spoke's lookup would wait on I/O (a SQLite KYC store not
+        prefetched for this subject), this is a synchronous wrapper around
+        process_alert_async; otherwise both spokes are called directly, with
+        no event loop or thread hand-off. Must not be called from inside a
+        running event loop; await process_alert_async instead.
+
         Args:
             alert_data: Dictionary containing alert details
-            
+
         Returns:
             Final adjudication decision
         """
+        subject_id = alert_data["subject_id"]
+        if self.investigator.blocking(subject_id) or self.context_gatherer.blocking(subject_id):
+            import asyncio
+
+            if self._loop is None or self._loop.is_closed():
+                self._loop = asyncio.new_event_loop()
+            return self._loop.run_until_complete(self.process_alert_async(alert_data))
+
+        started = self._route(alert_data)
+        investigation_result = self.investigator.investigate(alert_data)
+        context_result = self.context_gatherer.gather_context(alert_data)
+        return self._decide(alert_data, investigation_result, context_result, started)
+
+    async def process_alert_async(self, alert_data):
+        """
+        Async orchestration - Investigator and Context Gatherer run concurrently
+
+        Args:
+            alert_data: Dictionary containing alert details
+
+        Returns:
+            Final adjudication decision
+        """
+        import asyncio
+
+        started = self._route(alert_data)
+
+        # Step 2: Execute parallel investigation - latency is bounded by the slower spoke
+        executor = self._get_io_executor()
+        investigation_result, context_result = await asyncio.gather(
+            self.investigator.investigate_async(alert_data, executor),
+            self.context_gatherer.gather_context_async(alert_data, executor)
+        )
+        return self._decide(alert_data, investigation_result, context_result, started)
+
+    def _route(self, alert_data):
+        """Log the alert's start and routing - returns its start time"""
+        started = perf_counter()
         alert_id = alert_data["alert_id"]
-        scenario_code = alert_data["scenario_code"]
-        
+
         # Log alert processing start
-        self.logger.log_alert_start(alert_id, scenario_code)
-        
+        self.logger.log_alert_start(alert_id, alert_data["scenario_code"])
+
         # Step 1: Route to investigator
         self.logger.log_agent_action(
-            self.name, 
-            f"Routing alert {alert_id} to Investigator and Context Gatherer agents"
+            self.name,
+            "Routing alert %s to Investigator and Context Gatherer agents", alert_id
         )
-        
-        # Step 2: Execute parallel investigation (simulated as sequential for simplicity)
-        investigation_result = self.investigator.investigate(alert_data)
-        context_result = self.context_gatherer.gather_context(alert_data)
-        
+        return started
+
+    def _decide(self, alert_data, investigation_result, context_result, started):
+        """Adjudicate the spokes' findings and log the decision"""
         # Step 3: Send findings to adjudicator
         self.logger.log_agent_action(
-            self.name, 
+            self.name,
             "All data gathered. Forwarding to Adjudicator for decision..."
         )
-        
+
         decision = self.adjudicator.adjudicate(
-            alert_data, 
-            investigation_result, 
+            alert_data,
+            investigation_result,
             context_result
         )
-        
+
         # Step 4: Log decision
         self.logger.log_decision(decision)
-        
-        return decision
\ No newline at end of file
+
+        _LATENCY.labels(alert_data["scenario_code"]).observe(perf_counter() - started)
+        return decision
+
+    def process_batch(self, alerts, workers=None, ordered=True, chunksize=32, coalescer=None,
+                      scheduler=None, journal=None):
+        """
+        Process many alerts, spreading them over a pool of worker processes
+
+        Each worker process builds its own OrchestratorAgent. Workers are
+        always forked, whatever the default start method: they inherit the
+        process-wide configuration (KYC store, fact index, ledger, rule set
+        and its watcher, decision memo, audit sinks), which spawned or
+        forkserver workers would silently replace with the defaults. Where
+        fork is unavailable (Windows) the batch runs in-process instead. A
+        failure on one alert is reported in its BatchResult and never aborts
+        the batch. Alerts are consumed lazily with a bounded number of chunks
+        in flight, so any iterable (including a generator) may be passed.
+
+        Args:
+            alerts: Iterable of alert dictionaries
+            workers: Number of worker processes (defaults to CPU count; 1 runs in-process)
+            ordered: Yield results in input order (True) or as they complete (False)
+            chunksize: Alerts per worker task and per bulk KYC lookup
+            coalescer: AlertCoalescer - duplicate subject / scenario alerts in its
+                       window reuse the first one's decision instead of being processed
+            scheduler: AlertScheduler - alerts are processed most urgent first
+                       instead of in input order
+            journal: ProgressJournal to resume from - completed alerts are skipped,
+                     and alerts it holds a decision for are answered with that
+                     decision, in place, instead of being processed again
+
+        Yields:
+            BatchResult(alert, decision, error) for every input alert
+        """
+        if journal is not None:
+            yield from self._resume(
+                alerts, journal, workers=workers, ordered=ordered, chunksize=chunksize,
+                coalescer=coalescer, scheduler=scheduler
+            )
+            return
+        if coalescer is not None:
+            yield from coalescer.fan_out(self.process_batch(
+                coalescer.leaders(alerts), workers, ordered, chunksize, scheduler=scheduler
+            ))
+            return
+        if scheduler is not None:
+            yield from scheduler.complete(
+                self.process_batch(scheduler.schedule(alerts), workers, ordered, chunksize)
+            )
+            return
+        workers = workers or os.cpu_count() or 1
+        if workers > 1:
+            from multiprocessing import get_all_start_methods
+
+            if "fork" not in get_all_start_methods():
+                self.logger.log_agent_action(
+                    self.name, "Worker processes need fork - processing the batch in-process",
+                    level=WARNING
+                )
+                workers = 1
+        if workers <= 1:
+            for chunk in _chunked(alerts, chunksize):
+                yield from self._process_chunk_isolated(chunk)
+            return
+
+        from concurrent.futures import ProcessPoolExecutor
+        from multiprocessing import get_context
+
+        max_in_flight = workers * 2
+        mp_context = get_context("fork")
+        # Forked workers inherit the parent's loaded data instead of each loading it
+        warm_up()
+        with ProcessPoolExecutor(
+            max_workers=workers, mp_context=mp_context, initializer=_init_batch_worker
+        ) as pool:
+            in_flight = deque()
+            for chunk in _chunked(alerts, chunksize):
+                in_flight.append((pool.submit(_process_chunk, chunk), chunk))
+                if len(in_flight) >= max_in_flight:
+                    yield from _drain(in_flight, ordered, block_all=False)
+            yield from _drain(in_flight, ordered, block_all=True)
+
+    def close(self):
+        """Release the private event loop and I/O threads"""
+        if self._loop is not None and not self._loop.is_closed():
+            self._loop.close()
+        self._loop = None
+        if self._io_executor is not None:
+            self._io_executor.shutdown(wait=True)
+            self._io_executor = None
+
+    def _resume(self, alerts, journal, **options):
+        """Process the alerts the journal holds no decision for, replaying the others after them"""
+        following = {}      # id(processed alert) -> replayed results read right after it
+        leading = []        # replayed results read before the first processed alert
+        previous = None
+
+        def undecided():
+            nonlocal previous
+            for alert in journal.pending(alerts):
+                decision = journal.reuse_decision(alert["alert_id"])
+                if decision is None:
+                    previous = alert
+                    yield alert
+                    continue
+                result = BatchResult(alert, Decision.from_dict(decision), None)
+                if previous is None:
+                    leading.append(result)
+                else:
+                    following.setdefault(id(previous), []).append(result)
+
+        for result in self.process_batch(undecided(), **options):
+            yield from leading
+            leading.clear()
+            yield result
+            yield from following.pop(id(result.alert), ())
+        # Read after the last processed alert's result was already yielded
+        yield from leading
+        for results in following.values():
+            yield from results
+
+    def _process_chunk_isolated(self, chunk):
+        """Process a chunk, resolving its customers' KYC profiles and historic facts up front"""
+        subject_ids = [alert["subject_id"] for alert in chunk]
+        spokes = (self.investigator, self.context_gatherer)
+        for spoke in spokes:
+            try:
+                spoke.prefetch(subject_ids)
+            except Exception:
+                # Bulk lookup failed - fall back to per-alert lookups (errors surface there)
+                spoke.clear_prefetch()
+        try:
+            for alert in chunk:
+                yield self._process_isolated(alert)
+        finally:
+            for spoke in spokes:
+                spoke.clear_prefetch()
+
+    def _process_isolated(self, alert_data):
+        try:
+            result = BatchResult(alert_data, self.process_alert(alert_data), None)
+        except Exception as e:
+            result = BatchResult(alert_data, None, str(e))
+        _ALERTS.labels(
+            alert_data.get("scenario_code"), "error" if result.error else "decided"
+        ).inc()
+        return result
+
+    def _get_io_executor(self):
+        if self._io_executor is None:
+            from concurrent.futures import ThreadPoolExecutor
+
+            self._io_executor = ThreadPoolExecutor(
+                max_workers=self.io_workers,
+                thread_name_prefix="aars-io"
+            )
+        return self._io_executor
+
+
+# ---------------------------------------------------------------------------
+# Process-pool helpers for process_batch (module level so they can be pickled)
+# ---------------------------------------------------------------------------
+
+_worker_orchestrator = None
+
+
+def _init_batch_worker():
+    """Build one orchestrator per (forked) worker process, on the inherited configuration"""
+    global _worker_orchestrator
+    _worker_orchestrator = OrchestratorAgent()
+
+
+def _process_chunk(chunk):
+    """Run a chunk of alerts in a worker - returns (decision, error) pairs and drained metrics"""
+    pairs = [
+        (decision, error)
+        for _, decision, error in _worker_orchestrator._process_chunk_isolated(chunk)
+    ]
+    return pairs, get_metrics().drain()
+
+
+def _chunked(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _chunk_results(future, chunk):
+    try:
+        pairs, metrics = future.result()
+    except Exception as e:
+        # Worker crashed or the chunk could not be pickled - fail the whole chunk
+        return [BatchResult(alert, None, f"worker failure: {e}") for alert in chunk]
+    get_metrics().merge(metrics)
+    return [
+        BatchResult(alert, decision, error)
+        for alert, (decision, error) in zip(chunk, pairs)
+    ]
+
+
+def _drain(in_flight, ordered, block_all):
+    """Yield finished chunk results, either FIFO or in completion order"""
+    from concurrent.futures import FIRST_COMPLETED, wait
+
+    while in_flight:
+        if ordered:
+            finished = [in_flight.popleft()]
+        else:
+            done, _ = wait([future for future, _ in in_flight], return_when=FIRST_COMPLETED)
+            finished = [entry for entry in in_flight if entry[0] in done]
+            for entry in finished:
+                in_flight.remove(entry)
+        for future, chunk in finished:
+            yield from _chunk_results(future, chunk)
+        if not block_all:
+            return
@@ -0,0 +1,222 @@
+"""
+What-If Replay
+Re-adjudicates stored alerts under the current and a candidate rule set and reports flipped decisions
+
+Evidence is gathered once per alert from the configured stores (fact index
+or ledger features, KYC store, sanctions screener) with the spokes' bulk
+prefetch, and both rule sets are evaluated over that same evidence - so a
+difference in outcome is down to the rules alone. Rules are evaluated per
+alert with the compiled rules' evaluate(); only recommendations are
+compared, so no rationale is ever rendered and no action is executed.
+
+The report counts, per rule, every (current -> candidate) recommendation
+pair, flips included, and keeps a few sample alert ids per flip for review.
+A scenario that only one of the rule sets covers shows as UNSUPPORTED on
+the other side.
+"""
+
+import json
+import time
+from collections import Counter
+from itertools import islice
+
+from .context_agent import ContextGathererAgent
+from .investigator import InvestigatorAgent
+
+UNSUPPORTED = "UNSUPPORTED"
+
+
+class ReplayReport:
+    """Decision-diff counts of a what-if replay"""
+
+    def __init__(self, current_version, candidate_version, samples=5):
+        self.current_version = current_version
+        self.candidate_version = candidate_version
+        self.sample_size = samples
+        self.alerts = 0
+        self.errors = 0
+        self.seconds = 0.0
+        self.outcomes = {}      # (rule_id, scenario_code) -> Counter of (current, candidate)
+        self.samples = {}       # (rule_id, current, candidate) -> [alert_id, ...] of flips
+
+    @property
+    def flipped(self):
+        return sum(
+            count for outcomes in self.outcomes.values()
+            for (current, candidate), count in outcomes.items() if current != candidate
+        )
+
+    def add(self, rule_id, scenario_code, alert_id, current, candidate):
+        """Count one replayed alert"""
+        self.alerts += 1
+        outcomes = self.outcomes.get((rule_id, scenario_code))
+        if outcomes is None:
+            outcomes = self.outcomes[(rule_id, scenario_code)] = Counter()
+        outcomes[(current, candidate)] += 1
+        if current != candidate:
+            samples = self.samples.setdefault((rule_id, current, candidate), [])
+            if len(samples) < self.sample_size:
+                samples.append(alert_id)
+
+    def to_dict(self):
+        """JSON-serialisable form of the report"""
+        rules = []
+        for (rule_id, scenario_code), outcomes in sorted(self.outcomes.items()):
+            rules.append({
+                "rule_id": rule_id,
+                "scenario_code": scenario_code,
+                "alerts": sum(outcomes.values()),
+                "flipped": sum(count for (a, b), count in outcomes.items() if a != b),
+                "outcomes": [
+                    {
+                        "current": current, "candidate": candidate, "count": count,
+                        "sample_alert_ids": self.samples.get((rule_id, current, candidate), [])
+                    }
+                    for (current, candidate), count in sorted(outcomes.items())
+                ]
+            })
+        return {
+            "current_version": self.current_version,
+            "candidate_version": self.candidate_version,
+            "alerts": self.alerts,
+            "flipped": self.flipped,
+            "errors": self.errors,
+            "seconds": round(self.seconds, 3),
+            "rules": rules
+        }
+
+    def to_json(self, indent=2):
+        return json.dumps(self.to_dict(), indent=indent)
+
+    def to_text(self):
+        """Human-readable decision-diff table (flips marked with *)"""
+        flipped = self.flipped
+        lines = [
+            f"Rule Sets: {self.current_version} (current) -> {self.candidate_version} (candidate)",
+            f"Alerts Replayed: {self.alerts:,} | Flipped: {flipped:,} "
+            f"({flipped / self.alerts if self.alerts else 0.0:.2%}) | Errors: {self.errors:,} "
+            f"| {self.seconds:.1f}s",
+            ""
+        ]
+        for rule in self.to_dict()["rules"]:
+            lines.append(
+                f"{rule['rule_id']} {rule['scenario_code']}: {rule['alerts']:,} alerts, "
+                f"{rule['flipped']:,} flipped"
+            )
+            for outcome in rule["outcomes"]:
+                flip = outcome["current"] != outcome["candidate"]
+                samples = ", ".join(outcome["sample_alert_ids"])
+                lines.append(
+                    f"  {'*' if flip else ' '} {outcome['current']:<22} -> "
+                    f"{outcome['candidate']:<22}{outcome['count']:>12,}"
+                    + (f"   e.g. {samples}" if flip and samples else "")
+                )
+        return "\n".join(lines) + "\n"
+
+
+def replay(alerts, current, candidate, chunksize=4096, samples=5,
+           investigator=None, context_gatherer=None):
+    """
+    Replay alerts under two rule sets and count how their decisions differ
+
+    Args:
+        alerts: Iterable of alert dictionaries / records (consumed lazily)
+        current: Dispatch table (RuleSet) in force today
+        candidate: Dispatch table (RuleSet) proposed
+        chunksize: Alerts whose evidence is prefetched and evaluated together
+        samples: Flipped alert ids kept per rule and outcome pair
+        investigator: InvestigatorAgent to gather facts with (default: a new one)
+        context_gatherer: ContextGathererAgent to gather KYC context with
+
+    Returns:
+        ReplayReport
+    """
+    started = time.perf_counter()
+    report = ReplayReport(
+        getattr(current, "version", None), getattr(candidate, "version", None), samples
+    )
+    investigator = investigator or InvestigatorAgent()
+    context_gatherer = context_gatherer or ContextGathererAgent()
+    iterator = iter(alerts)
+    while True:
+        chunk = list(islice(iterator, chunksize))
+        if not chunk:
+            break
+        evidence = _gather(chunk, investigator, context_gatherer, report)
+        _compare(evidence, current, candidate, report)
+    report.seconds = time.perf_counter() - started
+    return report
+
+
+def _gather(chunk, investigator, context_gatherer, report):
+    """(alert, investigation, context) of every alert whose evidence could be gathered"""
+    subject_ids = [alert["subject_id"] for alert in chunk]
+    spokes = (investigator, context_gatherer)
+    for spoke in spokes:
+        try:
+            spoke.prefetch(subject_ids)
+        except Exception:
+            # Bulk lookup failed - fall back to per-alert lookups (errors surface there)
+            spoke.clear_prefetch()
+    evidence = []
+    try:
+        for alert in chunk:
+            try:
+                evidence.append((
+                    alert, investigator.investigate(alert), context_gatherer.gather_context(alert)
+                ))
+            except Exception:
+                report.errors += 1
+    finally:
+        for spoke in spokes:
+            spoke.clear_prefetch()
+    return evidence
+
+
+def _compare(evidence, current, candidate, report):
+    both = []
+    for row in evidence:
+        scenario_code = row[0]["scenario_code"]
+        in_current, in_candidate = scenario_code in current, scenario_code in candidate
+        if in_current and in_candidate:
+            both.append(row)
+        elif in_current or in_candidate:
+            # Scenario added or dropped by the candidate
+            outcome = _outcomes([row], current if in_current else candidate)[0]
+            if outcome is None:
+                report.errors += 1
+                continue
+            rule_id = (current if in_current else candidate)[scenario_code].rule_id
+            report.add(
+                rule_id, scenario_code, row[0]["alert_id"],
+                outcome if in_current else UNSUPPORTED, UNSUPPORTED if in_current else outcome
+            )
+        else:
+            report.errors += 1
+    if not both:
+        return
+    before = _outcomes(both, current)
+    after = _outcomes(both, candidate)
+    for (alert, _, _), current_outcome, candidate_outcome in zip(both, before, after):
+        if current_outcome is None or candidate_outcome is None:
+            report.errors += 1
+            continue
+        scenario_code = alert["scenario_code"]
+        report.add(
+            current[scenario_code].rule_id, scenario_code, alert["alert_id"],
+            current_outcome, candidate_outcome
+        )
+
+
+def _outcomes(rows, rules):
+    """Recommendation of every (alert, investigation, context) row under `rules` (None if it raises)"""
+    outcomes = []
+    for alert, investigation, context in rows:
+        rule = rules[alert["scenario_code"]]
+        try:
+            index, _ = rule.evaluate(alert, investigation["data"], context["data"])
+        except Exception:
+            outcomes.append(None)
+            continue
+        outcomes.append(rule.paths[index].action)
+    return outcomes
@@ -0,0 +1,403 @@
+"""
+SOP Rule Engine
+Compiles the declarative SOP_RULES into Python bytecode once, at startup
+
+Every scenario becomes one generated function that reads its inputs,
+computes derived facts and walks the decision paths, returning the index
+of the matching path plus the parameters its rationale template needs.
+Decisions carry that template and parameters as a deferred (template,
+params) rationale, so the text is only formatted when somebody reads it.
+The Adjudicator dispatches on scenario_code through a RuleSet - a plain
+dict of these compiled rules tagged with the rule set's version, which
+every decision carries - so there is no per-call parsing or branching on
+the scenario.
+
+Expressions use a small, validated subset of Python:
+    names, numbers, strings, True/False/None
+    + - * /   < <= > >= == !=   in / not in   and / or / not   x if c else y
+    helper calls: lower(s), all_below(values, limit)
+
+`X == True` / `X == False` test truthiness, matching the hand-written
+SOP logic this engine replaced.
+"""
+
+import ast
+import hashlib
+import json
+import keyword
+import string
+from collections import namedtuple
+from functools import lru_cache
+
+from data.records import ABSENT, Decision, Evidence
+
+
+class RuleCompileError(ValueError):
+    """Raised when an SOP rule definition cannot be compiled"""
+
+
+def _all_below(values, limit):
+    return all(value < limit for value in values)
+
+
+# Functions callable from rule expressions
+HELPERS = {
+    "lower": str.lower,
+    "all_below": _all_below
+}
+
+# Where an input's field is read from - name of the generated function argument
+INPUT_SOURCES = {
+    "alert": "_alert",
+    "investigation": "_inv",
+    "context": "_ctx"
+}
+
+# Generated prologue reading the spokes' data (an attribute read for Evidence records)
+_SPOKE_DATA = (
+    "    _inv = _inv_result.data if _inv_result.__class__ is _Evidence else _inv_result['data']",
+    "    _ctx = _ctx_result.data if _ctx_result.__class__ is _Evidence else _ctx_result['data']"
+)
+
+_ALLOWED_NODES = (
+    ast.Expression, ast.Load,
+    ast.BoolOp, ast.And, ast.Or,
+    ast.UnaryOp, ast.Not, ast.USub, ast.UAdd,
+    ast.BinOp, ast.Add, ast.Sub, ast.Mult, ast.Div,
+    ast.Compare, ast.Eq, ast.NotEq, ast.Lt, ast.LtE, ast.Gt, ast.GtE, ast.In, ast.NotIn,
+    ast.IfExp, ast.Call, ast.Name, ast.Constant
+)
+
+# A validated rule expression - original text plus its syntax tree
+Expression = namedtuple("Expression", ["source", "tree"])
+
+# One outcome of a rule: action, confidence and positional rationale template
+DecisionPath = namedtuple(
+    "DecisionPath", ["conditions", "action", "confidence", "rationale", "template", "params"]
+)
+
+
+def _check_name(name, where):
+    if (not name.isidentifier() or keyword.iskeyword(name) or name.startswith("_")
+            or name in HELPERS):
+        raise RuleCompileError(f"{where}: invalid fact name {name!r}")
+
+
+def parse_expression(source, known_names, where):
+    """
+    Parse and validate one rule expression
+
+    Args:
+        source: Expression text from the SOP definition
+        known_names: Names the expression may reference
+        where: Human-readable location used in error messages
+
+    Returns:
+        Expression(source, tree)
+    """
+    try:
+        tree = ast.parse(source, mode="eval")
+    except SyntaxError as e:
+        raise RuleCompileError(f"{where}: invalid expression {source!r}: {e.msg}") from None
+
+    for node in ast.walk(tree):
+        if not isinstance(node, _ALLOWED_NODES):
+            raise RuleCompileError(
+                f"{where}: unsupported syntax {type(node).__name__} in {source!r}"
+            )
+        if isinstance(node, ast.Compare) and len(node.ops) != 1:
+            raise RuleCompileError(f"{where}: chained comparison in {source!r}")
+        if isinstance(node, ast.Call):
+            if (not isinstance(node.func, ast.Name) or node.func.id not in HELPERS
+                    or node.keywords):
+                raise RuleCompileError(f"{where}: unknown function call in {source!r}")
+        elif isinstance(node, ast.Name) and node.id not in known_names \
+                and node.id not in HELPERS:
+            raise RuleCompileError(f"{where}: unknown name {node.id!r} in {source!r}")
+    return Expression(source, tree)
+
+
+def is_bool_literal_compare(node):
+    """True for `X == True` / `X == False` style comparisons"""
+    return (
+        isinstance(node, ast.Compare)
+        and isinstance(node.ops[0], (ast.Eq, ast.NotEq))
+        and isinstance(node.comparators[0], ast.Constant)
+        and isinstance(node.comparators[0].value, bool)
+    )
+
+
+def bool_literal_is_negated(node):
+    """For a bool-literal comparison, True when it tests for falsiness"""
+    return node.comparators[0].value is isinstance(node.ops[0], ast.NotEq)
+
+
+class _TruthRewriter(ast.NodeTransformer):
+    """Rewrite `X == True` to `X` and `X == False` to `not X`"""
+
+    def visit_Compare(self, node):
+        self.generic_visit(node)
+        if not is_bool_literal_compare(node):
+            return node
+        if bool_literal_is_negated(node):
+            return ast.copy_location(ast.UnaryOp(op=ast.Not(), operand=node.left), node)
+        return node.left
+
+
+def compile_template(template, known_names, where):
+    """
+    Turn a named str.format rationale into a positional one
+
+    Returns:
+        (positional_template, referenced_names)
+    """
+    formatter = string.Formatter()
+    pieces = []
+    names = []
+    try:
+        parsed = list(formatter.parse(template))
+    except ValueError as e:
+        raise RuleCompileError(f"{where}: invalid rationale template: {e}") from None
+
+    for literal, field, spec, conversion in parsed:
+        pieces.append(literal.replace("{", "{{").replace("}", "}}"))
+        if field is None:
+            continue
+        if field not in known_names:
+            raise RuleCompileError(f"{where}: unknown rationale field {field!r}")
+        if "{" in spec or conversion not in (None, "r", "s", "a"):
+            raise RuleCompileError(f"{where}: unsupported format for field {field!r}")
+        if field not in names:
+            names.append(field)
+        pieces.append(
+            "{" + str(names.index(field))
+            + ("!" + conversion if conversion else "")
+            + (":" + spec if spec else "") + "}"
+        )
+    return "".join(pieces), tuple(names)
+
+
+class CompiledRule:
+    """One scenario's SOP rule, compiled to a single evaluation function"""
+
+    def __init__(self, scenario_code, definition, rule_set_version=None):
+        """
+        Args:
+            scenario_code: Scenario the rule adjudicates
+            definition: SOP rule definition (see config/sop_rules.py)
+            rule_set_version: Version of the rule set, stamped on every decision
+        """
+        self.scenario_code = scenario_code
+        self.rule_set_version = rule_set_version
+        self.definition = definition
+        self.rule_id = definition["rule_id"]
+        self.description = definition.get("description", "")
+        self.priority_class = definition.get("priority_class")
+        # Content hash of the definition - changes whenever the SOP text does
+        self.version = hashlib.sha256(
+            json.dumps(definition, sort_keys=True, default=repr).encode("utf-8")
+        ).hexdigest()[:16]
+        where = f"{self.rule_id} ({scenario_code})"
+
+        self.inputs = {}
+        for name, spec in definition.get("inputs", {}).items():
+            _check_name(name, where)
+            if len(spec) != 3 or spec[0] not in INPUT_SOURCES:
+                raise RuleCompileError(f"{where}: bad input spec for {name!r}: {spec!r}")
+            source, field, default = spec
+            try:
+                valid_default = ast.literal_eval(repr(default)) == default
+            except (ValueError, SyntaxError):
+                valid_default = False
+            if not valid_default:
+                raise RuleCompileError(f"{where}: default for {name!r} must be a literal")
+            self.inputs[name] = (source, field, default)
+
+        known = set(self.inputs)
+        self.derived = {}
+        for name, source in definition.get("derived", {}).items():
+            _check_name(name, where)
+            if name in known:
+                raise RuleCompileError(f"{where}: {name!r} is defined twice")
+            self.derived[name] = parse_expression(source, known, f"{where} derived {name}")
+            known.add(name)
+        self.names = frozenset(known)
+
+        paths = list(definition.get("decision_paths", []))
+        if "default_path" not in definition:
+            raise RuleCompileError(f"{where}: missing default_path")
+        paths.append(dict(definition["default_path"], conditions=[]))
+
+        self.paths = []
+        for index, path in enumerate(paths):
+            path_where = f"{where} path {index}"
+            conditions = tuple(
+                parse_expression(condition, known, path_where)
+                for condition in path.get("conditions", [])
+            )
+            if not isinstance(path.get("action"), str) or \
+                    not isinstance(path.get("confidence"), (int, float)):
+                raise RuleCompileError(f"{path_where}: action and confidence are required")
+            template, params = compile_template(path["rationale"], known, path_where)
+            self.paths.append(DecisionPath(
+                conditions, path["action"], path["confidence"],
+                path["rationale"], template, params
+            ))
+        self.default_index = len(self.paths) - 1
+
+        self._evaluate = self._build_function(where, "evaluate")
+        # decide(alert_data, investigation_result, context_result) -> Decision record
+        self.decide = self._build_function(where, "decide")
+        # inputs(alert_data, investigation_result, context_result) -> tuple of input values
+        self.inputs_of = self._build_function(where, "inputs")
+
+    def __reduce__(self):
+        # Generated functions do not pickle - the receiving process compiles the definition
+        return type(self), (self.scenario_code, self.definition, self.rule_set_version)
+
+    def evaluate(self, alert_data, investigation_data, context_data):
+        """
+        Run the compiled rule against raw data dictionaries
+
+        Returns:
+            (path_index, rationale_params) - index into self.paths
+        """
+        return self._evaluate(alert_data, investigation_data, context_data)
+
+    def render(self, index, params):
+        """Format the rationale of path `index` from evaluate()'s params"""
+        return self.paths[index].template.format(*params)
+
+    def _build_function(self, where, mode):
+        """
+        Generate the rule as one Python function
+
+        mode "evaluate" takes the raw data dictionaries and returns
+        (path_index, rationale_params); mode "decide" takes the spoke results
+        and returns the Decision record, its rationale deferred as the path's
+        (template, params) - plain text when there are no params; mode
+        "inputs" takes the spoke results and returns just the tuple of input
+        values (everything a decision depends on).
+        """
+        if mode == "inputs":
+            reads = "".join(
+                f"{INPUT_SOURCES[source]}.get({field!r}, {default!r}), "
+                for source, field, default in self.inputs.values()
+            )
+            lines = [
+                "def _inputs(_alert, _inv_result, _ctx_result):",
+                *_SPOKE_DATA,
+                f"    return ({reads})"
+            ]
+            return self._exec(lines, where, mode)
+        if mode == "evaluate":
+            lines = ["def _evaluate(_alert, _inv, _ctx):"]
+        else:
+            lines = [
+                "def _decide(_alert, _inv_result, _ctx_result):",
+                *_SPOKE_DATA
+            ]
+        for name, (source, field, default) in self.inputs.items():
+            lines.append(f"    {name} = {INPUT_SOURCES[source]}.get({field!r}, {default!r})")
+        for name, expression in self.derived.items():
+            lines.append(f"    {name} = ({expression.source})")
+        for index, path in enumerate(self.paths):
+            if mode == "evaluate":
+                result = f"{index}, (" + "".join(f"{param}, " for param in path.params) + ")"
+            else:
+                if path.params:
+                    params = "".join(f"{param}, " for param in path.params)
+                    rationale = f"(_TEMPLATE_{index}, ({params}))"
+                else:
+                    # Nothing to format - the text itself is the constant
+                    rationale = repr(path.template.format())
+                version = "_ABSENT" if self.rule_set_version is None else repr(self.rule_set_version)
+                result = (
+                    f"_Decision(_alert['alert_id'], {path.action!r}, {rationale}, "
+                    f"{path.confidence!r}, {self.rule_id!r}, {version}, _ABSENT, None)"
+                )
+            if index == self.default_index:
+                lines.append(f"    return {result}")
+                break
+            test = " and ".join(f"({c.source})" for c in path.conditions) or "True"
+            lines.append(f"    if {test}:")
+            lines.append(f"        return {result}")
+        return self._exec(lines, where, mode)
+
+    def _exec(self, lines, where, mode):
+        """Compile generated source lines and return the function `_<mode>`"""
+        try:
+            module = ast.parse("\n".join(lines))
+            module = _TruthRewriter().visit(module)
+            ast.fix_missing_locations(module)
+            code = compile(module, f"<sop {self.rule_id}>", "exec")
+        except SyntaxError as e:
+            raise RuleCompileError(f"{where}: code generation failed: {e.msg}") from None
+        namespace = {"__builtins__": {}}
+        namespace.update(HELPERS)
+        # Positional constructor - the generated call passes every field, and its
+        # string constants are shared by all decisions of a path (no interning needed)
+        namespace["_Decision"] = Decision.from_fields
+        namespace["_ABSENT"] = ABSENT
+        namespace["_Evidence"] = Evidence
+        for index, path in enumerate(self.paths):
+            namespace[f"_TEMPLATE_{index}"] = path.template
+        exec(code, namespace)
+        return namespace[f"_{mode}"]
+
+
+def _read_only(self, *args, **kwargs):
+    raise TypeError(f"{type(self).__name__} is immutable")
+
+
+class RuleSet(dict):
+    """Dispatch table of scenario_code -> CompiledRule, tagged with its version (immutable)"""
+
+    # Still a dict, so dispatch stays a plain dict lookup - only the mutators are blocked
+    __setitem__ = __delitem__ = clear = pop = popitem = setdefault = update = _read_only
+    __ior__ = __setattr__ = __delattr__ = _read_only
+
+    def __init__(self, rules, version, source=None):
+        super().__init__(rules)
+        object.__setattr__(self, "version", version)
+        object.__setattr__(self, "source", source)
+
+    def __reduce__(self):
+        # dict pickling would refill the set item by item through __setitem__
+        return type(self), (dict(self), self.version, self.source)
+
+    def __repr__(self):
+        return f"RuleSet({self.version!r}, {sorted(self)!r})"
+
+
+def rule_set_hash(sop_rules):
+    """Content hash of a whole SOP rule set (its version when none is given)"""
+    return hashlib.sha256(
+        json.dumps(sop_rules, sort_keys=True, default=repr).encode("utf-8")
+    ).hexdigest()[:16]
+
+
+def compile_rules(sop_rules, version=None, source=None):
+    """
+    Compile every scenario of an SOP rule set
+
+    Args:
+        sop_rules: Dict of scenario_code -> rule definition
+        version: Version tag of the set (defaults to its content hash)
+        source: Where the set was loaded from (informational)
+
+    Returns:
+        RuleSet of scenario_code -> CompiledRule (the dispatch table)
+    """
+    version = rule_set_hash(sop_rules) if version is None else str(version)
+    return RuleSet({
+        scenario_code: CompiledRule(scenario_code, definition, version)
+        for scenario_code, definition in sop_rules.items()
+    }, version, source)
+
+
+@lru_cache(maxsize=1)
+def default_rules():
+    """Compiled form of config.SOP_RULES, built once per process"""
+    from config import SOP_RULES
+    return compile_rules(SOP_RULES, source="config.SOP_RULES")
@@ -0,0 +1,219 @@
+"""
+Versioned Rule Sets
+Loads SOP rule sets from versioned files and hot-swaps them into running adjudicators
+
+A rule set file is JSON: {"version": "2024-06-01.1", "rules": {scenario_code:
+definition, ...}} with definitions shaped like config.SOP_RULES. Loading
+compiles every rule and then dry-runs it on an alert without evidence (every
+input at its default, rationale rendered), so a set that cannot decide is
+rejected before it goes live.
+
+AdjudicatorAgent and AlertScheduler read the process-wide active rule set
+on every alert, so replacing it with set_rule_set() is a single reference
+swap: no lock, no pause, and each alert is decided under exactly one
+version, which its decision carries as rule_set_version. RuleSetWatcher
+polls the file and validates / compiles new versions on its own thread,
+keeping the active set whenever a new one is rejected. Forked batch
+workers restart the watcher, so they pick up new versions too; shard nodes
+(forked or spawned) are sent the coordinator's active set before their
+next chunk. Compiled rules pickle as their definitions. Write rule set
+files with `python -m config.build_rule_set` (or write_rule_set()).
+"""
+
+import hashlib
+import json
+import os
+import threading
+
+from utils import AuditLogger, ERROR, get_metrics
+from .rule_engine import RuleCompileError, compile_rules, default_rules, rule_set_hash
+
+_RELOADS = get_metrics().counter(
+    "aars_rule_set_reloads_total", "Rule set reloads by outcome", ("outcome",)
+)
+
+
+def load_rule_set(path):
+    """
+    Load, compile and validate a rule set file
+
+    Returns:
+        RuleSet tagged with the file's version (its content hash when it has none)
+
+    Raises:
+        RuleCompileError: The file is not a valid rule set
+    """
+    with open(path, "rb") as stream:
+        content = stream.read()
+    return parse_rule_set(content, path)
+
+
+def parse_rule_set(content, source=None):
+    """Compile and validate the bytes / text of a rule set file"""
+    where = source or "rule set"
+    try:
+        document = json.loads(content)
+    except ValueError as e:
+        raise RuleCompileError(f"{where}: not valid JSON: {e}") from None
+    if not isinstance(document, dict) or not isinstance(document.get("rules"), dict) \
+            or not document["rules"]:
+        raise RuleCompileError(f'{where}: expected an object with a non-empty "rules" object')
+    for scenario_code, definition in document["rules"].items():
+        if not isinstance(definition, dict) or "rule_id" not in definition:
+            raise RuleCompileError(f"{where}: rule for {scenario_code} has no rule_id")
+    version = document.get("version")
+    rule_set = compile_rules(
+        document["rules"], None if version is None else str(version), source
+    )
+    for scenario_code, rule in rule_set.items():
+        try:
+            decision = rule.decide(
+                {"alert_id": "RULE-SET-CHECK", "scenario_code": scenario_code},
+                {"data": {}}, {"data": {}}
+            )
+            str(decision["rationale"])
+        except Exception as e:
+            raise RuleCompileError(
+                f"{where}: {rule.rule_id} ({scenario_code}) fails on default inputs: {e}"
+            ) from None
+    return rule_set
+
+
+def write_rule_set(path, sop_rules, version=None):
+    """Write SOP rules as a rule set file (atomically, via a temporary file and rename)"""
+    document = {
+        "version": rule_set_hash(sop_rules) if version is None else version,
+        "rules": sop_rules
+    }
+    temporary = f"{path}.tmp-{os.getpid()}"
+    with open(temporary, "w", encoding="utf-8") as stream:
+        json.dump(document, stream, indent=2)
+        stream.write("\n")
+    os.replace(temporary, path)
+
+
+class RuleSetWatcher:
+    """Polls a rule set file and activates every new version that compiles and validates"""
+
+    def __init__(self, path, interval=1.0):
+        """
+        Loads and activates the file's rule set immediately
+
+        Args:
+            path: Rule set file
+            interval: Seconds between checks of the file (0 never re-checks)
+
+        Raises:
+            RuleCompileError: The initial rule set is not valid
+        """
+        self.path = path
+        self.interval = interval
+        self.applied = 0
+        self.rejected = 0
+        self.logger = AuditLogger()
+        self._signature = self._stat()
+        with open(path, "rb") as stream:
+            content = stream.read()
+        self._digest = hashlib.sha256(content).digest()
+        self.rule_set = parse_rule_set(content, path)
+        set_rule_set(self.rule_set)
+        self._stop = threading.Event()
+        self._thread = None
+        if interval > 0:
+            self._start()
+            if hasattr(os, "register_at_fork"):
+                # Forked workers get their own watcher thread
+                os.register_at_fork(after_in_child=self._after_fork)
+
+    def check(self):
+        """
+        Reload the file if it changed
+
+        Returns:
+            True if a new rule set was activated
+        """
+        signature = self._stat()
+        if signature is None or signature == self._signature:
+            return False
+        try:
+            with open(self.path, "rb") as stream:
+                content = stream.read()
+        except OSError:
+            return False
+        self._signature = signature
+        digest = hashlib.sha256(content).digest()
+        if digest == self._digest:
+            return False
+        try:
+            rule_set = parse_rule_set(content, self.path)
+            if rule_set.version == self.rule_set.version:
+                raise RuleCompileError(
+                    f"{self.path}: content changed but version is still {rule_set.version}"
+                )
+        except RuleCompileError as e:
+            # The active rule set stays in force - fix the file and it is retried
+            self.rejected += 1
+            _RELOADS.labels("rejected").inc()
+            self.logger.log_agent_action(
+                "Rule Set Watcher", "Rejected rule set update: %s", e, level=ERROR
+            )
+            return False
+        self._digest = digest
+        previous, self.rule_set = self.rule_set, rule_set
+        set_rule_set(rule_set)
+        self.applied += 1
+        _RELOADS.labels("applied").inc()
+        self.logger.log_agent_action(
+            "Rule Set Watcher", "Rule set %s activated (%d scenarios, was %s)",
+            rule_set.version, len(rule_set), previous.version
+        )
+        return True
+
+    def close(self):
+        """Stop watching (the active rule set stays in force)"""
+        self._stop.set()
+        if self._thread is not None and self._thread.is_alive():
+            self._thread.join()
+        self._thread = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _stat(self):
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+
+    def _start(self):
+        self._thread = threading.Thread(target=self._run, name="aars-rule-set-watcher", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.check()
+
+    def _after_fork(self):
+        if not self._stop.is_set():
+            self._stop = threading.Event()
+            self._start()
+
+
+_active = None
+
+
+def get_rule_set():
+    """The process-wide active rule set (the compiled config.SOP_RULES unless replaced)"""
+    rule_set = _active
+    return default_rules() if rule_set is None else rule_set
+
+
+def set_rule_set(rule_set):
+    """Atomically replace the process-wide active rule set (returns the previous one)"""
+    global _active
+    previous, _active = _active, rule_set
+    return previous
@@ -0,0 +1,227 @@
+"""
+Alert Scheduler
+Earliest-deadline-first priority queue with per-class SLAs and worker quotas
+
+Alerts are read from the input on a background thread into one heap per
+priority class (config/scheduling.py), keyed by deadline = creation time +
+class SLA x risk factor. The orchestrator pulls the most urgent alert whose
+class is under its share of the in-flight capacity, so a SANCTIONS_MATCH
+alert overtakes a backlog of VELOCITY_SPIKE alerts, while old low-priority
+alerts still age towards the front. Quotas are work-conserving: when every
+waiting class is over quota, the most urgent alert runs anyway.
+
+schedule() and complete() wrap process_batch's input and output the same
+way the coalescer does; complete() counts SLA misses per class.
+"""
+
+import heapq
+import itertools
+import threading
+import time
+from collections import namedtuple
+
+from config import DEFAULT_PRIORITY_CLASS, PRIORITY_CLASSES, RISK_SLA_FACTORS
+from data import get_kyc_store
+from data.feature_engine import parse_timestamp
+from utils import get_metrics
+from .rule_sets import get_rule_set
+
+_WAIT_BUCKETS = (0.001, 0.01, 0.1, 0.5, 1.0, 5.0, 15.0, 60.0, 300.0, 900.0, 3600.0, 14400.0, 86400.0)
+
+_QUEUE_WAIT = get_metrics().histogram(
+    "aars_queue_wait_seconds", "Time alerts wait in the scheduler", ("priority_class",), _WAIT_BUCKETS
+)
+_SCHEDULED = get_metrics().counter(
+    "aars_scheduled_total", "Alerts dispatched by the scheduler", ("priority_class",)
+)
+_SLA_MISSES = get_metrics().counter(
+    "aars_sla_misses_total", "Alerts decided after their SLA deadline", ("priority_class",)
+)
+
+# Scheduling metadata of a queued / in-flight alert
+Ticket = namedtuple("Ticket", ["priority_class", "deadline", "enqueued_at"])
+
+
+class AlertScheduler:
+    """Priority / SLA-aware reordering of an alert stream in front of the orchestrator"""
+
+    def __init__(self, capacity=64, max_backlog=100000, classes=None, risk_factors=None,
+                 rules=None, store=None, time_field="timestamp", clock=time.time):
+        """
+        Args:
+            capacity: In-flight alerts that class quotas are shares of
+            max_backlog: Alerts buffered before reading the input pauses
+            classes: Priority class definitions (defaults to config.PRIORITY_CLASSES)
+            risk_factors: SLA multipliers by risk_rating (defaults to config.RISK_SLA_FACTORS)
+            rules: Compiled rules naming each scenario's priority_class
+                   (defaults to the process-wide rule set, read per alert)
+            store: KycStore for risk ratings of alerts without a risk_rating field
+            time_field: Alert field holding the creation time (enqueue time if absent)
+            clock: Wall-clock time source (epoch seconds)
+        """
+        self.classes = PRIORITY_CLASSES if classes is None else classes
+        self.risk_factors = RISK_SLA_FACTORS if risk_factors is None else risk_factors
+        self.rules = rules
+        self.store = store
+        self.max_backlog = max_backlog
+        self.time_field = time_field
+        self.clock = clock
+        self.limits = {
+            name: max(1, int(capacity * spec.get("quota", 1.0))) for name, spec in self.classes.items()
+        }
+        self.in_flight = dict.fromkeys(self.classes, 0)
+        self.missed = dict.fromkeys(self.classes, 0)
+        self.completed = dict.fromkeys(self.classes, 0)
+        self.ticket_errors = 0  # alerts scheduled with the default ticket after ticket() raised
+        self._heaps = {name: [] for name in self.classes}
+        self._queued = 0
+        self._tickets = {}      # id(alert) -> Ticket while in flight
+        self._sequence = itertools.count()
+        self._condition = threading.Condition()
+        self._exhausted = False
+        self._closed = False
+        self._error = None
+
+    def __len__(self):
+        return self._queued
+
+    def ticket(self, alert):
+        """Priority class and deadline of an alert"""
+        rules = self.rules if self.rules is not None else get_rule_set()
+        rule = rules.get(alert.get("scenario_code"))
+        priority_class = getattr(rule, "priority_class", None) or DEFAULT_PRIORITY_CLASS
+        if priority_class not in self.classes:
+            priority_class = DEFAULT_PRIORITY_CLASS
+        now = self.clock()
+        created = now
+        value = alert.get(self.time_field)
+        if value not in (None, ""):
+            try:
+                created = parse_timestamp(value)
+            except (TypeError, ValueError):
+                pass
+        risk = alert.get("risk_rating")
+        if risk is None:
+            store = self.store if self.store is not None else get_kyc_store()
+            risk = (store.get(alert.get("subject_id")) or {}).get("risk_rating")
+        factor = self.risk_factors.get(risk, self.risk_factors.get("LOW", 1.0))
+        deadline = created + self.classes[priority_class]["sla_seconds"] * factor
+        return Ticket(priority_class, deadline, now)
+
+    def default_ticket(self):
+        """Ticket of an alert nothing is known about - default class, enqueued now, LOW risk"""
+        now = self.clock()
+        factor = self.risk_factors.get("LOW", 1.0)
+        return Ticket(
+            DEFAULT_PRIORITY_CLASS,
+            now + self.classes[DEFAULT_PRIORITY_CLASS]["sla_seconds"] * factor, now
+        )
+
+    def schedule(self, alerts):
+        """
+        Yield alerts most urgent first, reading `alerts` on a background thread
+
+        Args:
+            alerts: Any iterable of alert dictionaries (may block, e.g. --follow)
+        """
+        reader = threading.Thread(
+            target=self._read, args=(alerts,), name="aars-scheduler-reader", daemon=True
+        )
+        reader.start()
+        try:
+            while True:
+                with self._condition:
+                    while not self._queued and not self._exhausted:
+                        self._condition.wait()
+                    if not self._queued:
+                        if self._error is not None:
+                            raise self._error
+                        return
+                    alert, ticket = self._pop_locked()
+                    self._condition.notify_all()
+                _QUEUE_WAIT.labels(ticket.priority_class).observe(self.clock() - ticket.enqueued_at)
+                _SCHEDULED.labels(ticket.priority_class).inc()
+                yield alert
+        finally:
+            with self._condition:
+                self._closed = True
+                self._condition.notify_all()
+
+    def complete(self, results):
+        """
+        Pass BatchResults through, releasing quota and counting SLA misses
+
+        Args:
+            results: BatchResults for the alerts yielded by schedule()
+        """
+        for result in results:
+            with self._condition:
+                ticket = self._tickets.pop(id(result.alert), None)
+                if ticket is not None:
+                    self.in_flight[ticket.priority_class] -= 1
+                    self.completed[ticket.priority_class] += 1
+                    if self.clock() > ticket.deadline:
+                        self.missed[ticket.priority_class] += 1
+                        _SLA_MISSES.labels(ticket.priority_class).inc()
+            yield result
+
+    def stats(self):
+        """Per-class queued / in-flight / completed / SLA-missed counts"""
+        with self._condition:
+            return {
+                name: {
+                    "queued": len(self._heaps[name]),
+                    "in_flight": self.in_flight[name],
+                    "completed": self.completed[name],
+                    "sla_missed": self.missed[name]
+                }
+                for name in self.classes
+            }
+
+    def _read(self, alerts):
+        try:
+            for alert in alerts:
+                try:
+                    ticket = self.ticket(alert)
+                except Exception:
+                    # A malformed alert or a failing KYC store must not end the batch -
+                    # the alert still runs, under the default class and deadline
+                    self.ticket_errors += 1
+                    ticket = self.default_ticket()
+                rank = self.classes[ticket.priority_class].get("rank", 0)
+                with self._condition:
+                    while self._queued >= self.max_backlog and not self._closed:
+                        self._condition.wait()
+                    if self._closed:
+                        return
+                    heapq.heappush(
+                        self._heaps[ticket.priority_class],
+                        (ticket.deadline, rank, next(self._sequence), alert, ticket)
+                    )
+                    self._queued += 1
+                    self._condition.notify_all()
+        except Exception as e:
+            with self._condition:
+                self._error = e
+        finally:
+            with self._condition:
+                self._exhausted = True
+                self._condition.notify_all()
+
+    def _pop_locked(self):
+        # Most urgent head among classes under quota, else among all classes
+        best = best_eligible = None
+        for name, heap in self._heaps.items():
+            if not heap:
+                continue
+            if best is None or heap[0] < self._heaps[best][0]:
+                best = name
+            if self.in_flight[name] < self.limits[name] and (
+                    best_eligible is None or heap[0] < self._heaps[best_eligible][0]):
+                best_eligible = name
+        name = best_eligible if best_eligible is not None else best
+        _, _, _, alert, ticket = heapq.heappop(self._heaps[name])
+        self._queued -= 1
+        self.in_flight[name] += 1
+        self._tickets[id(alert)] = ticket
+        return alert, ticket
@@ -0,0 +1,303 @@
+"""
+Sharded Processing
+Partitions alerts by subject_id hash over shard node processes joined by a broker
+
+Every alert of a customer goes to the same shard (CRC-32 of the subject_id,
+stable across runs and processes), so each node's KYC / fact caches and
+decision memo see that customer's whole history, and a customer's alerts
+are processed and actioned in arrival order. Nodes run their own
+OrchestratorAgent and ActionExecutor; the coordinator only routes. Nodes are
+forked by default so they inherit the process-wide configuration.
+
+The coordinator publishes chunks of alerts to topic "shard.<n>", each
+preceded by the coordinator's active rule set whenever that shard has not
+been sent it yet - so a hot-reloaded version reaches spawned nodes too,
+before their next chunk. It merges
+the nodes' decision streams and drained metrics from topic "results",
+keeping a bounded number of chunks in flight. Results are yielded as they
+arrive: in order per subject, interleaved across shards. A node that dies
+fails the chunks it still held instead of stalling the run. Actions a
+node's dispatcher could not deliver are reported with its stop message and
+collected in `undelivered`.
+"""
+
+import queue
+import zlib
+from itertools import count
+from multiprocessing import get_all_start_methods, get_context
+
+from actions import ActionExecutor
+from data import warm_up
+from utils import AuditLogger, WARNING, get_metrics
+from .broker import LocalBroker
+from .orchestrator import BatchResult, OrchestratorAgent
+from .rule_sets import get_rule_set, set_rule_set
+
+_RESULTS = "results"
+
+_SHARD_ALERTS = get_metrics().counter(
+    "aars_shard_alerts_total", "Alerts routed to each shard", ("shard",)
+)
+
+
+def shard_of(subject_id, shards):
+    """Shard index of a subject - the same in every process and run"""
+    return zlib.crc32(str(subject_id).encode("utf-8")) % shards
+
+
+class ShardCoordinator:
+    """Routes alerts to shard nodes by subject and merges their results"""
+
+    def __init__(self, shards=2, broker=None, chunksize=32, max_in_flight=None,
+                 executor_factory=None, poll_interval=0.5, mp_context=None):
+        """
+        Args:
+            shards: Number of shard node processes
+            broker: Broker the nodes are reached through (defaults to a LocalBroker)
+            chunksize: Alerts per published chunk
+            max_in_flight: Chunks published but not yet answered (defaults to 2 per shard)
+            executor_factory: Picklable callable returning each node's ActionExecutor
+                              (None builds a default one)
+            poll_interval: Seconds between liveness checks of the nodes while waiting
+            mp_context: multiprocessing context starting the nodes (defaults to fork,
+                        whatever the default start method, so nodes inherit the
+                        configured stores, decision memo and audit sinks - spawned
+                        ones start from defaults; without fork the alerts are
+                        processed in-process)
+        """
+        self.shards = shards
+        self.broker = LocalBroker() if broker is None else broker
+        self.chunksize = chunksize
+        self.max_in_flight = max_in_flight or 2 * shards
+        self.executor_factory = executor_factory
+        self.poll_interval = poll_interval
+        self.mp_context = mp_context
+        self.routed = [0] * shards
+        self.failed = [0] * shards
+        self.undelivered = []       # (alert_id, action, error) the nodes could not deliver
+        self._sequence = count()
+        self._in_flight = {}        # sequence -> (shard, alerts as given)
+        self._rule_sets = [None] * shards   # rule set each shard was last sent
+        self._nodes = []
+        self._stopped = {}          # shard -> None once drained, else why it failed
+
+    def process(self, alerts):
+        """
+        Process alerts on the shard nodes, which also execute their actions
+
+        Args:
+            alerts: Iterable of alert dictionaries / records (consumed lazily)
+
+        Yields:
+            BatchResult(alert, decision, error) for every input alert
+        """
+        if self.mp_context is None and "fork" not in get_all_start_methods():
+            AuditLogger().log_agent_action(
+                "Shard Coordinator", "Shard nodes need fork - processing the alerts in-process",
+                level=WARNING
+            )
+            yield from self._process_in_process(alerts)
+            return
+        self._start()
+        try:
+            pending = [[] for _ in range(self.shards)]
+            for alert in alerts:
+                shard = shard_of(alert.get("subject_id"), self.shards)
+                chunk = pending[shard]
+                chunk.append(alert)
+                if len(chunk) >= self.chunksize:
+                    yield from self._publish(shard, chunk)
+                    pending[shard] = []
+                    while len(self._in_flight) >= self.max_in_flight:
+                        yield from self._receive()
+            for shard, chunk in enumerate(pending):
+                if chunk:
+                    yield from self._publish(shard, chunk)
+                self.broker.put(f"shard.{shard}", None)
+            while self._in_flight or len(self._stopped) < self.shards:
+                yield from self._receive()
+        finally:
+            self._stop()
+
+    def stats(self):
+        """Per-shard routed / failed alert counts"""
+        return {
+            shard: {"routed": self.routed[shard], "failed": self.failed[shard]}
+            for shard in range(self.shards)
+        }
+
+    def _process_in_process(self, alerts):
+        orchestrator = OrchestratorAgent()
+        executor = ActionExecutor() if self.executor_factory is None else self.executor_factory()
+        logger = AuditLogger()
+        try:
+            chunk = []
+            for alert in alerts:
+                chunk.append(alert)
+                self.routed[shard_of(alert.get("subject_id"), self.shards)] += 1
+                if len(chunk) >= self.chunksize:
+                    yield from self._run_in_process(orchestrator, executor, logger, chunk)
+                    chunk = []
+            if chunk:
+                yield from self._run_in_process(orchestrator, executor, logger, chunk)
+            self.undelivered.extend(_close_dispatcher(executor))
+        finally:
+            orchestrator.close()
+
+    def _run_in_process(self, orchestrator, executor, logger, chunk):
+        pairs = _process_chunk(orchestrator, executor, logger, chunk)
+        for alert, (decision, error) in zip(chunk, pairs):
+            if error is not None:
+                self.failed[shard_of(alert.get("subject_id"), self.shards)] += 1
+            yield BatchResult(alert, decision, error)
+
+    def _start(self):
+        self.broker.start()
+        mp_context = self.mp_context or get_context("fork")
+        if mp_context.get_start_method() == "fork":
+            # Forked nodes inherit the parent's loaded data instead of each loading it
+            warm_up()
+        self._nodes = [
+            mp_context.Process(
+                target=run_shard, args=(shard, self.broker, self.executor_factory),
+                name=f"aars-shard-{shard}", daemon=True
+            )
+            for shard in range(self.shards)
+        ]
+        for node in self._nodes:
+            node.start()
+
+    def _stop(self):
+        for node in self._nodes:
+            node.join(timeout=5.0)
+            if node.is_alive():
+                node.terminate()
+                node.join()
+        self.broker.close()
+
+    def _publish(self, shard, chunk):
+        """Send a chunk to its shard (yields its failed results if the node is gone)"""
+        sequence = next(self._sequence)
+        self._in_flight[sequence] = (shard, chunk)
+        self.routed[shard] += len(chunk)
+        _SHARD_ALERTS.labels(str(shard)).inc(len(chunk))
+        if shard in self._stopped:
+            yield from self._fail_shard(shard, self._stopped[shard] or f"shard {shard} stopped")
+            return
+        rule_set = get_rule_set()
+        if rule_set is not self._rule_sets[shard]:
+            # Pickled as its definitions - the node compiles and activates it
+            self.broker.put(f"shard.{shard}", ("rules", rule_set))
+            self._rule_sets[shard] = rule_set
+        self.broker.put(f"shard.{shard}", (sequence, chunk))
+
+    def _receive(self):
+        """Yield the results of the next message from the nodes (or of a dead node's chunks)"""
+        try:
+            kind, shard, sequence, payload, metrics = self.broker.get(_RESULTS, self.poll_interval)
+        except queue.Empty:
+            yield from self._reap()
+            return
+        if metrics:
+            get_metrics().merge(metrics)
+        if kind == "stopped":
+            self._stopped[shard] = None
+            self.undelivered.extend(payload or ())
+            return
+        if kind == "crashed":
+            self._stopped[shard] = f"shard {shard} failure: {payload}"
+            yield from self._fail_shard(shard, self._stopped[shard])
+            return
+        _, chunk = self._in_flight.pop(sequence, (None, ()))
+        for alert, (decision, error) in zip(chunk, payload):
+            if error is not None:
+                self.failed[shard] += 1
+            yield BatchResult(alert, decision, error)
+
+    def _reap(self):
+        for shard, node in enumerate(self._nodes):
+            if shard not in self._stopped and not node.is_alive():
+                self._stopped[shard] = f"shard {shard} exited with code {node.exitcode}"
+                yield from self._fail_shard(shard, self._stopped[shard])
+
+    def _fail_shard(self, shard, error):
+        for sequence, (owner, chunk) in list(self._in_flight.items()):
+            if owner != shard:
+                continue
+            del self._in_flight[sequence]
+            self.failed[shard] += len(chunk)
+            for alert in chunk:
+                yield BatchResult(alert, None, error)
+
+
+# ---------------------------------------------------------------------------
+# Shard node (module level so spawned processes can import it)
+# ---------------------------------------------------------------------------
+
+def run_shard(shard, broker, executor_factory=None):
+    """
+    Shard node main loop - process and action chunks until the stop message
+
+    Every chunk is answered with (decision, error) pairs and the metrics
+    recorded for it; an action failure is reported as the alert's error. A
+    ("rules", rule_set) message replaces the node's active rule set.
+
+    Args:
+        shard: Index of this node (reads topic "shard.<shard>")
+        broker: Broker shared with the coordinator
+        executor_factory: Callable returning this node's ActionExecutor
+    """
+    # Forked nodes start with a copy of the parent's counts - report only their own
+    get_metrics().reset()
+    orchestrator = executor = None
+    try:
+        orchestrator = OrchestratorAgent()
+        executor = ActionExecutor() if executor_factory is None else executor_factory()
+        logger = AuditLogger()
+        topic = f"shard.{shard}"
+        while True:
+            message = broker.get(topic)
+            if message is None:
+                break
+            if message[0] == "rules":
+                # The coordinator's active rule set - decide the next chunks under it
+                set_rule_set(message[1])
+                continue
+            sequence, chunk = message
+            pairs = _process_chunk(orchestrator, executor, logger, chunk)
+            broker.put(_RESULTS, ("chunk", shard, sequence, pairs, get_metrics().drain()))
+        # Actions still queued in the node's dispatcher are delivered before it reports
+        undelivered = _close_dispatcher(executor)
+        broker.put(_RESULTS, ("stopped", shard, None, undelivered, get_metrics().drain()))
+    except Exception as e:
+        broker.put(_RESULTS, ("crashed", shard, None, f"{type(e).__name__}: {e}", None))
+    finally:
+        if orchestrator is not None:
+            orchestrator.close()
+        broker.close()
+
+
+def _close_dispatcher(executor):
+    """Close the executor's dispatcher - (alert_id, action, error) of every undelivered action"""
+    if executor.dispatcher is None:
+        return []
+    return [
+        (request.alert_id, request.action, f"{type(error).__name__}: {error}")
+        for request, error in executor.dispatcher.close()
+    ]
+
+
+def _process_chunk(orchestrator, executor, logger, chunk):
+    """Decide and action a chunk - (decision, error) per alert, action failures included"""
+    pairs = []
+    for alert, decision, error in orchestrator.process_batch(chunk, workers=1):
+        if error is None:
+            try:
+                executor.execute(decision, alert)
+                if executor.dispatcher is None:
+                    # A dispatched action's alert is complete once delivered
+                    logger.log_alert_complete(alert["alert_id"])
+            except Exception as e:
+                error = str(e)
+        pairs.append((decision, error))
+    return pairs
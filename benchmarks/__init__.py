@@ -0,0 +1,4 @@
+"""
+Benchmarks module
+Performance harnesses for the alert resolution pipeline
+"""
@@ -0,0 +1,345 @@
+"""
+Pipeline Benchmark
+Throughput, latency percentiles and peak RSS of each pipeline stage over synthetic alerts
+
+Stages:
+    adjudicator   - AdjudicatorAgent.adjudicate only (spoke results prepared untimed)
+    orchestrator  - OrchestratorAgent.process_alert (spokes + adjudication)
+    executor      - ActionExecutor.execute only (decisions prepared untimed)
+    end_to_end    - process_batch + execute, as main.py runs it
+    sharded       - ShardCoordinator over --shards node processes (main.py --shards)
+
+Each stage runs in a fresh process so its peak RSS is its own, and reports
+the time spent importing the pipeline modules (import_ms). startup_ms is
+the median wall time of `python -c "import main"`, and cli_ms that of
+`python main.py --quiet` over an empty input - what every CLI invocation
+pays before reading its first alert; interpreter_ms (`python -c pass`) is
+the part no change to the repo can remove. The run fails when cli_ms exceeds
+interpreter_ms by more than --startup-budget-ms. memory_per_alert is the
+traced memory of a held batch of results (alert + decision per alert),
+with alerts and decisions as plain dicts versus compact records. Results are
+printed (or written) as JSON; --compare flags throughput regressions against
+an earlier result file and exits non-zero when any stage regressed.
+Workers and shard nodes are forked, so they start without re-importing
+anything.
+
+Usage:
+    python -m benchmarks.bench_pipeline [--scale N] [--seed S] [--workers N] [--shards N]
+                                        [--stages a,b] [--output FILE]
+                                        [--startup-runs N] [--startup-budget-ms MS]
+                                        [--footprint-alerts N]
+                                        [--compare BASELINE.json] [--tolerance 0.1]
+"""
+
+import argparse
+import json
+import math
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - not available on Windows
+    resource = None
+
+STAGES = ("adjudicator", "orchestrator", "executor", "end_to_end", "sharded")
+
+# Start-up the CLI may add to a bare interpreter before its first alert
+STARTUP_BUDGET_MS = 100.0
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class LatencyHistogram:
+    """Log-bucketed latency histogram - constant memory, ~1% percentile precision"""
+
+    def __init__(self, precision=0.01):
+        self._log_base = math.log1p(precision)
+        self._base = 1.0 + precision
+        self.buckets = {}
+        self.count = 0
+        self.max = 0.0
+
+    def record(self, seconds):
+        nanoseconds = max(seconds * 1e9, 1.0)
+        bucket = math.ceil(math.log(nanoseconds) / self._log_base)
+        self.buckets[bucket] = self.buckets.get(bucket, 0) + 1
+        self.count += 1
+        if seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, fraction):
+        """Upper bound (seconds) of the bucket holding the given quantile"""
+        if not self.count:
+            return None
+        rank = max(1, math.ceil(fraction * self.count))
+        seen = 0
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+            if seen >= rank:
+                return min(self._base ** bucket / 1e9, self.max)
+        return self.max
+
+
+def peak_rss_mb(who="self"):
+    """Peak resident set size in MiB (None where the resource module is unavailable)"""
+    if resource is None:
+        return None
+    usage = resource.getrusage(resource.RUSAGE_SELF if who == "self" else resource.RUSAGE_CHILDREN)
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    scale = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return round(usage.ru_maxrss / scale, 1)
+
+
+def launch_ms(args, runs=5):
+    """Median wall time (ms) of a fresh interpreter run with the given arguments"""
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        subprocess.run([sys.executable] + args, cwd=REPO_ROOT, check=True, stdout=subprocess.DEVNULL)
+        samples.append(time.perf_counter() - started)
+    return round(statistics.median(samples) * 1e3, 1)
+
+
+def startup(runs=5):
+    """Interpreter, `import main` and empty-input CLI launch times (ms)"""
+    with tempfile.TemporaryDirectory() as directory:
+        empty = os.path.join(directory, "empty.jsonl")
+        open(empty, "w").close()
+        return {
+            "interpreter_ms": launch_ms(["-c", "pass"], runs),
+            "startup_ms": launch_ms(["-c", "import main"], runs),
+            "cli_ms": launch_ms(["main.py", "--quiet", empty], runs)
+        }
+
+
+def footprint(count, seed):
+    """Bytes per alert of a held batch of BatchResults - dicts versus compact records"""
+    import gc
+    import tracemalloc
+    from data import Alert, set_fact_index, set_kyc_store
+    from agents import AdjudicatorAgent, ContextGathererAgent, InvestigatorAgent
+    from agents.orchestrator import BatchResult
+    from utils import configure_logging
+    from .synthetic import SyntheticFactIndex, SyntheticKycStore, generate_alerts
+
+    configure_logging(quiet=True)
+    set_kyc_store(SyntheticKycStore(seed))
+    set_fact_index(SyntheticFactIndex(seed))
+    investigator, context, adjudicator = InvestigatorAgent(), ContextGathererAgent(), AdjudicatorAgent()
+    # Alerts arrive as JSON lines, so each parsed alert holds its own strings
+    lines = [json.dumps(alert) for alert in generate_alerts(count, seed)]
+    result = {}
+    for form in ("dicts", "records"):
+        gc.collect()
+        tracemalloc.start()
+        held = []
+        for line in lines:
+            alert = json.loads(line)
+            if form == "records":
+                alert = Alert.from_dict(alert)
+            decision = adjudicator.adjudicate(
+                alert, investigator.investigate(alert), context.gather_context(alert)
+            )
+            if form == "dicts":
+                decision = decision.to_dict()
+            held.append(BatchResult(alert, decision, None))
+        result[form] = round(tracemalloc.get_traced_memory()[0] / count)
+        tracemalloc.stop()
+        del held
+    result["saving"] = round(1.0 - result["records"] / result["dicts"], 3)
+    return result
+
+
+def run_stage(stage, scale, seed, workers, shards=2):
+    """Run one stage in the current process and return its result dictionary"""
+    imported = time.perf_counter()
+    from data import set_fact_index, set_kyc_store
+    from agents import (
+        AdjudicatorAgent, ContextGathererAgent, InvestigatorAgent, OrchestratorAgent, ShardCoordinator
+    )
+    from actions import ActionExecutor
+    from utils import AuditLogger, configure_logging
+    from .synthetic import SyntheticFactIndex, SyntheticKycStore, generate_alerts
+    import_seconds = time.perf_counter() - imported
+
+    configure_logging(quiet=True)
+    set_kyc_store(SyntheticKycStore(seed))
+    set_fact_index(SyntheticFactIndex(seed))
+    alerts = generate_alerts(scale, seed)
+    histogram = LatencyHistogram()
+    clock = time.perf_counter
+    errors = 0
+
+    if stage in ("adjudicator", "executor"):
+        investigator, context = InvestigatorAgent(), ContextGathererAgent()
+        adjudicator, executor = AdjudicatorAgent(), ActionExecutor()
+        busy = 0.0
+        for alert in alerts:
+            investigation = investigator.investigate(alert)
+            customer = context.gather_context(alert)
+            start = clock()
+            decision = adjudicator.adjudicate(alert, investigation, customer)
+            if stage == "executor":
+                start = clock()
+                executor.execute(decision, alert)
+            elapsed = clock() - start
+            busy += elapsed
+            histogram.record(elapsed)
+        seconds = busy
+
+    elif stage == "orchestrator":
+        orchestrator = OrchestratorAgent()
+        start_all = clock()
+        for alert in alerts:
+            start = clock()
+            orchestrator.process_alert(alert)
+            histogram.record(clock() - start)
+        seconds = clock() - start_all
+        orchestrator.close()
+
+    elif stage == "sharded":
+        # Forked, so the nodes share this process's synthetic stores and quiet logging
+        coordinator = ShardCoordinator(shards, mp_context=get_context("fork"))
+        start_all = clock()
+        for _, _, error in coordinator.process(alerts):
+            errors += error is not None
+        seconds = clock() - start_all
+
+    else:
+        orchestrator, executor, logger = OrchestratorAgent(), ActionExecutor(), AuditLogger()
+        start_all = last = clock()
+        for alert, decision, error in orchestrator.process_batch(alerts, workers=workers):
+            if error is None:
+                executor.execute(decision, alert)
+                logger.log_alert_complete(alert["alert_id"])
+            else:
+                errors += 1
+            now = clock()
+            # Per-alert latency only exists in-process; with workers it is inter-arrival time
+            if workers <= 1:
+                histogram.record(now - last)
+            last = now
+        seconds = clock() - start_all
+        orchestrator.close()
+
+    def micros(value):
+        return None if value is None else round(value * 1e6, 2)
+
+    return {
+        "alerts": scale,
+        "errors": errors,
+        "import_ms": round(import_seconds * 1e3, 1),
+        "seconds": round(seconds, 4),
+        "throughput_per_s": round(scale / seconds, 1) if seconds else None,
+        "latency_us": {
+            "p50": micros(histogram.percentile(0.50)),
+            "p99": micros(histogram.percentile(0.99)),
+            "max": micros(histogram.max if histogram.count else None)
+        },
+        "peak_rss_mb": peak_rss_mb(),
+        "peak_rss_workers_mb": peak_rss_mb("children") if (
+            stage == "sharded" or stage == "end_to_end" and workers > 1) else None
+    }
+
+
+def compare(results, baseline, tolerance):
+    """Print per-stage throughput ratios - returns the names of regressed stages"""
+    regressed = []
+    print(f"{'stage':<16}{'baseline/s':>14}{'current/s':>14}{'ratio':>9}", file=sys.stderr)
+    for stage, current in results["stages"].items():
+        previous = baseline.get("stages", {}).get(stage)
+        if not previous or not previous.get("throughput_per_s"):
+            continue
+        ratio = current["throughput_per_s"] / previous["throughput_per_s"]
+        flag = "  REGRESSION" if ratio < 1.0 - tolerance else ""
+        if flag:
+            regressed.append(stage)
+        print(f"{stage:<16}{previous['throughput_per_s']:>14,.0f}"
+              f"{current['throughput_per_s']:>14,.0f}{ratio:>9.2f}{flag}", file=sys.stderr)
+    return regressed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--scale", type=int, default=1000, help="alerts per stage (10^3 - 10^7)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--workers", type=int, default=1, help="worker processes for end_to_end")
+    parser.add_argument("--shards", type=int, default=2, help="shard node processes for sharded")
+    parser.add_argument("--stages", default=",".join(STAGES))
+    parser.add_argument("--output", metavar="FILE", help="write JSON here instead of stdout")
+    parser.add_argument("--compare", metavar="BASELINE", help="earlier JSON result to compare against")
+    parser.add_argument("--startup-runs", type=int, default=5,
+                        help="interpreter launches timed for startup_ms / cli_ms (0 skips them)")
+    parser.add_argument("--startup-budget-ms", type=float, default=STARTUP_BUDGET_MS,
+                        help="allowed cli_ms above interpreter_ms (default: %(default)g)")
+    parser.add_argument("--footprint-alerts", type=int, default=10000,
+                        help="alerts held for memory_per_alert (0 skips it)")
+    parser.add_argument("--tolerance", type=float, default=0.10,
+                        help="allowed throughput drop before a stage counts as regressed")
+    args = parser.parse_args(argv)
+
+    stages = [stage.strip() for stage in args.stages.split(",") if stage.strip()]
+    unknown = set(stages) - set(STAGES)
+    if unknown:
+        parser.error(f"unknown stages: {', '.join(sorted(unknown))}")
+
+    results = {
+        "benchmark": "pipeline",
+        "scale": args.scale,
+        "seed": args.seed,
+        "workers": args.workers,
+        "shards": args.shards,
+        "started_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "environment": {
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count()
+        },
+        "stages": {}
+    }
+    if args.startup_runs > 0:
+        results.update(startup(args.startup_runs))
+    for stage in stages:
+        # Fresh interpreter per stage so peak RSS is not inherited
+        with ProcessPoolExecutor(max_workers=1, mp_context=get_context("spawn")) as pool:
+            results["stages"][stage] = pool.submit(
+                run_stage, stage, args.scale, args.seed, args.workers, args.shards
+            ).result()
+    if args.footprint_alerts > 0:
+        with ProcessPoolExecutor(max_workers=1, mp_context=get_context("spawn")) as pool:
+            results["memory_per_alert"] = pool.submit(footprint, args.footprint_alerts, args.seed).result()
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as stream:
+            stream.write(output + "\n")
+    else:
+        print(output)
+
+    failures = []
+    if args.startup_runs > 0:
+        overhead = results["cli_ms"] - results["interpreter_ms"]
+        print(f"CLI start-up: {overhead:.1f} ms above the interpreter "
+              f"(budget {args.startup_budget_ms:g} ms)", file=sys.stderr)
+        if overhead > args.startup_budget_ms:
+            failures.append(f"CLI start-up {overhead:.1f} ms over the {args.startup_budget_ms:g} ms budget")
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as stream:
+            regressed = compare(results, json.load(stream), args.tolerance)
+        if regressed:
+            failures.append(f"throughput regression in: {', '.join(regressed)}")
+    if failures:
+        sys.exit("; ".join(failures))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+"""
+Rule Engine Benchmark
+Decisions/second of the compiled SOP rule engine versus the hand-written reference
+
+Compiled decisions defer their rationale text; the "rationale read" row
+also reads it, as an audited or actioned decision would.
+
+Usage:
+    python -m benchmarks.bench_rule_engine [--iterations N]
+"""
+
+import argparse
+import random
+import time
+
+from agents.rule_engine import default_rules
+from data import ALERTS, HISTORIC_TRANSACTIONS_DB, KYC_DB
+from .reference_adjudicator import ReferenceAdjudicator
+
+
+def build_cases():
+    """(alert, investigation_result, context_result) for every sample alert"""
+    cases = []
+    for alert in ALERTS:
+        findings = HISTORIC_TRANSACTIONS_DB.get(alert["scenario_code"], {})
+        cases.append((
+            alert,
+            {"status": "success", "data": findings.get(alert["subject_id"], {})},
+            {"status": "success", "data": KYC_DB.get(alert["subject_id"], {})}
+        ))
+    return cases
+
+
+def fuzz_cases(count, seed=7):
+    """Randomized cases across all scenarios, including boundary values"""
+    rng = random.Random(seed)
+    occupations = ["Teacher", "Small Business Owner", "Jeweler", "Gold Trader",
+                   "Import / Export", "Freelancer", ""]
+    investigations = {
+        "VELOCITY_SPIKE": lambda: {
+            "historical_max_txn_90d": rng.choice([0, 500, 1500, 20000]),
+            "txn_count_last_48h": rng.randint(0, 10),
+            "prior_velocity_spike": rng.random() < 0.3
+        },
+        "STRUCTURING": lambda: {
+            "cash_deposits_7d": [rng.choice([4000, 9500, 9999, 10000, 12000])
+                                 for _ in range(rng.randint(0, 4))],
+            "linked_accounts_total": rng.choice([0, 28000, 28001, 29500]),
+            "linked_reportable_deposits": rng.choice([0, 0, 1]),
+            "geographically_diverse": rng.random() < 0.5
+        },
+        "KYC_INCONSISTENCY": lambda: {
+            "wire_amount": rng.choice([0, 19999, 20000, 50000]),
+            "merchant_category": rng.choice(["Precious Metals Trading", "Grocery"])
+        },
+        "SANCTIONS_MATCH": lambda: {
+            "counterparty_name": rng.choice(["AL QUDS TRADING", "ACME LTD"]),
+            "similarity_score": rng.choice([0, 0.35, 0.79, 0.80, 0.97]),
+            "bank_jurisdiction": rng.choice(["High Risk", "Low Risk", ""])
+        },
+        "DORMANT_ACCOUNT": lambda: {
+            "months_inactive": rng.randint(0, 30),
+            "international_withdrawal": rng.random() < 0.5
+        }
+    }
+    cases = []
+    for index in range(count):
+        scenario_code = rng.choice(sorted(investigations))
+        kyc = {
+            "occupation": rng.choice(occupations),
+            "declared_income": rng.choice([0, 50000, 120000, 500000]),
+            "source_of_funds": rng.choice(["Salary", "Business Revenue"]),
+            "risk_rating": rng.choice(["LOW", "MEDIUM", "HIGH"])
+        }
+        alert = {"alert_id": f"F-{index}", "scenario_code": scenario_code,
+                 "subject_id": f"CUST-{index}"}
+        cases.append((
+            alert,
+            {"status": "success", "data": investigations[scenario_code]()},
+            {"status": "success", "data": kyc}
+        ))
+    return cases
+
+
+def check_equivalence(cases, reference, rules):
+    """Raise AssertionError if any compiled decision differs from the reference"""
+    for alert, investigation, context in cases:
+        expected = reference.adjudicate(alert, investigation, context)
+        actual = rules[alert["scenario_code"]].decide(alert, investigation, context)
+        # The reference predates rule set versions - compare everything but the tag
+        actual = {key: value for key, value in actual.items() if key != "rule_set_version"}
+        if expected != actual:
+            raise AssertionError(
+                f"{alert['alert_id']}: compiled decision differs\n"
+                f"  reference: {expected}\n  compiled:  {actual}"
+            )
+
+
+def time_decisions(decide, cases, iterations, repeats=3):
+    """Best-of-`repeats` decisions per second for `decide` over `cases`"""
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            for alert, investigation, context in cases:
+                decide(alert, investigation, context)
+        best = min(best, time.perf_counter() - start)
+    return iterations * len(cases) / best
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=20000)
+    parser.add_argument("--fuzz", type=int, default=5000,
+                        help="randomized cases checked for identical decisions")
+    args = parser.parse_args(argv)
+
+    cases = build_cases()
+    reference = ReferenceAdjudicator()
+    rules = default_rules()
+    check_equivalence(cases + fuzz_cases(args.fuzz), reference, rules)
+
+    def compiled(alert, investigation, context):
+        return rules[alert["scenario_code"]].decide(alert, investigation, context)
+
+    def rendered(alert, investigation, context):
+        return rules[alert["scenario_code"]].decide(alert, investigation, context)["rationale"]
+
+    def evaluate_only(alert, investigation, context):
+        return rules[alert["scenario_code"]].evaluate(
+            alert, investigation["data"], context["data"]
+        )
+
+    reference_rate = time_decisions(reference.adjudicate, cases, args.iterations)
+    compiled_rate = time_decisions(compiled, cases, args.iterations)
+    rendered_rate = time_decisions(rendered, cases, args.iterations)
+    evaluate_rate = time_decisions(evaluate_only, cases, args.iterations)
+
+    print(f"{'engine':<28}{'decisions/s':>15}")
+    print(f"{'reference (if/elif)':<28}{reference_rate:>15,.0f}")
+    print(f"{'compiled':<28}{compiled_rate:>15,.0f}")
+    print(f"{'compiled (rationale read)':<28}{rendered_rate:>15,.0f}")
+    print(f"{'compiled (no rationale)':<28}{evaluate_rate:>15,.0f}")
+    # The reference formats every rationale, like the pre-record engine's f-strings did
+    print(f"speedup: {compiled_rate / reference_rate:.2f}x, "
+          f"{rendered_rate / reference_rate:.2f}x with the rationale read "
+          f"({len(cases)} alerts x {args.iterations} iterations, decisions identical)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+Sanctions Screening Benchmark
+Trigram-indexed screening versus brute-force scoring against every listed name
+
+Usage:
+    python -m benchmarks.bench_sanctions [--entries N] [--queries N]
+"""
+
+import argparse
+import random
+import time
+
+from data.sanctions_screener import (
+    SanctionsEntry, SanctionsScreener, dice, normalize_name, trigrams
+)
+
+SYLLABLES = [onset + vowel + coda
+             for onset in ["", "b", "d", "f", "g", "h", "k", "kh", "l", "m", "n",
+                           "p", "q", "r", "s", "sh", "t", "v", "z"]
+             for vowel in ["a", "e", "i", "o", "u"]
+             for coda in ["", "n", "r", "s"]]
+WORDS = ["TRADING", "SHIPPING", "HOLDINGS", "EXPORTS", "BANK", "GROUP", "MARINE",
+         "ENERGY", "LOGISTICS", "METALS", "FOUNDATION", "SUPPLY"]
+
+
+def synthetic_list(count, seed=5):
+    """Random entity names with one or two aliases each"""
+    rng = random.Random(seed)
+
+    entries = []
+    for index in range(count):
+        name = f"{random_word(rng)} {random_word(rng)} {rng.choice(WORDS)}"
+        aliases = tuple(perturb(name, rng) for _ in range(rng.randint(1, 2)))
+        entries.append(SanctionsEntry(f"SYN-{index}", name, aliases, "High Risk", "SYN"))
+    return entries
+
+
+def random_word(rng):
+    return "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 3))).upper()
+
+
+def perturb(name, rng):
+    """Typo-style variant: drop, swap or substitute one character"""
+    chars = list(name)
+    position = rng.randrange(len(chars))
+    operation = rng.random()
+    if operation < 0.33:
+        del chars[position]
+    elif operation < 0.66 and position + 1 < len(chars):
+        chars[position], chars[position + 1] = chars[position + 1], chars[position]
+    else:
+        chars[position] = rng.choice("AEIOUKQZ")
+    return "".join(chars)
+
+
+def brute_force(entries, name, min_score):
+    """Best score over every name and alias, without the index"""
+    query = trigrams(normalize_name(name))
+    best = 0.0
+    for entry in entries:
+        for candidate in (entry.name,) + entry.aliases:
+            best = max(best, dice(query, trigrams(normalize_name(candidate))))
+    return round(best, 4) if best >= min_score else 0.0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--entries", type=int, default=100000)
+    parser.add_argument("--queries", type=int, default=1000)
+    parser.add_argument("--min-score", type=float, default=0.7)
+    args = parser.parse_args(argv)
+
+    entries = synthetic_list(args.entries)
+    start = time.perf_counter()
+    screener = SanctionsScreener(entries)
+    build = time.perf_counter() - start
+
+    rng = random.Random(9)
+    queries = [
+        perturb(rng.choice(entries).name, rng) if rng.random() < 0.5
+        else f"{random_word(rng)} {random_word(rng)} {rng.choice(WORDS)}"
+        for _ in range(args.queries)
+    ]
+
+    start = time.perf_counter()
+    results = screener.screen_many(queries, top_k=5, min_score=args.min_score)
+    indexed = time.perf_counter() - start
+    hits = sum(1 for matches in results if matches)
+
+    sample = queries[:10]
+    small = entries[:max(1, args.entries // 20)]
+    small_screener = SanctionsScreener(small)
+    start = time.perf_counter()
+    for query in sample:
+        expected = brute_force(small, query, args.min_score)
+        if small_screener.best_score(query, args.min_score) != expected:
+            raise AssertionError(f"{query}: indexed score differs from brute force")
+    brute = (time.perf_counter() - start) / len(sample) * (args.entries / len(small))
+
+    print(f"list: {args.entries:,} entries ({len(screener._record_grams):,} names incl. aliases)")
+    print(f"{'index build':<28}{build:>12.2f} s")
+    print(f"{'indexed screening':<28}{args.queries / indexed:>12,.0f} names/s ({hits:,} with matches)")
+    print(f"{'brute force (est.)':<28}{1 / brute:>12,.1f} names/s")
+    print(f"speedup: {brute * args.queries / indexed:,.0f}x (top scores identical on sample)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+"""
+Synthetic Data Generator
+Seeded, lazily generated KYC profiles, historic facts and alerts at any scale
+
+Every record is derived from (seed, record index) alone, so 10^7 alerts need
+no more memory than 10^3: profiles and facts are computed when a store is
+queried and alerts are yielded one by one. The same seed always produces the
+same data, which keeps benchmark runs comparable.
+"""
+
+import random
+
+from data import FactIndex, KycStore
+
+SCENARIOS = ("VELOCITY_SPIKE", "STRUCTURING", "KYC_INCONSISTENCY", "SANCTIONS_MATCH", "DORMANT_ACCOUNT")
+
+OCCUPATIONS = ("Teacher", "Small Business Owner", "Jeweler", "Gold Trader", "Software Engineer",
+               "Import / Export", "Freelancer", "Retired", "Nurse", "Restaurant Owner")
+FUNDS = ("Salary", "Business Revenue", "Pension", "Investments", "Jewelry Business")
+COUNTERPARTIES = ("AL QUDS TRADING", "ACME LTD", "NORTH STAR MARINE", "GLOBEX SUPPLY",
+                  "GOLDEN CRESCENT BULLION", "BLUE LAGOON EXCHANGE", "SUNRISE FOODS")
+MERCHANTS = ("Precious Metals Trading", "Grocery", "Electronics", "Travel Agency", "Real Estate")
+
+# Share of lookups that find nothing, exercising the not_found paths
+MISSING_KYC_RATE = 0.01
+MISSING_FACTS_RATE = 0.02
+
+_STREAM_STRIDE = 1000003
+
+
+def subject_id(index):
+    return f"SYN-{index:08d}"
+
+
+def _subject_index(subject):
+    try:
+        return int(subject[4:]) if subject.startswith("SYN-") else None
+    except ValueError:
+        return None
+
+
+def _rng(seed, stream, index):
+    return random.Random((seed * 16 + stream) * _STREAM_STRIDE + index)
+
+
+def kyc_profile(seed, index):
+    """KYC profile of synthetic subject `index`, or None for a missing profile"""
+    rng = _rng(seed, 1, index)
+    if rng.random() < MISSING_KYC_RATE:
+        return None
+    return {
+        "name": f"Customer {index}",
+        "occupation": rng.choice(OCCUPATIONS),
+        "declared_income": rng.choice([30000, 50000, 120000, 200000, 500000]),
+        "source_of_funds": rng.choice(FUNDS),
+        "risk_rating": rng.choice(["LOW", "LOW", "MEDIUM", "HIGH"]),
+        "account_age_months": rng.randint(1, 240)
+    }
+
+
+def historic_facts(seed, scenario_code, index):
+    """Historic facts of synthetic subject `index` for one scenario, or None"""
+    rng = _rng(seed, 2 + SCENARIOS.index(scenario_code), index)
+    if rng.random() < MISSING_FACTS_RATE:
+        return None
+    if scenario_code == "VELOCITY_SPIKE":
+        return {
+            "historical_max_txn_90d": rng.choice([500, 1500, 5000, 20000]),
+            "txn_count_last_48h": rng.randint(0, 12),
+            "prior_velocity_spike": rng.random() < 0.3,
+            "avg_txns_per_month": rng.randint(1, 40)
+        }
+    if scenario_code == "STRUCTURING":
+        deposits = [rng.choice([4000, 9500, 9800, 9999, 12000]) for _ in range(rng.randint(1, 5))]
+        return {
+            "cash_deposits_7d": deposits,
+            "linked_accounts_total": sum(deposits) + rng.choice([0, 500, 5000, 20000]),
+            "geographically_diverse": rng.random() < 0.5,
+            "branches_used": rng.sample(["NYC_001", "NYC_002", "LA_001", "SF_003"], 2)
+        }
+    if scenario_code == "KYC_INCONSISTENCY":
+        return {
+            "wire_amount": rng.choice([1000, 15000, 20000, 75000]),
+            "merchant_category": rng.choice(MERCHANTS),
+            "transaction_type": rng.choice(["International Wire", "Domestic Wire"])
+        }
+    if scenario_code == "SANCTIONS_MATCH":
+        return {
+            "counterparty_name": rng.choice(COUNTERPARTIES),
+            "similarity_score": round(rng.random(), 2),
+            "bank_jurisdiction": rng.choice(["High Risk", "Medium Risk", "Low Risk"]),
+            "previous_relationship": rng.random() < 0.4
+        }
+    return {
+        "months_inactive": rng.randint(0, 36),
+        "recent_inbound_amount": rng.choice([500, 5000, 15000, 50000]),
+        "followed_by_atm_withdrawal": rng.random() < 0.5,
+        "international_withdrawal": rng.random() < 0.4
+    }
+
+
+def customers_for(count):
+    """Distinct customers behind `count` alerts (about two alerts per customer)"""
+    return max(1, count // 2)
+
+
+def generate_alerts(count, seed=42):
+    """
+    Yield `count` synthetic alerts spread evenly over the five scenarios
+
+    Args:
+        count: Number of alerts
+        seed: Generator seed
+
+    Yields:
+        Alert dictionaries (alert_id, scenario_code, subject_id, description)
+    """
+    customers = customers_for(count)
+    for index in range(count):
+        rng = _rng(seed, 0, index)
+        yield {
+            "alert_id": f"SYN-A{index:08d}",
+            "scenario_code": SCENARIOS[rng.randrange(len(SCENARIOS))],
+            "subject_id": subject_id(rng.randrange(customers)),
+            "description": "Synthetic benchmark alert"
+        }
+
+
+class SyntheticKycStore(KycStore):
+    """KycStore computing synthetic profiles on demand"""
+
+    def __init__(self, seed=42):
+        self.seed = seed
+
+    def get(self, subject):
+        index = _subject_index(subject)
+        return None if index is None else kyc_profile(self.seed, index)
+
+    def put_many(self, items):
+        raise NotImplementedError("synthetic store is read-only")
+
+
+class SyntheticFactIndex(FactIndex):
+    """FactIndex computing synthetic historic facts on demand"""
+
+    def __init__(self, seed=42):
+        self.seed = seed
+
+    def get(self, scenario_code, subject):
+        index = _subject_index(subject)
+        if index is None or scenario_code not in SCENARIOS:
+            return None
+        return historic_facts(self.seed, scenario_code, index)
+
+    def get_subject(self, subject):
+        index = _subject_index(subject)
+        if index is None:
+            return None
+        groups = {}
+        for scenario_code in SCENARIOS:
+            facts = historic_facts(self.seed, scenario_code, index)
+            if facts is not None:
+                groups[scenario_code] = facts
+        return groups
@@ -3,5 +3,6 @@ Configuration module initialization
 """
 
 from .sop_rules import SOP_RULES
+from .scheduling import DEFAULT_PRIORITY_CLASS, PRIORITY_CLASSES, RISK_SLA_FACTORS
 
-__all__ = ['SOP_RULES']
\ No newline at end of file
+__all__ = ['SOP_RULES', 'PRIORITY_CLASSES', 'DEFAULT_PRIORITY_CLASS', 'RISK_SLA_FACTORS']
\ No newline at end of file
@@ -0,0 +1,27 @@
+"""
+Rule Set Builder
+Writes an SOP rule set as a versioned JSON file for main.py --rules
+
+Usage:
+    python -m config.build_rule_set PATH [VERSION]
+
+Exports config.SOP_RULES; VERSION defaults to the rules' content hash. The
+file is replaced atomically, so a running --rules watcher never reads it
+half-written - edit a copy and build / move it into place the same way.
+"""
+
+import sys
+
+from .sop_rules import SOP_RULES
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if len(argv) not in (1, 2):
+        sys.exit(__doc__.strip())
+    from agents.rule_sets import write_rule_set
+    write_rule_set(argv[0], SOP_RULES, argv[1] if len(argv) == 2 else None)
+
+
+if __name__ == "__main__":
+    main()
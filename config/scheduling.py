@@ -0,0 +1,29 @@
+"""
+Scheduling Configuration
+Priority classes used by the alert scheduler (agents/scheduler.py)
+
+Each SOP rule names its priority_class. A class defines:
+    rank         - tie-break between classes (lower runs first)
+    sla_seconds  - time from alert creation to decision before the SLA is missed
+    quota        - share of the in-flight alert capacity the class may occupy
+                   while alerts of other classes are waiting
+
+An alert's deadline is its creation time plus its class SLA scaled by the
+customer's risk rating; alerts are scheduled earliest deadline first.
+"""
+
+PRIORITY_CLASSES = {
+    "CRITICAL": {"rank": 0, "sla_seconds": 15 * 60, "quota": 1.0},
+    "HIGH": {"rank": 1, "sla_seconds": 4 * 3600, "quota": 0.75},
+    "STANDARD": {"rank": 2, "sla_seconds": 24 * 3600, "quota": 0.5}
+}
+
+# Class used for scenarios without a priority_class
+DEFAULT_PRIORITY_CLASS = "STANDARD"
+
+# SLA multiplier by customer risk_rating (unknown ratings count as LOW)
+RISK_SLA_FACTORS = {
+    "HIGH": 0.25,
+    "MEDIUM": 0.5,
+    "LOW": 1.0
+}
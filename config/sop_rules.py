@@ -1,8 +1,18 @@
 """
 SOP / Meta Configuration File
 This file defines the Standard Operating Procedures (SOPs) for each alert scenario.
-These rules are POLICY DEFINITIONS, not executable logic.
-The actual rule enforcement is implemented in the Adjudicator Agent.
+
+Rules are declarative and compiled once at startup by agents/rule_engine.py:
+    priority_class  - scheduling class (config/scheduling.py): SLA and worker quota
+    inputs          - named facts read from the investigation / context data
+                      as [source, field, default]
+    derived         - named expressions computed from inputs (in order)
+    decision_paths  - evaluated top to bottom; the first path whose conditions
+                      all hold decides the alert
+    default_path    - outcome when no decision path matches
+
+Rationales are str.format templates over the input and derived names.
+Adding a scenario is a config change - no Adjudicator code is required.
 """
 
 SOP_RULES = {
@@ -12,29 +22,78 @@ SOP_RULES = {
     "VELOCITY_SPIKE": {
         "rule_id": "RUL-A001",
         "scenario_code": "VELOCITY_SPIKE",
+        "priority_class": "STANDARD",
         "description": (
             "Escalate when a customer exhibits a first-time high transaction velocity "
             "that is not supported by declared income or business activity. "
             "Close the alert if the spike is consistent with a known business cycle."
-    ),
-        "conditions": [
-            "Transaction_Count_Last_48h > 5",
-            "Is_First_Velocity_Spike_90d == True",
-            "Income_Match == False"
+        ),
+        "inputs": {
+            "Transaction_Count_Last_48h": ["investigation", "txn_count_last_48h", 0],
+            "Historical_Max_Txn_90d": ["investigation", "historical_max_txn_90d", 0],
+            "Prior_Velocity_Spike": ["investigation", "prior_velocity_spike", False],
+            "Declared_Income": ["context", "declared_income", 0],
+            "Source_Of_Funds": ["context", "source_of_funds", ""],
+            "Occupation": ["context", "occupation", ""]
+        },
+        "derived": {
+            "Occupation_Lower": "lower(Occupation)",
+            "Monthly_Income": "Declared_Income / 12 if Declared_Income else 0",
+            "Estimated_Txn_Value": "Historical_Max_Txn_90d * Transaction_Count_Last_48h",
+            "Income_Match": "Estimated_Txn_Value <= Monthly_Income * 2",
+            "Is_First_Velocity_Spike_90d": "not Prior_Velocity_Spike",
+            "Business_Cycle": "'business' in Occupation_Lower or 'owner' in Occupation_Lower"
+        },
+        "decision_paths": [
+            {
+                "conditions": [
+                    "Transaction_Count_Last_48h > 5",
+                    "Is_First_Velocity_Spike_90d == True",
+                    "Income_Match == False"
+                ],
+                "action": "ESCALATE_FOR_SAR",
+                "confidence": 0.95,
+                "rationale": (
+                    "Velocity spike detected: {Transaction_Count_Last_48h} transactions in 48 hours "
+                    "with no prior high-velocity behavior. Estimated transaction volume "
+                    "(${Estimated_Txn_Value:,}) is inconsistent with declared income "
+                    "(${Declared_Income:,}) and source of funds ('{Source_Of_Funds}'), "
+                    "indicating unexplained activity."
+                )
+            },
+            {
+                "conditions": [
+                    "Transaction_Count_Last_48h > 5",
+                    "Business_Cycle == True",
+                    "Income_Match == True"
+                ],
+                "action": "CLOSE_FALSE_POSITIVE",
+                "confidence": 0.75,
+                "rationale": (
+                    "Velocity spike observed, but transaction behavior aligns with a known "
+                    "business cycle for occupation '{Occupation_Lower}' and is supported by "
+                    "declared income."
+                )
+            }
         ],
-        "possible_actions": [
-            "ESCALATE_FOR_SAR",
-            "CLOSE_FALSE_POSITIVE"
-        ]
+        "default_path": {
+            "action": "CLOSE_FALSE_POSITIVE",
+            "confidence": 0.70,
+            "rationale": (
+                "Transaction velocity does not present sufficient deviation from historical "
+                "behavior or declared income to warrant escalation."
+            )
+        }
     },
 
-    
+
     # ============================================================
     # RUL-A002 : Below-Threshold Structuring
     # ============================================================
     "STRUCTURING": {
         "rule_id": "RUL-A002",
         "scenario_code": "STRUCTURING",
+        "priority_class": "HIGH",
         "description": (
             "Evaluate repeated below-threshold cash deposits for potential structuring. "
             "If deposits across linked accounts exceed the aggregate threshold without "
@@ -42,77 +101,201 @@ SOP_RULES = {
             "If deposits are geographically diverse and align with legitimate business "
             "receipts, request additional information from the customer."
         ),
+        "inputs": {
+            "Linked_Accounts_Total": ["investigation", "linked_accounts_total", 0],
+            "Linked_Reportable_Deposits": ["investigation", "linked_reportable_deposits", 0],
+            "Cash_Deposits_7d": ["investigation", "cash_deposits_7d", []],
+            "Geographically_Diverse": ["investigation", "geographically_diverse", False],
+            "Occupation": ["context", "occupation", ""],
+            "Source_Of_Funds": ["context", "source_of_funds", ""]
+        },
+        "derived": {
+            "Occupation_Lower": "lower(Occupation)",
+            "Source_Of_Funds_Lower": "lower(Source_Of_Funds)",
+            "Cash_Deposits_Below_Threshold": (
+                "all_below(Cash_Deposits_7d, 10000) and Linked_Reportable_Deposits == 0"
+            ),
+            "Legitimate_Business": "'business' in Occupation_Lower or 'owner' in Occupation_Lower"
+        },
         "decision_paths": [
             {
                 "conditions": [
                     "Geographically_Diverse == True",
                     "Legitimate_Business == True"
                 ],
-                "action": "REQUEST_INFORMATION"
+                "action": "REQUEST_INFORMATION",
+                "confidence": 0.70,
+                "rationale": (
+                    "Deposits made across geographically diverse branches "
+                    "Customer occupation '{Occupation_Lower}' "
+                    "and declared source of funds '{Source_Of_Funds_Lower}' suggest legitimate "
+                    "business receipts. Request clarification on purpose and source of funds "
+                    "before escalation."
+                )
             },
             {
                 "conditions": [
                     "Linked_Accounts_Total > 28000",
                     "Cash_Deposits_Below_Threshold == True"
                 ],
-                "action": "ESCALATE_FOR_SAR"
+                "action": "ESCALATE_FOR_SAR",
+                "confidence": 0.92,
+                "rationale": (
+                    "Structuring detected: Total deposits across linked accounts = "
+                    "${Linked_Accounts_Total}, exceeding $28,000 threshold. All individual "
+                    "deposits kept below $10,000 reporting limit. Deposits: {Cash_Deposits_7d}. "
+                    "This pattern suggests deliberate structuring to avoid CTR filing."
+                )
             }
-        ]
+        ],
+        "default_path": {
+            "action": "CLOSE_FALSE_POSITIVE",
+            "confidence": 0.65,
+            "rationale": "Deposits appear legitimate based on customer business profile."
+        }
     },
 
-    
+
     # ============================================================
     # RUL-A003 : KYC Inconsistency (Profile vs Transaction)
     # ============================================================
     "KYC_INCONSISTENCY": {
         "rule_id": "RUL-A003",
         "scenario_code": "KYC_INCONSISTENCY",
+        "priority_class": "STANDARD",
         "description": (
             "IF transaction type or merchant category is inconsistent with "
             "customer's declared occupation THEN escalate for SAR."
         ),
-        "conditions": [
-            "Occupation_Match == False",
-            "Transaction_Amount >= 20000"
+        "inputs": {
+            "Transaction_Amount": ["investigation", "wire_amount", 0],
+            "Merchant_Category": ["investigation", "merchant_category", ""],
+            "Occupation": ["context", "occupation", ""],
+            "Declared_Occupation": ["context", "occupation", None]
+        },
+        "derived": {
+            "Occupation_Lower": "lower(Occupation)",
+            "Occupation_Match": "'jewel' in Occupation_Lower or 'trader' in Occupation_Lower"
+        },
+        "decision_paths": [
+            {
+                "conditions": [
+                    "Occupation_Match == False",
+                    "Transaction_Amount >= 20000"
+                ],
+                "action": "ESCALATE_FOR_SAR",
+                "confidence": 0.90,
+                "rationale": (
+                    "KYC inconsistency detected: Customer occupation '{Declared_Occupation}' "
+                    "does not align with ${Transaction_Amount} transaction to '{Merchant_Category}'. "
+                    "No logical business connection between profile and transaction behavior."
+                )
+            }
         ],
-        "intended_action": "ESCALATE_FOR_SAR"
+        "default_path": {
+            "action": "CLOSE_FALSE_POSITIVE",
+            "confidence": 0.85,
+            "rationale": (
+                "Customer occupation '{Declared_Occupation}' is consistent with "
+                "transaction to '{Merchant_Category}'. Activity appears legitimate."
+            )
+        }
     },
-    
+
     # ============================================================
     # RUL-A004 : Sanctions List Hit (Minor Match)
     # ============================================================
     "SANCTIONS_MATCH": {
         "rule_id": "RUL-A004",
         "scenario_code": "SANCTIONS_MATCH",
+        "priority_class": "CRITICAL",
         "description": (
             "IF counterparty name similarity to sanctions list is high "
             "OR transaction jurisdiction is high-risk THEN escalate."
         ),
-        "conditions": [
-            "Similarity_Score >= 0.80",
-            "Jurisdiction == High_Risk"
+        "inputs": {
+            "Similarity_Score": ["investigation", "similarity_score", 0],
+            "Jurisdiction": ["investigation", "bank_jurisdiction", ""],
+            "Counterparty_Name": ["investigation", "counterparty_name", ""]
+        },
+        "derived": {
+            "Similarity_Pct": "Similarity_Score * 100"
+        },
+        "decision_paths": [
+            {
+                "conditions": [
+                    "Similarity_Score >= 0.80 or Jurisdiction == 'High Risk'"
+                ],
+                "action": "ESCALATE_FOR_SAR",
+                "confidence": 0.98,
+                "rationale": (
+                    "Sanctions screening hit: Counterparty '{Counterparty_Name}' has "
+                    "{Similarity_Pct:.0f}% similarity to sanctioned entity. Bank jurisdiction: "
+                    "{Jurisdiction}. Requires immediate escalation and potential transaction block."
+                )
+            }
         ],
-        "intended_action": "ESCALATE_FOR_SAR"
+        "default_path": {
+            "action": "CLOSE_FALSE_POSITIVE",
+            "confidence": 0.80,
+            "rationale": (
+                "Low similarity score ({Similarity_Pct:.0f}%) and safe jurisdiction. "
+                "Likely a common name false positive."
+            )
+        }
     },
-    
+
     # ============================================================
     # RUL-A005 : Dormant Account Activation
     # ============================================================
     "DORMANT_ACCOUNT": {
         "rule_id": "RUL-A005",
         "scenario_code": "DORMANT_ACCOUNT",
+        "priority_class": "HIGH",
         "description": (
             "IF a dormant account (12+ months) is reactivated with inbound funds "
             "and immediate cash withdrawal, escalate when the customer risk is HIGH "
             "and withdrawal is international. Otherwise, request information from customer."
         ),
-        "conditions": [
-            "Months_Inactive > 12",
-            "Immediate_Withdrawal == True"
+        "inputs": {
+            "Months_Inactive": ["investigation", "months_inactive", 0],
+            "International_Withdrawal": ["investigation", "international_withdrawal", False],
+            "Risk_Rating": ["context", "risk_rating", "LOW"]
+        },
+        "decision_paths": [
+            {
+                "conditions": [
+                    "Risk_Rating == 'HIGH'",
+                    "International_Withdrawal == True"
+                ],
+                "action": "ESCALATE_FOR_SAR",
+                "confidence": 0.88,
+                "rationale": (
+                    "High-risk dormant account reactivation: Account inactive for "
+                    "{Months_Inactive} months. Customer risk rating: {Risk_Rating}. "
+                    "International ATM withdrawal detected immediately after large inbound "
+                    "transfer. Possible account takeover or money mule activity."
+                )
+            },
+            {
+                "conditions": [
+                    "Risk_Rating == 'LOW'"
+                ],
+                "action": "REQUEST_INFORMATION",
+                "confidence": 0.70,
+                "rationale": (
+                    "Low-risk customer with dormant account reactivation. Request information "
+                    "about purpose of funds and reason for account inactivity."
+                )
+            }
         ],
-        "intended_actions": {
-        "HIGH_RISK + INTERNATIONAL": "ESCALATE_FOR_SAR",
-        "LOW_RISK": "REQUEST_INFORMATION"
-    }
+        "default_path": {
+            "action": "REQUEST_INFORMATION",
+            "confidence": 0.65,
+            "rationale": (
+                "Account inactive for {Months_Inactive} months. Requires customer clarification "
+                "before determining next steps."
+            )
+        }
     }
-}
\ No newline at end of file
+}
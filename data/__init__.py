@@ -1,10 +1,93 @@
 """
 Data module initialization
 Exports all mock databases and alert inputs
+
+Exports are resolved on first access (PEP 562) rather than at import time:
+the mock databases and the optional NumPy dependency of the sanctions
+screener stay unloaded until a command actually needs them, which keeps
+CLI start-up fast. warm_up() loads the default data providers eagerly.
 """
 
-from .alerts_input import ALERTS
-from .historic_transactions_db import HISTORIC_TRANSACTIONS_DB
-from .kyc_db import KYC_DB
+import importlib
+from time import perf_counter
+
+# Exported name -> submodule defining it
+_EXPORTS = {
+    'ALERTS': 'alerts_input',
+    'ABSENT': 'records',
+    'Record': 'records',
+    'Alert': 'records',
+    'Evidence': 'records',
+    'KycProfile': 'records',
+    'Decision': 'records',
+    'HISTORIC_TRANSACTIONS_DB': 'historic_transactions_db',
+    'KYC_DB': 'kyc_db',
+    'KycStore': 'kyc_store',
+    'InMemoryKycStore': 'kyc_store',
+    'SqliteKycStore': 'kyc_store',
+    'get_kyc_store': 'kyc_store',
+    'set_kyc_store': 'kyc_store',
+    'ContextCache': 'context_cache',
+    'CachedKycStore': 'context_cache',
+    'FactIndex': 'fact_index',
+    'InMemoryFactIndex': 'fact_index',
+    'MappedFactIndex': 'fact_index',
+    'build_fact_index': 'fact_index',
+    'get_fact_index': 'fact_index',
+    'set_fact_index': 'fact_index',
+    'FeatureEngine': 'feature_engine',
+    'get_feature_engine': 'feature_engine',
+    'load_ledger': 'feature_engine',
+    'set_feature_engine': 'feature_engine',
+    'ClusterStats': 'account_graph',
+    'LinkedAccountGraph': 'account_graph',
+    'load_accounts': 'account_graph',
+    'SanctionsEntry': 'sanctions_screener',
+    'SanctionsMatch': 'sanctions_screener',
+    'SanctionsScreener': 'sanctions_screener',
+    'get_sanctions_screener': 'sanctions_screener',
+    'set_sanctions_screener': 'sanctions_screener',
+    'AlertStream': 'alert_stream',
+    'AlertValidationError': 'alert_stream',
+    'iter_alerts': 'alert_stream',
+    'validate_alert': 'alert_stream'
+}
+
+__all__ = list(_EXPORTS) + ['warm_up']
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
+
+
+def warm_up():
+    """
+    Load the default KYC store, fact index and sanctions screener now
+
+    Called before worker processes are forked, so that they inherit the
+    loaded data instead of each loading it again on first use.
+
+    Returns:
+        Dict of provider -> seconds spent loading it
+    """
+    from . import sanctions_screener
 
-__all__ = ['ALERTS', 'HISTORIC_TRANSACTIONS_DB', 'KYC_DB']
\ No newline at end of file
+    timings = {}
+    for name, load in (("kyc_store", __getattr__("get_kyc_store")),
+                       ("fact_index", __getattr__("get_fact_index")),
+                       ("sanctions_screener", sanctions_screener.get_sanctions_screener)):
+        started = perf_counter()
+        load()
+        if name == "sanctions_screener":
+            sanctions_screener._numpy()
+        timings[name] = perf_counter() - started
+    return timings
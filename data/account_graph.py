@@ -0,0 +1,215 @@
+"""
+Linked-Account Graph
+Union-find over shared identifiers with incremental per-cluster cash deposit aggregates
+
+Accounts sharing an address, phone, device or beneficiary are merged into
+one cluster (union by size, path halving). Each cluster keeps a min-heap of
+its cash deposits inside the aggregation window plus a running total and a
+count of deposits at or above the reporting threshold; clusters are merged
+small-into-large, so structuring facts for any account are read in
+near-constant time as deposits and links keep arriving.
+
+Load account identifiers from JSONL (one object per account):
+    {"subject_id": "CUST-102", "address": "...", "phone": "...", "device": "...", "beneficiary": "..."}
+"""
+
+import heapq
+import json
+import threading
+from collections import namedtuple
+
+from .feature_engine import DAY, parse_timestamp
+
+IDENTIFIER_TYPES = ("address", "phone", "device", "beneficiary")
+# Single cash deposits at or above this are reportable
+REPORTING_THRESHOLD = 10000
+DEPOSIT_WINDOW = 7 * DAY
+
+ClusterStats = namedtuple("ClusterStats", ["members", "deposit_total", "deposit_count", "reportable_deposits"])
+
+
+def normalize_identifier(kind, value):
+    """Canonical form of an identifier (digits only for phones, folded case otherwise)"""
+    value = str(value).strip()
+    if kind == "phone":
+        return "".join(ch for ch in value if ch.isdigit())
+    return " ".join(value.casefold().split())
+
+
+class _Cluster:
+    """Deposit aggregates held by a cluster's root account"""
+
+    def __init__(self):
+        self.deposits = []      # heap of (ts, amount)
+        self.total = 0
+        self.reportable = 0
+
+    def add(self, ts, amount):
+        heapq.heappush(self.deposits, (ts, amount))
+        self.total += amount
+        if amount >= REPORTING_THRESHOLD:
+            self.reportable += 1
+
+    def absorb(self, other):
+        """Merge another cluster's deposits into this one (smaller heap is re-pushed)"""
+        if len(other.deposits) > len(self.deposits):
+            self.deposits, other.deposits = other.deposits, self.deposits
+        for ts, amount in other.deposits:
+            heapq.heappush(self.deposits, (ts, amount))
+        self.total += other.total
+        self.reportable += other.reportable
+
+    def evict(self, cutoff):
+        deposits = self.deposits
+        while deposits and deposits[0][0] <= cutoff:
+            _, amount = heapq.heappop(deposits)
+            self.total -= amount
+            if amount >= REPORTING_THRESHOLD:
+                self.reportable -= 1
+
+
+class LinkedAccountGraph:
+    """
+    Clusters of accounts linked by shared identifiers, with windowed deposit totals
+
+    Deposit windows are evaluated against the latest deposit timestamp seen
+    unless an explicit as_of time is given. Safe to share between threads.
+    """
+
+    def __init__(self, window=DEPOSIT_WINDOW):
+        """
+        Args:
+            window: Seconds of deposits kept per cluster (None keeps all)
+        """
+        self.window = window
+        self.clock = None
+        self._parent = {}
+        self._size = {}
+        self._clusters = {}
+        self._owners = {}       # (kind, identifier) -> first account seen with it
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._parent)
+
+    def add_account(self, subject_id, identifiers=None):
+        """
+        Register an account and link it through its identifiers
+
+        Args:
+            subject_id: Account / customer identifier
+            identifiers: Dict of identifier type -> value or list of values
+                         (keys outside IDENTIFIER_TYPES are ignored)
+        """
+        with self._lock:
+            self._find(subject_id)
+            for kind in IDENTIFIER_TYPES:
+                values = (identifiers or {}).get(kind)
+                if not values:
+                    continue
+                for value in [values] if isinstance(values, str) else values:
+                    key = (kind, normalize_identifier(kind, value))
+                    if not key[1]:
+                        continue
+                    owner = self._owners.setdefault(key, subject_id)
+                    if owner != subject_id:
+                        self._union(owner, subject_id)
+
+    def link(self, subject_a, subject_b):
+        """Explicitly link two accounts"""
+        with self._lock:
+            self._union(subject_a, subject_b)
+
+    def add_deposit(self, subject_id, amount, timestamp):
+        """Add a cash deposit to the account's cluster aggregates"""
+        ts = parse_timestamp(timestamp)
+        with self._lock:
+            self._clusters[self._find(subject_id)].add(ts, amount)
+            if self.clock is None or ts > self.clock:
+                self.clock = ts
+
+    def ingest(self, txn):
+        """Feed one ledger transaction - only cash deposits are aggregated"""
+        if txn.get("txn_type") == "cash_deposit":
+            self.add_deposit(txn["subject_id"], txn.get("amount", 0), txn["timestamp"])
+
+    def connected(self, subject_a, subject_b):
+        """True when both accounts are in the same cluster"""
+        with self._lock:
+            if subject_a not in self._parent or subject_b not in self._parent:
+                return subject_a == subject_b
+            return self._find(subject_a) == self._find(subject_b)
+
+    def cluster(self, subject_id, as_of=None):
+        """
+        Windowed deposit aggregates of the account's cluster
+
+        Args:
+            subject_id: Any account in the cluster
+            as_of: Evaluation time (epoch seconds / ISO 8601); defaults to the latest deposit
+
+        Returns:
+            ClusterStats, or None for an unknown account
+        """
+        with self._lock:
+            if subject_id not in self._parent:
+                return None
+            root = self._find(subject_id)
+            cluster = self._clusters[root]
+            now = self.clock if as_of is None else parse_timestamp(as_of)
+            if self.window is not None and now is not None:
+                cluster.evict(now - self.window)
+            return ClusterStats(
+                self._size[root], cluster.total, len(cluster.deposits), cluster.reportable
+            )
+
+    def members(self, subject_id):
+        """Every account in the cluster (O(accounts) - for investigation, not hot paths)"""
+        with self._lock:
+            if subject_id not in self._parent:
+                return []
+            root = self._find(subject_id)
+            return sorted(account for account in self._parent if self._find(account) == root)
+
+    def _find(self, subject_id):
+        parent = self._parent
+        if subject_id not in parent:
+            parent[subject_id] = subject_id
+            self._size[subject_id] = 1
+            self._clusters[subject_id] = _Cluster()
+            return subject_id
+        while parent[subject_id] != subject_id:
+            parent[subject_id] = parent[parent[subject_id]]
+            subject_id = parent[subject_id]
+        return subject_id
+
+    def _union(self, subject_a, subject_b):
+        root_a, root_b = self._find(subject_a), self._find(subject_b)
+        if root_a == root_b:
+            return
+        if self._size[root_a] < self._size[root_b]:
+            root_a, root_b = root_b, root_a
+        self._parent[root_b] = root_a
+        self._size[root_a] += self._size.pop(root_b)
+        self._clusters[root_a].absorb(self._clusters.pop(root_b))
+
+
+def load_accounts(paths, graph=None):
+    """
+    Build (or extend) a LinkedAccountGraph from JSONL account identifier files
+
+    Args:
+        paths: File path or list of paths
+        graph: Existing graph to add to (a new one if None)
+
+    Returns:
+        The LinkedAccountGraph
+    """
+    graph = LinkedAccountGraph() if graph is None else graph
+    for path in [paths] if isinstance(paths, str) else paths:
+        with open(path, encoding="utf-8") as stream:
+            for line in stream:
+                if line.strip():
+                    record = json.loads(line)
+                    graph.add_account(record.pop("subject_id"), record)
+    return graph
@@ -0,0 +1,164 @@
+"""
+Streaming Alert Ingestion
+Lazily parses alerts from JSONL / CSV files, directories or stdin
+
+Alerts are yielded one at a time and validated on the fly, so memory use
+stays constant regardless of input size. Directories can be followed to
+pick up newly dropped files. With records=True alerts are yielded as
+compact, immutable Alert records instead of dicts - for runs that hold
+large batches in memory.
+"""
+
+import csv
+import json
+import os
+import sys
+import time
+
+from utils import AuditLogger, WARNING
+from .records import Alert
+
+REQUIRED_FIELDS = ("alert_id", "scenario_code", "subject_id")
+
+JSONL_SUFFIXES = (".jsonl", ".ndjson")
+CSV_SUFFIXES = (".csv",)
+
+
+class AlertValidationError(ValueError):
+    """Raised for an input record that is not a valid alert"""
+
+
+def validate_alert(record, origin="<input>"):
+    """
+    Check an alert record against the required schema
+
+    Args:
+        record: Parsed record (must be a dict)
+        origin: Where the record came from, used in error messages
+
+    Returns:
+        The record, with required fields stripped of surrounding whitespace
+    """
+    if not isinstance(record, dict):
+        raise AlertValidationError(f"{origin}: alert must be an object, got {type(record).__name__}")
+    for field in REQUIRED_FIELDS:
+        value = record.get(field)
+        if not isinstance(value, str) or not value.strip():
+            raise AlertValidationError(f"{origin}: missing or empty '{field}'")
+        if value != value.strip():
+            record[field] = value.strip()
+    return record
+
+
+def _read_jsonl(stream, name):
+    for line_number, line in enumerate(stream, 1):
+        if not line.strip():
+            continue
+        origin = f"{name}:{line_number}"
+        try:
+            yield origin, json.loads(line)
+        except json.JSONDecodeError as e:
+            yield origin, AlertValidationError(f"{origin}: invalid JSON ({e.msg})")
+
+
+def _read_csv(stream, name):
+    # Header is line 1, so the first record is line 2
+    for line_number, row in enumerate(csv.DictReader(stream), 2):
+        yield f"{name}:{line_number}", row
+
+
+def _reader_for(path, default_format):
+    lowered = path.lower()
+    if lowered.endswith(JSONL_SUFFIXES):
+        return _read_jsonl
+    if lowered.endswith(CSV_SUFFIXES):
+        return _read_csv
+    return _read_csv if default_format == "csv" else _read_jsonl
+
+
+def _is_alert_file(name):
+    return name.lower().endswith(JSONL_SUFFIXES + CSV_SUFFIXES)
+
+
+class AlertStream:
+    """
+    Iterable of validated alerts from one or more sources
+
+    Sources are file paths, directories (every .jsonl/.ndjson/.csv file,
+    in name order) or "-" for stdin. Invalid records are skipped and
+    counted (on_error="skip") or raise AlertValidationError (on_error="raise").
+
+    With follow=True, directories are polled for newly dropped files after
+    the existing ones are consumed, and iteration never ends. With
+    records=True alerts are yielded as Alert records rather than dicts.
+    """
+
+    def __init__(self, sources, stdin_format="jsonl", on_error="skip",
+                 follow=False, poll_interval=1.0, records=False):
+        if on_error not in ("skip", "raise"):
+            raise ValueError("on_error must be 'skip' or 'raise'")
+        self.sources = [sources] if isinstance(sources, str) else list(sources)
+        self.stdin_format = stdin_format
+        self.on_error = on_error
+        self.follow = follow
+        self.poll_interval = poll_interval
+        self.records = records
+        self.accepted = 0
+        self.rejected = 0
+        self.logger = AuditLogger()
+
+    def __iter__(self):
+        seen = {}       # directory -> names already read (files dropped mid-read are not)
+        for source in self.sources:
+            if source == "-":
+                yield from self._parse(_reader_for("-", self.stdin_format)(sys.stdin, "<stdin>"))
+            elif os.path.isdir(source):
+                yield from self._read_directory(source, seen.setdefault(source, set()))
+            else:
+                yield from self._read_file(source)
+
+        if self.follow and seen:
+            while True:
+                time.sleep(self.poll_interval)
+                for directory, names in seen.items():
+                    yield from self._read_directory(directory, names)
+
+    def _list(self, directory):
+        return sorted(
+            name for name in os.listdir(directory)
+            if _is_alert_file(name) and os.path.isfile(os.path.join(directory, name))
+        )
+
+    def _read_directory(self, directory, seen):
+        for name in self._list(directory):
+            if name in seen:
+                continue
+            seen.add(name)
+            yield from self._read_file(os.path.join(directory, name))
+
+    def _read_file(self, path):
+        reader = _reader_for(path, self.stdin_format)
+        with open(path, newline="", encoding="utf-8") as stream:
+            yield from self._parse(reader(stream, path))
+
+    def _parse(self, records):
+        for origin, record in records:
+            try:
+                if isinstance(record, AlertValidationError):
+                    raise record
+                alert = validate_alert(record, origin)
+            except AlertValidationError as e:
+                if self.on_error == "raise":
+                    raise
+                self.rejected += 1
+                self.logger.log_agent_action(
+                    "Alert Ingestion", "⚠️  Skipping invalid alert: %s", e, level=WARNING
+                )
+                continue
+            self.accepted += 1
+            yield Alert.from_dict(alert) if self.records else alert
+
+
+def iter_alerts(sources, **options):
+    """Generator of validated alerts - see AlertStream for sources and options"""
+    return iter(AlertStream(sources, **options))
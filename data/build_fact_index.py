@@ -0,0 +1,30 @@
+"""
+Fact Index Builder
+Writes a memory-mapped customer fact index from HISTORIC_TRANSACTIONS_DB or a JSON file
+
+Usage:
+    python -m data.build_fact_index INDEX_PATH [FACTS.json]
+
+The JSON file has the HISTORIC_TRANSACTIONS_DB layout: scenario -> subject -> facts.
+"""
+
+import json
+import sys
+
+from .fact_index import build_fact_index
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if len(argv) not in (1, 2):
+        sys.exit(__doc__.strip())
+    facts_db = None
+    if len(argv) == 2:
+        with open(argv[1], encoding="utf-8") as stream:
+            facts_db = json.load(stream)
+    count = build_fact_index(argv[0], facts_db)
+    print(f"Indexed {count} subjects into {argv[0]}")
+
+
+if __name__ == "__main__":
+    main()
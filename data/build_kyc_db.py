@@ -0,0 +1,39 @@
+"""
+KYC Database Builder
+Creates / updates an SQLite KYC store from the mock KYC_DB or a JSONL file of profiles
+
+Usage:
+    python -m data.build_kyc_db DB_PATH [PROFILES.jsonl]
+
+Each JSONL line is a profile object with a "subject_id" field.
+"""
+
+import json
+import sys
+
+from .kyc_db import KYC_DB
+from .kyc_store import SqliteKycStore
+
+
+def load_jsonl(path):
+    """Yield (subject_id, profile) pairs from a JSONL file"""
+    with open(path, encoding="utf-8") as stream:
+        for line in stream:
+            if line.strip():
+                record = json.loads(line)
+                yield record.pop("subject_id"), record
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if len(argv) not in (1, 2):
+        sys.exit(__doc__.strip())
+    store = SqliteKycStore(argv[0])
+    try:
+        store.put_many(load_jsonl(argv[1]) if len(argv) == 2 else KYC_DB.items())
+    finally:
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,210 @@
+"""
+Customer Context Cache
+Size-bounded LRU cache with TTL in front of a KYC store
+
+The Context Gatherer and the Action Executor both read profiles through the
+process-wide KYC store; wrapping it in a CachedKycStore means a customer is
+fetched from the backing store once per process until the entry expires,
+is evicted, or is invalidated by a KYC update.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+from .kyc_store import KycStore
+
+# Returned by ContextCache.get on a miss (None is a cacheable value)
+MISSING = object()
+
+
+class ContextCache:
+    """Thread-safe LRU cache with a per-entry time-to-live and hit/miss counters"""
+
+    def __init__(self, max_size=10000, ttl=300.0, clock=time.monotonic):
+        """
+        Args:
+            max_size: Entries kept before the least recently used is evicted
+            ttl: Seconds an entry stays valid (None for no expiry)
+            clock: Monotonic time source
+        """
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+        self.max_size = max_size
+        self.ttl = ttl
+        self._clock = clock
+        self._entries = OrderedDict()   # key -> (expires_at, value)
+        self._loading = {}              # key -> loads in flight
+        self._generations = {}          # key -> invalidations during those loads
+        self._epoch = 0                 # clear() count
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key, default=MISSING):
+        """Cached value for key, or `default` when absent or expired"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at is None or expires_at > self._clock():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+                self.expirations += 1
+            self.misses += 1
+            return default
+
+    def put(self, key, value):
+        """Insert or refresh an entry, evicting the least recently used if full"""
+        expires_at = None if self.ttl is None else self._clock() + self.ttl
+        with self._lock:
+            self._store(key, value, expires_at)
+
+    def get_or_load(self, key, load):
+        """Cached value for key, or load(key) cached on a miss (see load_many)"""
+        value = self.get(key)
+        if value is MISSING:
+            value = self.load_many([key], lambda keys: {key: load(key)})[key]
+        return value
+
+    def load_many(self, keys, load):
+        """
+        Load several keys with one call and cache the results
+
+        A result is not cached when invalidate(key) or clear() runs while the
+        load is in flight - the value read before an update must not outlive it.
+
+        Args:
+            keys: Distinct keys to load (the cache is not consulted)
+            load: Callable taking the list of keys and returning a dict of the
+                  values found; keys it leaves out are cached as None
+
+        Returns:
+            The dict returned by load
+        """
+        keys = list(keys)
+        with self._lock:
+            epoch = self._epoch
+            for key in keys:
+                self._loading[key] = self._loading.get(key, 0) + 1
+            generations = [self._generations.get(key, 0) for key in keys]
+        loaded = None
+        try:
+            loaded = load(keys)
+        finally:
+            expires_at = None if self.ttl is None else self._clock() + self.ttl
+            with self._lock:
+                for key, generation in zip(keys, generations):
+                    if (loaded is not None and epoch == self._epoch
+                            and generation == self._generations.get(key, 0)):
+                        self._store(key, loaded.get(key), expires_at)
+                    pending = self._loading.pop(key) - 1
+                    if pending:
+                        self._loading[key] = pending
+                    else:
+                        self._generations.pop(key, None)
+        return loaded
+
+    def invalidate(self, key):
+        """Drop one entry, and any value being loaded for it - returns True if it was cached"""
+        with self._lock:
+            if key in self._loading:
+                self._generations[key] = self._generations.get(key, 0) + 1
+            return self._entries.pop(key, None) is not None
+
+    def clear(self):
+        """Drop every entry and every value being loaded (counters are kept)"""
+        with self._lock:
+            self._epoch += 1
+            self._entries.clear()
+
+    def _store(self, key, value, expires_at):
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def stats(self):
+        """Counters and current size as a dictionary"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations
+            }
+
+
+class CachedKycStore(KycStore):
+    """
+    Read-through, write-invalidate cache over another KycStore
+
+    Unknown subjects are cached too, so repeated alerts on a customer without
+    a profile do not hit the backing store either. Cached profiles are shared
+    between callers and must not be mutated.
+    """
+
+    def __init__(self, store, max_size=10000, ttl=300.0, cache=None):
+        """
+        Args:
+            store: Backing KycStore
+            max_size: Cache capacity (ignored when cache is given)
+            ttl: Entry time-to-live in seconds (ignored when cache is given)
+            cache: Existing ContextCache to use
+        """
+        self.store = store
+        self.cache = ContextCache(max_size, ttl) if cache is None else cache
+
+    @property
+    def blocking(self):
+        # A miss reads the backing store
+        return self.store.blocking
+
+    def get(self, subject_id):
+        return self.cache.get_or_load(subject_id, self.store.get)
+
+    def get_many(self, subject_ids):
+        """Serve cached subjects and resolve the rest with one backing get_many"""
+        found = {}
+        missing = []
+        for subject_id in dict.fromkeys(subject_ids):
+            profile = self.cache.get(subject_id)
+            if profile is MISSING:
+                missing.append(subject_id)
+            elif profile is not None:
+                found[subject_id] = profile
+        if missing:
+            fetched = self.cache.load_many(missing, self.store.get_many)
+            for subject_id in missing:
+                profile = fetched.get(subject_id)
+                if profile is not None:
+                    found[subject_id] = profile
+        return found
+
+    def put_many(self, items):
+        items = list(items)
+        self.store.put_many(items)
+        for subject_id, _ in items:
+            self.cache.invalidate(subject_id)
+
+    def invalidate(self, subject_id=None):
+        """Drop one subject's cached profile (or every profile when subject_id is None)"""
+        if subject_id is None:
+            self.cache.clear()
+        else:
+            self.cache.invalidate(subject_id)
+
+    def close(self):
+        self.cache.clear()
+        self.store.close()
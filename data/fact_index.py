@@ -0,0 +1,282 @@
+"""
+Customer Fact Index
+Subject-keyed index over historic transaction facts - in-memory or memory-mapped columnar file
+
+HISTORIC_TRANSACTIONS_DB is organised scenario -> subject -> facts. The index
+pivots it to subject -> {scenario: facts}, so every feature group of a
+customer comes back from one read, while a secondary index keeps the
+(scenario, subject) access path used by the Investigator.
+
+Build a memory-mapped index file from the mock data:
+    python -m data.build_fact_index facts.idx
+"""
+
+import json
+import mmap
+import os
+import struct
+import threading
+from array import array
+from bisect import bisect_left
+
+_MAGIC = b"AARSFIX1"
+_PREAMBLE = struct.Struct("<8sQ")   # magic, header length
+_ALIGN = 8
+
+
+class FactIndex:
+    """Interface for subject-keyed historic facts"""
+
+    # Lookups wait on I/O - the orchestrator then runs them on its I/O threads
+    blocking = False
+
+    def get(self, scenario_code, subject_id):
+        """Facts for one (scenario, subject), or None when there are none"""
+        raise NotImplementedError
+
+    def get_subject(self, subject_id):
+        """Dict of scenario_code -> facts for every scenario the subject has facts in"""
+        raise NotImplementedError
+
+    def close(self):
+        """Release any resources held by the index"""
+
+
+class InMemoryFactIndex(FactIndex):
+    """Dict-backed index (pivots the mock HISTORIC_TRANSACTIONS_DB once)"""
+
+    def __init__(self, facts_db=None):
+        if facts_db is None:
+            from .historic_transactions_db import HISTORIC_TRANSACTIONS_DB
+            facts_db = HISTORIC_TRANSACTIONS_DB
+        self.facts_db = facts_db
+        self._by_subject = {}
+        for scenario_code in sorted(self.facts_db):
+            for subject_id, facts in self.facts_db[scenario_code].items():
+                self._by_subject.setdefault(subject_id, {})[scenario_code] = facts
+
+    def get(self, scenario_code, subject_id):
+        return self.facts_db.get(scenario_code, {}).get(subject_id)
+
+    def get_subject(self, subject_id):
+        groups = self._by_subject.get(subject_id)
+        return dict(groups) if groups is not None else None
+
+
+class MappedFactIndex(FactIndex):
+    """
+    Read-only index backed by a memory-mapped columnar file
+
+    Columns (little-endian arrays, 8-byte aligned):
+        key_offsets / key_blob      - sorted UTF-8 subject ids (binary searched)
+        subject_groups              - per subject, its first group (groups are contiguous)
+        group_scenario / group_offsets / value_blob
+                                    - per feature group, its scenario and JSON facts
+        scenario_ptr / scenario_rows / scenario_groups
+                                    - secondary index: per scenario, the sorted subject
+                                      rows that have a group in it and that group's index
+
+    Pages are shared between processes and only faulted in when read.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as stream:
+            self._mmap = mmap.mmap(stream.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, header_length = _PREAMBLE.unpack_from(self._mmap, 0)
+        if magic != _MAGIC:
+            self._mmap.close()
+            raise ValueError(f"{path}: not a fact index file")
+        header = json.loads(self._mmap[_PREAMBLE.size:_PREAMBLE.size + header_length])
+        self.scenarios = header["scenarios"]
+        self._scenario_ids = {code: index for index, code in enumerate(self.scenarios)}
+        self._count = header["subjects"]
+
+        view = memoryview(self._mmap)
+        self._views = [view]
+        self._blob_base = {}
+        for name, (typecode, offset, length) in header["columns"].items():
+            if typecode == "B":
+                # Blobs are sliced straight from the mmap, which yields bytes
+                self._blob_base[name] = offset
+                continue
+            column = view[offset:offset + length].cast(typecode)
+            self._views.append(column)
+            setattr(self, "_" + name, column)
+
+    def __len__(self):
+        return self._count
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def subjects(self):
+        """Iterate subject ids in sorted order"""
+        return (self._key(row).decode("utf-8") for row in range(self._count))
+
+    def get(self, scenario_code, subject_id):
+        scenario = self._scenario_ids.get(scenario_code)
+        if scenario is None:
+            return None
+        row = self._find(subject_id)
+        if row < 0:
+            return None
+        lo, hi = self._scenario_ptr[scenario], self._scenario_ptr[scenario + 1]
+        position = bisect_left(self._scenario_rows, row, lo, hi)
+        if position == hi or self._scenario_rows[position] != row:
+            return None
+        return self._value(self._scenario_groups[position])
+
+    def get_subject(self, subject_id):
+        row = self._find(subject_id)
+        if row < 0:
+            return None
+        return {
+            self.scenarios[self._group_scenario[group]]: self._value(group)
+            for group in range(self._subject_groups[row], self._subject_groups[row + 1])
+        }
+
+    def close(self):
+        if self._mmap.closed:
+            return
+        for view in reversed(self._views):
+            view.release()
+        self._views = []
+        self._mmap.close()
+
+    def _key(self, row):
+        base = self._blob_base["key_blob"]
+        return self._mmap[base + self._key_offsets[row]:base + self._key_offsets[row + 1]]
+
+    def _find(self, subject_id):
+        """Row of subject_id in the sorted key column, or -1"""
+        key = subject_id.encode("utf-8")
+        lo, hi = 0, self._count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._key(mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo if lo < self._count and self._key(lo) == key else -1
+
+    def _value(self, group):
+        base = self._blob_base["value_blob"]
+        return json.loads(
+            self._mmap[base + self._group_offsets[group]:base + self._group_offsets[group + 1]]
+        )
+
+
+def build_fact_index(path, facts_db=None):
+    """
+    Write a MappedFactIndex file (atomically replacing any existing one)
+
+    Args:
+        path: Output file path
+        facts_db: scenario -> subject -> facts mapping (defaults to HISTORIC_TRANSACTIONS_DB)
+
+    Returns:
+        Number of subjects indexed
+    """
+    if facts_db is None:
+        from .historic_transactions_db import HISTORIC_TRANSACTIONS_DB
+        facts_db = HISTORIC_TRANSACTIONS_DB
+    scenarios = sorted(facts_db)
+    by_subject = {}
+    for scenario, scenario_code in enumerate(scenarios):
+        for subject_id, facts in facts_db[scenario_code].items():
+            by_subject.setdefault(subject_id.encode("utf-8"), []).append((scenario, facts))
+
+    key_offsets, key_blob = array("Q", [0]), bytearray()
+    subject_groups = array("I", [0])
+    group_scenario, group_offsets, value_blob = array("H"), array("Q", [0]), bytearray()
+    secondary = [[] for _ in scenarios]
+    for row, key in enumerate(sorted(by_subject)):
+        key_blob += key
+        key_offsets.append(len(key_blob))
+        for scenario, facts in by_subject[key]:
+            secondary[scenario].append((row, len(group_scenario)))
+            group_scenario.append(scenario)
+            value_blob += json.dumps(facts, separators=(",", ":")).encode("utf-8")
+            group_offsets.append(len(value_blob))
+        subject_groups.append(len(group_scenario))
+
+    scenario_ptr, scenario_rows, scenario_groups = array("I", [0]), array("I"), array("I")
+    for entries in secondary:
+        for row, group in entries:
+            scenario_rows.append(row)
+            scenario_groups.append(group)
+        scenario_ptr.append(len(scenario_rows))
+
+    columns = [
+        ("key_offsets", key_offsets), ("key_blob", key_blob),
+        ("subject_groups", subject_groups), ("group_scenario", group_scenario),
+        ("group_offsets", group_offsets), ("value_blob", value_blob),
+        ("scenario_ptr", scenario_ptr), ("scenario_rows", scenario_rows),
+        ("scenario_groups", scenario_groups)
+    ]
+    payloads = [
+        column.tobytes() if isinstance(column, array) else bytes(column)
+        for _, column in columns
+    ]
+
+    # Header size depends on the offsets it records, so lay out until stable
+    header_length = 0
+    while True:
+        offset = _aligned(_PREAMBLE.size + header_length)
+        layout = {}
+        for (name, column), payload in zip(columns, payloads):
+            typecode = column.typecode if isinstance(column, array) else "B"
+            layout[name] = [typecode, offset, len(payload)]
+            offset = _aligned(offset + len(payload))
+        header = json.dumps({
+            "version": 1, "scenarios": scenarios,
+            "subjects": len(by_subject), "columns": layout
+        }).encode("utf-8")
+        if len(header) == header_length:
+            break
+        header_length = len(header)
+
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as stream:
+        stream.write(_PREAMBLE.pack(_MAGIC, header_length) + header)
+        for (name, _), payload in zip(columns, payloads):
+            stream.write(b"\0" * (layout[name][1] - stream.tell()))
+            stream.write(payload)
+    os.replace(tmp_path, path)
+    return len(by_subject)
+
+
+def _aligned(offset):
+    return (offset + _ALIGN - 1) // _ALIGN * _ALIGN
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_fact_index():
+    """
+    The process-wide fact index
+
+    Memory-maps the file named by the AARS_FACT_INDEX environment variable,
+    otherwise indexes the in-memory mock HISTORIC_TRANSACTIONS_DB.
+    """
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                path = os.environ.get("AARS_FACT_INDEX")
+                _index = MappedFactIndex(path) if path else InMemoryFactIndex()
+    return _index
+
+
+def set_fact_index(index):
+    """Replace the process-wide fact index (returns the previous one)"""
+    global _index
+    with _index_lock:
+        previous, _index = _index, index
+    return previous
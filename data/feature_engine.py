@@ -0,0 +1,326 @@
+"""
+Transaction Feature Engine
+Derives investigation facts from a raw transaction ledger with incremental sliding windows
+
+Each transaction updates its customer's windowed aggregates once, so reading
+the features for an alert never rescans history:
+    txn_count_last_48h      - deque of timestamps inside the 48h window
+    historical_max_txn_90d  - monotonic (decreasing) deque, max in O(1)
+    avg_txns_per_month      - per-day counts over the 90 day window
+    cash_deposits_7d        - deque of cash deposits inside the 7 day window
+    months_inactive         - gap before the latest reactivation
+Transactions must arrive in time order per customer; older ones are dropped
+and counted in FeatureEngine.out_of_order.
+
+Build an engine from JSONL ledger files:
+    engine = load_ledger(["ledger.jsonl"])
+"""
+
+import json
+import os
+import threading
+from collections import deque
+from datetime import datetime, timezone
+
+DAY = 86400
+MONTH = 30 * DAY
+VELOCITY_WINDOW = 2 * DAY
+DEPOSIT_WINDOW = 7 * DAY
+HISTORY_WINDOW = 90 * DAY
+# A gap this long between transactions marks the account as dormant
+DORMANCY_GAP = MONTH
+# More transactions than this inside VELOCITY_WINDOW is a velocity spike
+VELOCITY_SPIKE_COUNT = 5
+
+# Features read by each scenario, in the order the Investigator reports them
+SCENARIO_FEATURES = {
+    "VELOCITY_SPIKE": (
+        "historical_max_txn_90d", "txn_count_last_48h",
+        "prior_velocity_spike", "avg_txns_per_month"
+    ),
+    "STRUCTURING": ("cash_deposits_7d", "geographically_diverse", "branches_used"),
+    "KYC_INCONSISTENCY": ("wire_amount", "merchant_category", "transaction_type"),
+    "SANCTIONS_MATCH": ("counterparty_name", "bank_jurisdiction", "previous_relationship"),
+    "DORMANT_ACCOUNT": (
+        "months_inactive", "recent_inbound_amount",
+        "followed_by_atm_withdrawal", "international_withdrawal"
+    )
+}
+
+
+def parse_timestamp(value):
+    """Epoch seconds from a number or an ISO 8601 string (naive means UTC)"""
+    if isinstance(value, (int, float)):
+        return float(value)
+    if value.endswith("Z"):
+        value = value[:-1] + "+00:00"
+    parsed = datetime.fromisoformat(value)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+class CustomerWindows:
+    """Sliding-window aggregates for one customer"""
+
+    def __init__(self):
+        self.last_activity = None
+        self.recent = deque()              # timestamps within VELOCITY_WINDOW
+        self.max_amounts = deque()         # (ts, amount), amounts decreasing
+        self.daily_counts = deque()        # [day, count] within HISTORY_WINDOW
+        self.history_count = 0
+        self.deposits = deque()            # (ts, amount, branch) within DEPOSIT_WINDOW
+        self.spike_starts = deque()        # velocity spike start times within HISTORY_WINDOW
+        self.counterparties = set()
+        self.last_wire = None
+        self.last_counterparty = None
+        self.dormant_gap = 0.0
+        self.inbound_since_reactivation = 0
+        self.atm_since_reactivation = False
+        self.international_since_reactivation = False
+
+    def add(self, ts, txn):
+        """Fold one transaction (already known to be in time order) into the windows"""
+        amount = txn.get("amount", 0)
+        txn_type = txn.get("txn_type", "")
+        international = bool(txn.get("international", False))
+
+        if self.last_activity is not None and ts - self.last_activity >= DORMANCY_GAP:
+            self.dormant_gap = ts - self.last_activity
+            self.inbound_since_reactivation = 0
+            self.atm_since_reactivation = False
+            self.international_since_reactivation = False
+        self.last_activity = ts
+        self.evict(ts)
+
+        self.recent.append(ts)
+        if len(self.recent) == VELOCITY_SPIKE_COUNT + 1:
+            self.spike_starts.append(ts)
+
+        while self.max_amounts and self.max_amounts[-1][1] <= amount:
+            self.max_amounts.pop()
+        self.max_amounts.append((ts, amount))
+
+        day = int(ts // DAY)
+        if self.daily_counts and self.daily_counts[-1][0] == day:
+            self.daily_counts[-1][1] += 1
+        else:
+            self.daily_counts.append([day, 1])
+        self.history_count += 1
+
+        if txn_type == "cash_deposit":
+            self.deposits.append((ts, amount, txn.get("branch")))
+        if txn.get("direction") == "in":
+            self.inbound_since_reactivation += amount
+        if txn_type == "atm_withdrawal":
+            self.atm_since_reactivation = True
+            self.international_since_reactivation |= international
+        if txn_type == "wire":
+            self.last_wire = txn
+
+        counterparty = txn.get("counterparty")
+        if counterparty:
+            self.last_counterparty = (txn, counterparty in self.counterparties)
+            self.counterparties.add(counterparty)
+
+    def evict(self, now):
+        """Drop everything that has slid out of its window as of `now`"""
+        recent = self.recent
+        while recent and recent[0] <= now - VELOCITY_WINDOW:
+            recent.popleft()
+        while self.max_amounts and self.max_amounts[0][0] <= now - HISTORY_WINDOW:
+            self.max_amounts.popleft()
+        while self.deposits and self.deposits[0][0] <= now - DEPOSIT_WINDOW:
+            self.deposits.popleft()
+        while self.spike_starts and self.spike_starts[0] <= now - HISTORY_WINDOW:
+            self.spike_starts.popleft()
+        first_day = int((now - HISTORY_WINDOW) // DAY)
+        while self.daily_counts and self.daily_counts[0][0] <= first_day:
+            self.history_count -= self.daily_counts.popleft()[1]
+
+    def snapshot(self):
+        """All features as of the last eviction"""
+        in_spike = len(self.recent) > VELOCITY_SPIKE_COUNT
+        wire = self.last_wire or {}
+        counterparty, seen_before = self.last_counterparty or ({}, False)
+        branches = list(dict.fromkeys(branch for _, _, branch in self.deposits if branch))
+        return {
+            "historical_max_txn_90d": self.max_amounts[0][1] if self.max_amounts else 0,
+            "txn_count_last_48h": len(self.recent),
+            "prior_velocity_spike": len(self.spike_starts) > (1 if in_spike else 0),
+            "avg_txns_per_month": round(self.history_count * MONTH / HISTORY_WINDOW, 1),
+            "cash_deposits_7d": [amount for _, amount, _ in self.deposits],
+            "geographically_diverse": len({branch.split("_")[0] for branch in branches}) > 1,
+            "branches_used": branches,
+            "wire_amount": wire.get("amount", 0),
+            "merchant_category": wire.get("merchant_category", ""),
+            "transaction_type": (
+                ("International Wire" if wire.get("international") else "Domestic Wire")
+                if wire else ""
+            ),
+            "counterparty_name": counterparty.get("counterparty", ""),
+            "bank_jurisdiction": counterparty.get("counterparty_jurisdiction", ""),
+            "previous_relationship": seen_before,
+            "months_inactive": int(self.dormant_gap // MONTH),
+            "recent_inbound_amount": self.inbound_since_reactivation,
+            "followed_by_atm_withdrawal": self.atm_since_reactivation,
+            "international_withdrawal": self.international_since_reactivation
+        }
+
+
+class FeatureEngine:
+    """
+    Incrementally maintained per-customer features over a transaction ledger
+
+    Windows are evaluated against the ledger clock - the latest timestamp
+    ingested - unless an explicit as_of time is given. Safe to share
+    between threads.
+    """
+
+    def __init__(self, graph=None):
+        """
+        Args:
+            graph: LinkedAccountGraph fed with ingested cash deposits; supplies
+                   linked_accounts_total and linked_reportable_deposits
+                   for STRUCTURING when given
+        """
+        self.graph = graph
+        self.customers = {}
+        self.clock = None
+        self.ingested = 0
+        self.out_of_order = 0
+        self._lock = threading.Lock()
+
+    def ingest(self, txn):
+        """
+        Fold one raw transaction into its customer's windows
+
+        Args:
+            txn: Dict with subject_id, timestamp (epoch seconds or ISO 8601),
+                 amount, txn_type (cash_deposit / wire / atm_withdrawal / ...),
+                 and optionally direction ("in" / "out"), branch, international,
+                 merchant_category, counterparty, counterparty_jurisdiction
+
+        Returns:
+            True if applied, False if dropped for arriving out of order
+        """
+        ts = parse_timestamp(txn["timestamp"])
+        subject_id = txn["subject_id"]
+        with self._lock:
+            windows = self.customers.get(subject_id)
+            if windows is None:
+                windows = self.customers[subject_id] = CustomerWindows()
+            elif ts < windows.last_activity:
+                self.out_of_order += 1
+                return False
+            windows.add(ts, txn)
+            self.ingested += 1
+            if self.clock is None or ts > self.clock:
+                self.clock = ts
+            if self.graph is not None:
+                self.graph.ingest(txn)
+        return True
+
+    def ingest_many(self, txns):
+        """Ingest an iterable of transactions - returns how many were applied"""
+        return sum(1 for txn in txns if self.ingest(txn))
+
+    def features(self, subject_id, as_of=None):
+        """
+        Every derived feature for one customer
+
+        Args:
+            subject_id: Customer identifier
+            as_of: Evaluation time (epoch seconds / ISO 8601) no earlier than the
+                   customer's last eviction; defaults to the ledger clock
+
+        Returns:
+            Feature dictionary, or None when the customer has no transactions
+        """
+        with self._lock:
+            windows = self.customers.get(subject_id)
+            if windows is None:
+                return None
+            now = self.clock if as_of is None else parse_timestamp(as_of)
+            windows.evict(now)
+            return windows.snapshot()
+
+    def lookup(self, scenario_code, subject_id, as_of=None):
+        """
+        The features a scenario is investigated on
+
+        Returns:
+            Dictionary of SCENARIO_FEATURES[scenario_code], or None when the
+            customer has no transactions or the scenario has no ledger features
+        """
+        names = SCENARIO_FEATURES.get(scenario_code)
+        if names is None:
+            return None
+        features = self.features(subject_id, as_of)
+        if features is None:
+            return None
+        found = {name: features[name] for name in names}
+        if self.graph is not None and scenario_code == "STRUCTURING":
+            cluster = self.graph.cluster(subject_id, self.clock if as_of is None else as_of)
+            if cluster is not None:
+                found["linked_accounts_total"] = cluster.deposit_total
+                found["linked_reportable_deposits"] = cluster.reportable_deposits
+        return found
+
+
+def iter_ledger(path):
+    """Yield transactions from a JSONL ledger file"""
+    with open(path, encoding="utf-8") as stream:
+        for line in stream:
+            if line.strip():
+                yield json.loads(line)
+
+
+def load_ledger(paths, engine=None):
+    """
+    Build (or extend) a FeatureEngine from JSONL ledger files
+
+    Args:
+        paths: Ledger file path or list of paths, each sorted by timestamp
+        engine: Existing engine to ingest into (a new one if None)
+
+    Returns:
+        The FeatureEngine
+    """
+    engine = FeatureEngine() if engine is None else engine
+    for path in [paths] if isinstance(paths, str) else paths:
+        engine.ingest_many(iter_ledger(path))
+    return engine
+
+
+_engine = None
+_engine_lock = threading.Lock()
+
+
+def get_feature_engine():
+    """
+    The process-wide feature engine, or None when investigations use HISTORIC_TRANSACTIONS_DB only
+
+    Loaded on first use from the ledger named by the AARS_LEDGER environment
+    variable, linking accounts from AARS_ACCOUNTS when that is set too.
+    """
+    global _engine
+    if _engine is None and os.environ.get("AARS_LEDGER"):
+        with _engine_lock:
+            if _engine is None:
+                graph = None
+                if os.environ.get("AARS_ACCOUNTS"):
+                    from .account_graph import load_accounts
+                    graph = load_accounts(os.environ["AARS_ACCOUNTS"].split(os.pathsep))
+                _engine = load_ledger(
+                    os.environ["AARS_LEDGER"].split(os.pathsep), FeatureEngine(graph)
+                )
+    return _engine
+
+
+def set_feature_engine(engine):
+    """Replace the process-wide feature engine (returns the previous one)"""
+    global _engine
+    with _engine_lock:
+        previous, _engine = _engine, engine
+    return previous
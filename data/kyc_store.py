@@ -0,0 +1,179 @@
+"""
+KYC Store
+Storage abstraction for customer KYC profiles - in-memory dict or on-disk SQLite
+
+Agents and the Action Executor read profiles through get_kyc_store(), so
+the backing store can be swapped (set_kyc_store) without touching them.
+
+Build an SQLite store from the mock data or a JSONL file of profiles:
+    python -m data.build_kyc_db kyc.db [profiles.jsonl]
+"""
+
+import json
+import os
+import threading
+from itertools import islice
+
+from .records import KycProfile
+
+# SQLite's default limit on bound parameters is 999
+_MAX_BATCH = 900
+
+
+class KycStore:
+    """Interface for KYC profile storage"""
+
+    # Lookups wait on I/O - the orchestrator then runs them on its I/O threads
+    blocking = False
+
+    def get(self, subject_id):
+        """Profile dict for subject_id, or None when unknown"""
+        raise NotImplementedError
+
+    def get_many(self, subject_ids):
+        """Dict of subject_id -> profile for every known subject in subject_ids"""
+        found = {}
+        for subject_id in subject_ids:
+            profile = self.get(subject_id)
+            if profile is not None:
+                found[subject_id] = profile
+        return found
+
+    def put(self, subject_id, profile):
+        """Insert or replace one profile"""
+        self.put_many([(subject_id, profile)])
+
+    def put_many(self, items):
+        """Insert or replace (subject_id, profile) pairs"""
+        raise NotImplementedError
+
+    def close(self):
+        """Release any resources held by the store"""
+
+
+class InMemoryKycStore(KycStore):
+    """Dict-backed store (the mock KYC_DB)"""
+
+    def __init__(self, profiles=None):
+        if profiles is None:
+            from .kyc_db import KYC_DB
+            profiles = KYC_DB
+        self.profiles = profiles
+
+    def get(self, subject_id):
+        return self.profiles.get(subject_id)
+
+    def get_many(self, subject_ids):
+        profiles = self.profiles
+        return {s: profiles[s] for s in subject_ids if s in profiles}
+
+    def put_many(self, items):
+        self.profiles.update(items)
+
+
+class SqliteKycStore(KycStore):
+    """
+    On-disk SQLite store keyed by subject_id (primary key, WITHOUT ROWID)
+
+    Each thread (and each forked worker process) gets its own connection,
+    opened on first use and reused afterwards. Profiles are stored as JSON
+    and returned as compact KycProfile records.
+    """
+
+    blocking = True
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        self._connections = []
+        self._lock = threading.Lock()
+        with self._connection() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS kyc_profiles ("
+                " subject_id TEXT PRIMARY KEY,"
+                " profile TEXT NOT NULL"
+                ") WITHOUT ROWID"
+            )
+
+    def get(self, subject_id):
+        row = self._connection().execute(
+            "SELECT profile FROM kyc_profiles WHERE subject_id = ?", (subject_id,)
+        ).fetchone()
+        return KycProfile.from_json(row[0]) if row else None
+
+    def get_many(self, subject_ids):
+        """Resolve all subjects with one IN query per 900 ids"""
+        conn = self._connection()
+        found = {}
+        iterator = iter(dict.fromkeys(subject_ids))
+        while True:
+            batch = list(islice(iterator, _MAX_BATCH))
+            if not batch:
+                return found
+            placeholders = ",".join("?" * len(batch))
+            for subject_id, profile in conn.execute(
+                f"SELECT subject_id, profile FROM kyc_profiles "
+                f"WHERE subject_id IN ({placeholders})", batch
+            ):
+                found[subject_id] = KycProfile.from_json(profile)
+
+    def put_many(self, items):
+        with self._connection() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO kyc_profiles (subject_id, profile) VALUES (?, ?)",
+                ((subject_id, json.dumps(dict(profile))) for subject_id, profile in items)
+            )
+
+    def close(self):
+        with self._lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections = []
+        self._local = threading.local()
+
+    def _connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            import sqlite3
+
+            # Only this thread uses it; close() may run from another thread
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+            with self._lock:
+                self._connections.append(conn)
+        return conn
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_kyc_store():
+    """
+    The process-wide KYC store
+
+    Defaults to a cached SQLite store when the AARS_KYC_DB environment
+    variable names a database file, otherwise to the in-memory mock KYC_DB.
+    """
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                path = os.environ.get("AARS_KYC_DB")
+                if path:
+                    from .context_cache import CachedKycStore
+                    _store = CachedKycStore(SqliteKycStore(path))
+                else:
+                    _store = InMemoryKycStore()
+    return _store
+
+
+def set_kyc_store(store):
+    """Replace the process-wide KYC store (returns the previous one)"""
+    global _store
+    with _store_lock:
+        previous, _store = _store, store
+    return previous
@@ -0,0 +1,286 @@
+"""
+Compact Records
+Immutable slotted record types for alerts, evidence, KYC profiles and decisions
+
+A record keeps its declared fields in __slots__ instead of a per-instance
+dict, yet reads like the dict it replaces: record["field"], .get(), `in`,
+iteration, ** unpacking and dict(record) all work, so code written against
+plain dicts accepts records unchanged. Keys a record type does not declare
+go to a small `extra` dict (None when there are none). An optional field
+that was not given holds ABSENT and is missing from the mapping view,
+exactly as the key would be missing from the dict.
+
+Values of the enumerated fields (scenario_code, recommendation, risk_rating,
+status, source) are interned, so a million alerts parsed from JSON share one
+string per scenario instead of holding a million copies. Records are frozen,
+which also makes them safe to share between caches and results; replace()
+returns a modified copy. to_dict() / to_json() and from_dict() / from_json()
+convert to and from the plain forms.
+
+A Decision's rationale may be given as a (template, params) pair - the
+rule path's positional format template and a tuple of its parameters. It
+is rendered when first read (attribute, mapping view or to_dict()) and
+the text replaces the pair, so later reads cost a plain slot read. Most
+decisions are never audited, so adjudication formats few rationales.
+"""
+
+import json
+import string
+import sys
+from collections.abc import Mapping
+
+# Fields whose values come from a small closed set - interned on construction
+ENUMERATED_FIELDS = frozenset({"scenario_code", "recommendation", "risk_rating", "status", "source"})
+
+# Marks an optional field as not set (the key is absent from the record)
+ABSENT = object()
+
+_KEEP = object()
+_intern = sys.intern
+
+
+class Record(Mapping):
+    """Base of the slotted, immutable, dict-like record types"""
+
+    __slots__ = ("extra",)
+    FIELDS = ()
+
+    def __init_subclass__(cls, builder=False, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if builder:
+            return
+        cls._FIELD_SET = frozenset(cls.FIELDS)
+        # A field may live in a private "_<name>" slot behind a property (Decision.rationale)
+        cls._SLOTS = tuple(
+            name if name in cls.__slots__ else f"_{name}" for name in cls.FIELDS
+        )
+        cls.__new__, cls.replace, from_fields = _build_methods(cls)
+        cls.from_fields = staticmethod(from_fields)
+
+    @classmethod
+    def from_dict(cls, mapping):
+        """Record of a plain mapping (returned as is when it already is one)"""
+        if type(mapping) is cls:
+            return mapping
+        fields = cls._FIELD_SET
+        extra = {key: value for key, value in mapping.items() if key not in fields}
+        return cls(*[mapping.get(name, ABSENT) for name in cls.FIELDS], extra=extra)
+
+    @classmethod
+    def from_json(cls, text):
+        return cls.from_dict(json.loads(text))
+
+    def to_dict(self, render=True):
+        """
+        Plain dict with the same keys and values (declared fields first)
+
+        With render=False stored values are returned as they are, so a
+        deferred rationale stays a (template, params) pair.
+        """
+        result = {}
+        for name, slot in zip(self.FIELDS, self.FIELDS if render else self._SLOTS):
+            value = getattr(self, slot)
+            if value is not ABSENT:
+                result[name] = value
+        if self.extra is not None:
+            result.update(self.extra)
+        return result
+
+    def to_json(self):
+        return json.dumps(self.to_dict(), separators=(",", ":"))
+
+    def __getitem__(self, key):
+        if key in self._FIELD_SET:
+            value = getattr(self, key)
+            if value is not ABSENT:
+                return value
+        elif self.extra is not None and key in self.extra:
+            return self.extra[key]
+        raise KeyError(key)
+
+    def get(self, key, default=None):
+        if key in self._FIELD_SET:
+            value = getattr(self, key)
+            return default if value is ABSENT else value
+        extra = self.extra
+        return default if extra is None else extra.get(key, default)
+
+    def __contains__(self, key):
+        if key in self._FIELD_SET:
+            return getattr(self, key) is not ABSENT
+        return self.extra is not None and key in self.extra
+
+    def __iter__(self):
+        for name in self.FIELDS:
+            if getattr(self, name) is not ABSENT:
+                yield name
+        if self.extra is not None:
+            yield from self.extra
+
+    def __len__(self):
+        count = sum(1 for name in self.FIELDS if getattr(self, name) is not ABSENT)
+        return count + (len(self.extra) if self.extra is not None else 0)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __reduce__(self):
+        # Rebuilt through from_dict, so unpickled values are interned again (stored
+        # values travel as they are - a deferred rationale stays unrendered)
+        return type(self).from_dict, (self.to_dict(render=False),)
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+
+def _build_methods(cls):
+    """
+    Generate cls.__new__, cls.replace and cls.from_fields with one slot store per field
+
+    __new__(*FIELDS, extra=None) stores every field (ABSENT when not given)
+    and interns the enumerated ones; replace(**changes) copies the record
+    with some keys changed or added. from_fields(*FIELDS, extra) is the
+    hot-path constructor for generated code: a plain function taking every
+    value positionally, already interned - no type() call, defaults or
+    keyword handling, which cost more than the stores themselves. Records
+    are filled in as an instance of a mutable twin class with the same
+    slots, then switched to `cls` - much cheaper than a frozen
+    object.__setattr__ per field.
+    """
+    fields = cls.FIELDS
+    builder = type(f"_{cls.__name__}Builder", (cls,), {
+        "__slots__": (), "__setattr__": object.__setattr__, "__delattr__": object.__delattr__
+    }, builder=True)
+    namespace = {
+        "ABSENT": ABSENT, "_KEEP": _KEEP, "_intern": _intern, "_str": str, "_dict": dict,
+        "_new": object.__new__, "_builder": builder
+    }
+    new = [
+        f"def __new__(cls, {''.join(f'{name}=ABSENT, ' for name in fields)}*, extra=None):",
+        "    self = _new(_builder)"
+    ]
+    slots = list(zip(fields, cls._SLOTS))
+    for name, slot in slots:
+        value = name
+        if name in ENUMERATED_FIELDS:
+            value = f"_intern({name}) if type({name}) is _str else {name}"
+        new.append(f"    self.{slot} = {value}")
+    new += ["    self.extra = extra or None", "    self.__class__ = cls", "    return self"]
+
+    replace = [
+        f"def replace(self, {''.join(f'{name}=_KEEP, ' for name in fields)}**changes):",
+        "    return type(self)("
+    ]
+    for name, slot in slots:
+        replace.append(f"        self.{slot} if {name} is _KEEP else {name},")
+    replace += [
+        "        extra=_dict(self.extra or (), **changes) if changes else self.extra",
+        "    )"
+    ]
+
+    from_fields = [
+        f"def from_fields({''.join(f'{name}, ' for name in fields)}extra):",
+        "    self = _new(_builder)",
+        *(f"    self.{slot} = {name}" for name, slot in slots),
+        "    self.extra = extra",
+        "    self.__class__ = _cls",
+        "    return self"
+    ]
+    namespace["_cls"] = cls
+
+    exec("\n".join(new + replace + from_fields), namespace)
+    methods = namespace["__new__"], namespace["replace"], namespace["from_fields"]
+    for method, doc in zip(methods, (
+            f"Record of {', '.join(fields)} (plus any extra keys)",
+            "Copy of the record with some keys changed or added",
+            "Record of every field value and extra (None or a non-empty dict), as given")):
+        method.__qualname__ = f"{cls.__name__}.{method.__name__}"
+        method.__doc__ = doc
+    return methods
+
+
+class Alert(Record):
+    """Alert as ingested - id, scenario and subject plus optional description / timestamp"""
+
+    __slots__ = FIELDS = (
+        "alert_id", "scenario_code", "subject_id", "description", "timestamp", "risk_rating"
+    )
+
+
+class Evidence(Record):
+    """Spoke result - lookup status, the facts or profile found and their source"""
+
+    __slots__ = FIELDS = ("status", "data", "source")
+
+
+class KycProfile(Record):
+    """Customer KYC profile"""
+
+    __slots__ = FIELDS = (
+        "name", "occupation", "declared_income", "source_of_funds", "risk_rating",
+        "account_age_months"
+    )
+
+
+class Decision(Record):
+    """Adjudication outcome for one alert (rationale rendered on first read)"""
+
+    FIELDS = (
+        "alert_id", "recommendation", "rationale", "confidence", "applied_rule",
+        "rule_set_version", "coalesced_with"
+    )
+    __slots__ = tuple("_rationale" if name == "rationale" else name for name in FIELDS)
+
+    @property
+    def rationale(self):
+        value = self._rationale
+        if value.__class__ is tuple:
+            template, params = value
+            render = _RENDERERS.get(template)
+            if render is None:
+                render = _RENDERERS[template] = _compile_renderer(template)
+            value = render(*params)
+            # One slot swap, so a concurrent reader sees either form, never half of each
+            _cache_rationale(self, value)
+        return value
+
+
+# Slot store that bypasses the frozen __setattr__
+_cache_rationale = Decision._rationale.__set__
+
+
+# Positional format template -> function rendering it from the params
+_RENDERERS = {}
+
+
+def _compile_renderer(template):
+    """
+    Compile a positional str.format template into an equivalent f-string function
+
+    An f-string formats in a few opcodes where str.format re-parses the
+    template on every call. Templates that cannot be expressed safely as
+    one (auto-numbered or nested fields, specs with braces or quotes) are
+    rendered by template.format itself.
+    """
+    pieces = []
+    arity = 0
+    try:
+        for literal, field, spec, conversion in string.Formatter().parse(template):
+            pieces.append(literal.replace("{", "{{").replace("}", "}}"))
+            if field is None:
+                continue
+            if not field.isdigit() or conversion not in (None, "r", "s", "a") \
+                    or any(char in spec for char in "{}'\"\\"):
+                return template.format
+            arity = max(arity, int(field) + 1)
+            pieces.append(
+                "{_" + field + ("!" + conversion if conversion else "")
+                + (":" + spec if spec else "") + "}"
+            )
+        arguments = ", ".join(f"_{index}" for index in range(arity))
+        return eval(f"lambda {arguments}: f{''.join(pieces)!r}", {"__builtins__": {}})
+    except (ValueError, SyntaxError):
+        return template.format
@@ -0,0 +1,299 @@
+"""
+Sanctions Screener
+Fuzzy-matches counterparty names against a sanctions list with a character-trigram inverted index
+
+Names and aliases are normalised (case, accents, punctuation, legal-form
+noise words) and split into padded character trigrams. Similarity is the
+Dice coefficient of two trigram sets. A query only probes the postings of
+its rarest trigrams - any entry reaching min_score must share at least one
+of them - and candidates whose size, or whose probe hits plus the query's
+remaining trigrams, cannot reach min_score are dropped before the exact
+score is computed. Both scorers prune this way, so their cost follows the
+number of candidates rather than the size of the list.
+
+With NumPy installed and a list of at least NUMPY_MIN_RECORDS names, the
+candidates are counted and checked against the remaining trigrams' postings
+as arrays instead of by one set intersection each; scores are identical
+either way. NumPy is imported on the first fuzzy screen of such a list, not
+with the module - importing it costs more than screening a short list, so a
+run over the bundled sample never loads it.
+
+The list is a CSV file with columns entry_id, name, aliases (separated by
+"|"), jurisdiction and program; data/sanctions_list.csv is a fictional sample.
+"""
+
+import csv
+import heapq
+import math
+import os
+import threading
+import unicodedata
+from collections import namedtuple
+
+# NumPy is optional and imported on first screen - it would dominate start-up time
+_np = None
+_np_loaded = False
+
+# Listed names (incl. aliases) from which NumPy overlap counting pays for its import
+NUMPY_MIN_RECORDS = 10000
+
+SANCTIONS_LIST = os.path.join(os.path.dirname(os.path.abspath(__file__)), "sanctions_list.csv")
+
+# Legal-form and filler tokens that carry no identifying signal
+NOISE_TOKENS = frozenset({
+    "THE", "CO", "COMPANY", "LTD", "LIMITED", "LLC", "INC", "CORP",
+    "CORPORATION", "PLC", "SA", "GMBH", "FZE", "FZCO", "LLP", "OF"
+})
+
+SanctionsEntry = namedtuple("SanctionsEntry", ["entry_id", "name", "aliases", "jurisdiction", "program"])
+SanctionsMatch = namedtuple("SanctionsMatch", ["entry_id", "name", "matched_name", "score", "jurisdiction", "program"])
+
+
+def _numpy():
+    """The NumPy module, or None when it is not installed"""
+    global _np, _np_loaded
+    if not _np_loaded:
+        try:
+            import numpy
+        except ImportError:  # pragma: no cover - optional dependency
+            numpy = None
+        _np, _np_loaded = numpy, True
+    return _np
+
+
+def normalize_name(name):
+    """Upper-case ASCII words with punctuation and noise tokens removed"""
+    folded = unicodedata.normalize("NFKD", name).encode("ascii", "ignore").decode("ascii")
+    words = "".join(ch if ch.isalnum() else " " for ch in folded.upper()).split()
+    kept = [word for word in words if word not in NOISE_TOKENS]
+    return " ".join(kept or words)
+
+
+def trigrams(name):
+    """Set of padded character trigrams of an already normalised name"""
+    padded = f"  {name} "
+    return frozenset(padded[i:i + 3] for i in range(len(padded) - 2))
+
+
+def dice(grams_a, grams_b):
+    """Dice coefficient of two trigram sets"""
+    if not grams_a or not grams_b:
+        return 0.0
+    return 2.0 * len(grams_a & grams_b) / (len(grams_a) + len(grams_b))
+
+
+class SanctionsScreener:
+    """Trigram inverted index over sanctioned names and aliases"""
+
+    def __init__(self, entries=()):
+        self.entries = []
+        self._record_entry = []     # record -> index into entries
+        self._record_name = []      # record -> original name / alias
+        self._record_grams = []     # record -> trigram set
+        self._postings = {}         # trigram -> list of records
+        self._by_normalized = {}    # normalised name -> records (exact-match fast path)
+        self._arrays = None         # (postings, sizes) as NumPy arrays, built on first use
+        for entry in entries:
+            self.add(entry)
+
+    def __len__(self):
+        return len(self.entries)
+
+    @classmethod
+    def from_csv(cls, path=SANCTIONS_LIST):
+        """Build a screener from a sanctions list CSV file"""
+        screener = cls()
+        with open(path, newline="", encoding="utf-8") as stream:
+            for row in csv.DictReader(stream):
+                screener.add(SanctionsEntry(
+                    row["entry_id"],
+                    row["name"],
+                    tuple(alias for alias in (row.get("aliases") or "").split("|") if alias.strip()),
+                    row.get("jurisdiction", ""),
+                    row.get("program", "")
+                ))
+        return screener
+
+    def add(self, entry):
+        """Index one SanctionsEntry under its name and every alias"""
+        entry_index = len(self.entries)
+        self.entries.append(entry)
+        for name in (entry.name,) + tuple(entry.aliases):
+            normalized = normalize_name(name)
+            grams = trigrams(normalized)
+            if not grams:
+                continue
+            record = len(self._record_grams)
+            self._record_entry.append(entry_index)
+            self._record_name.append(name)
+            self._record_grams.append(grams)
+            self._by_normalized.setdefault(normalized, []).append(record)
+            for gram in grams:
+                self._postings.setdefault(gram, []).append(record)
+        self._arrays = None
+
+    def screen(self, name, top_k=5, min_score=0.5):
+        """
+        Best-matching sanctioned entries for one name
+
+        Args:
+            name: Counterparty name to screen
+            top_k: Maximum number of entries returned
+            min_score: Lowest Dice similarity reported (0 < min_score <= 1)
+
+        Returns:
+            List of SanctionsMatch, best first, at most one per entry
+        """
+        normalized = normalize_name(name)
+        query = trigrams(normalized)
+        if not query:
+            return []
+
+        exact = self._by_normalized.get(normalized)
+        if exact and top_k == 1:
+            return [self._match(exact[0], 1.0)]
+
+        vectorized = len(self._record_grams) >= NUMPY_MIN_RECORDS and _numpy() is not None
+        scored = (self._score_numpy if vectorized else self._score_python)(query, min_score)
+        best = {}
+        record_entry = self._record_entry
+        for record, score in scored:
+            entry_index = record_entry[record]
+            if score > best.get(entry_index, (-1.0, None))[0]:
+                best[entry_index] = (score, record)
+
+        top = heapq.nlargest(top_k, best.values(), key=lambda item: (item[0], -item[1]))
+        return [self._match(record, score) for score, record in top]
+
+    def screen_many(self, names, top_k=5, min_score=0.5):
+        """
+        Screen a batch of names, scoring each distinct normalised name once
+
+        Returns:
+            List of match lists, aligned with names
+        """
+        memo = {}
+        results = []
+        for name in names:
+            key = normalize_name(name)
+            if key not in memo:
+                memo[key] = self.screen(name, top_k, min_score)
+            results.append(memo[key])
+        return results
+
+    def best_score(self, name, min_score=0.5):
+        """Highest similarity of name to any sanctioned entry (0.0 below min_score)"""
+        matches = self.screen(name, top_k=1, min_score=min_score)
+        return matches[0].score if matches else 0.0
+
+    def _probe(self, query, min_score):
+        """
+        Split the query's trigrams for candidate generation
+
+        Any record scoring >= min_score shares at least min_overlap trigrams
+        with the query, so it must appear in the postings of the query's
+        rarest len(query) - min_overlap + 1 trigrams (the probe). A candidate
+        found in k of them can share at most k + len(rest) trigrams in all -
+        too few for its size rules it out before the rest are checked.
+
+        Returns:
+            (probe trigrams, rest of the trigrams, smallest and largest candidate size)
+        """
+        size = len(query)
+        min_overlap = max(1, math.ceil(min_score * size / (2.0 - min_score) - 1e-9))
+        ranked = sorted(query, key=lambda gram: len(self._postings.get(gram, ())))
+        split = size - min_overlap + 1
+        smallest = min_score * size / (2.0 - min_score) - 1e-9
+        largest = size * (2.0 - min_score) / min_score + 1e-9
+        return ranked[:split], ranked[split:], smallest, largest
+
+    def _score_python(self, query, min_score):
+        """(record, score) pairs >= min_score, from a pruned candidate set"""
+        probe, rest, smallest, largest = self._probe(query, min_score)
+        probe_hits = {}
+        for gram in probe:
+            for record in self._postings.get(gram, ()):
+                probe_hits[record] = probe_hits.get(record, 0) + 1
+
+        size, slack = len(query), len(rest)
+        grams_of = self._record_grams
+        for record, hits in probe_hits.items():
+            grams = grams_of[record]
+            length = len(grams)
+            if not smallest <= length <= largest or 2.0 * (hits + slack) / (size + length) < min_score:
+                continue
+            score = 2.0 * len(query & grams) / (size + length)
+            if score >= min_score:
+                yield record, score
+
+    def _score_numpy(self, query, min_score):
+        """(record, score) pairs >= min_score, from the same pruned candidates, scored at once"""
+        np = _np
+        if self._arrays is None:
+            self._arrays = (
+                {gram: np.array(records, dtype=np.int32) for gram, records in self._postings.items()},
+                np.array([len(grams) for grams in self._record_grams], dtype=np.int64)
+            )
+        postings, sizes = self._arrays
+        probe, rest, smallest, largest = self._probe(query, min_score)
+        hits = [postings[gram] for gram in probe if gram in postings]
+        if not hits:
+            return []
+        # Candidates and how many probe trigrams each shares, from the sorted probe postings
+        hits = np.sort(np.concatenate(hits))
+        starts = np.flatnonzero(np.concatenate(([True], hits[1:] != hits[:-1])))
+        candidates = hits[starts]
+        overlap = np.diff(np.append(starts, len(hits)))
+        size = len(query)
+        lengths = sizes[candidates]
+        keep = (
+            (lengths >= smallest) & (lengths <= largest)
+            & (2.0 * (overlap + len(rest)) / (size + lengths) >= min_score)
+        )
+        candidates, overlap, lengths = candidates[keep], overlap[keep], lengths[keep]
+        # Postings are in record order, so membership of the rest is a binary search
+        for gram in rest:
+            records = postings.get(gram)
+            if records is None or not len(candidates):
+                continue
+            found = np.minimum(np.searchsorted(records, candidates), len(records) - 1)
+            overlap = overlap + (records[found] == candidates)
+        scores = 2.0 * overlap / (size + lengths)
+        keep = scores >= min_score
+        return zip(candidates[keep].tolist(), scores[keep].tolist())
+
+    def _match(self, record, score):
+        entry = self.entries[self._record_entry[record]]
+        return SanctionsMatch(
+            entry.entry_id, entry.name, self._record_name[record],
+            round(score, 4), entry.jurisdiction, entry.program
+        )
+
+
+_screener = None
+_screener_lock = threading.Lock()
+
+
+def get_sanctions_screener():
+    """
+    The process-wide screener, built on first use
+
+    Loads the list named by the AARS_SANCTIONS_LIST environment variable,
+    otherwise the bundled sample list.
+    """
+    global _screener
+    if _screener is None:
+        with _screener_lock:
+            if _screener is None:
+                _screener = SanctionsScreener.from_csv(
+                    os.environ.get("AARS_SANCTIONS_LIST") or SANCTIONS_LIST
+                )
+    return _screener
+
+
+def set_sanctions_screener(screener):
+    """Replace the process-wide screener (returns the previous one)"""
+    global _screener
+    with _screener_lock:
+        previous, _screener = _screener, screener
+    return previous
@@ -1,48 +1,426 @@
 """
 Agentic Alert Resolution System - Main Entry Point
-Processes all 5 pre-generated alerts through the multi-agent workflow
+Streams alerts from files / stdin through the multi-agent workflow
+(defaults to the 5 pre-generated sample alerts)
+
+Subsystems are imported where an option needs them, not at module import:
+a run only loads the stores, agents and process machinery it uses (see
+benchmarks/bench_pipeline.py for the startup budget).
 """
 
-from data import ALERTS
-from agents import OrchestratorAgent
-from actions import ActionExecutor
-from utils import AuditLogger
+import os
+from functools import partial
+
+
+def parse_args(argv=None):
+    """Parse command line options"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Agentic Alert Resolution System (AARS)")
+    parser.add_argument(
+        "inputs", nargs="*", metavar="INPUT",
+        help="JSONL/CSV alert file, directory of alert files, or - for stdin "
+             "(default: the bundled sample alerts)"
+    )
+    parser.add_argument(
+        "--input-format", choices=["jsonl", "csv"], default="jsonl",
+        help="format of stdin and of files without a .jsonl/.csv suffix (default: jsonl)"
+    )
+    parser.add_argument(
+        "--follow", action="store_true",
+        help="keep polling input directories for newly dropped alert files"
+    )
+    parser.add_argument(
+        "--kyc-db", metavar="PATH",
+        help="read KYC profiles from this SQLite database (see python -m data.build_kyc_db)"
+    )
+    parser.add_argument(
+        "--kyc-cache-size", type=int, default=10000, metavar="N",
+        help="profiles cached in front of --kyc-db (default: 10000, 0 disables; the "
+             "in-memory store used without --kyc-db is read directly, uncached)"
+    )
+    parser.add_argument(
+        "--kyc-cache-ttl", type=float, default=300.0, metavar="SECONDS",
+        help="seconds a cached profile stays valid (default: 300)"
+    )
+    parser.add_argument(
+        "--fact-index", metavar="PATH",
+        help="read historic facts from this memory-mapped index (see python -m data.build_fact_index)"
+    )
+    parser.add_argument(
+        "--ledger", metavar="PATH", action="append",
+        help="derive investigation facts from this JSONL transaction ledger (repeatable)"
+    )
+    parser.add_argument(
+        "--accounts", metavar="PATH", action="append",
+        help="JSONL account identifiers linking customers for --ledger structuring totals (repeatable)"
+    )
+    parser.add_argument(
+        "--rules", metavar="PATH",
+        help="adjudicate with the versioned SOP rule set in this JSON file instead of "
+             "config/sop_rules.py, hot-reloading it when it changes "
+             "(see python -m config.build_rule_set)"
+    )
+    parser.add_argument(
+        "--rules-poll", type=float, default=1.0, metavar="SECONDS",
+        help="seconds between checks of --rules for a new version (default: 1, 0 disables)"
+    )
+    parser.add_argument(
+        "--what-if", metavar="CANDIDATE",
+        help="replay the alerts under the active and this candidate rule set file and "
+             "print how many decisions flip, per rule and outcome (no actions, no audit trail)"
+    )
+    parser.add_argument(
+        "--what-if-report", metavar="PATH",
+        help="also write the --what-if decision-diff report as JSON to PATH"
+    )
+    parser.add_argument(
+        "--workers", type=int, default=1,
+        help="forked worker processes for batch mode, inheriting every store option "
+             "(default: 1, in-process)"
+    )
+    parser.add_argument(
+        "--shards", type=int, default=0, metavar="N",
+        help="partition alerts by subject over N shard processes, each deciding and "
+             "actioning its own customers' alerts"
+    )
+    parser.add_argument(
+        "--compact-records", action="store_true",
+        help="hold alerts as compact immutable records instead of dicts"
+    )
+    parser.add_argument(
+        "--preload", action="store_true",
+        help="load KYC, historic fact and sanctions data before the first alert "
+             "(done automatically for forked --workers)"
+    )
+    parser.add_argument(
+        "--unordered", action="store_true",
+        help="in batch mode, act on decisions as they complete instead of in input order"
+    )
+    parser.add_argument(
+        "--decision-memo", nargs="?", const="", metavar="PATH",
+        help="reuse decisions for identical rule inputs; with PATH also persist them "
+             "in that SQLite file across runs"
+    )
+    parser.add_argument(
+        "--decision-memo-size", type=int, default=100000, metavar="N",
+        help="decisions kept in memory by --decision-memo (default: 100000)"
+    )
+    parser.add_argument(
+        "--schedule", action="store_true",
+        help="process alerts by priority class, customer risk and SLA deadline "
+             "instead of input order (see config/scheduling.py)"
+    )
+    parser.add_argument(
+        "--coalesce-window", type=float, default=0.0, metavar="SECONDS",
+        help="reuse the decision of an earlier alert for the same subject and scenario "
+             "within this many seconds (default: 0, off)"
+    )
+    parser.add_argument(
+        "--dispatch", action="store_true",
+        help="deliver actions asynchronously through batched per-channel queues"
+    )
+    parser.add_argument(
+        "--channel-latency", type=float, default=0.0, metavar="SECONDS",
+        help="simulated round trip of each downstream send with --dispatch (default: 0)"
+    )
+    parser.add_argument(
+        "--journal", metavar="PATH",
+        help="append per-alert decision / action progress to this journal; journaled "
+             "actions are never executed again"
+    )
+    parser.add_argument(
+        "--resume", action="store_true",
+        help="skip alerts the --journal already records as completed, and action the "
+             "ones it records as decided without investigating them again"
+    )
+    parser.add_argument(
+        "--quiet", action="store_true",
+        help="disable the console audit trail"
+    )
+    parser.add_argument(
+        "--log-file", metavar="PATH",
+        help="append the audit trail as JSON lines to PATH"
+    )
+    parser.add_argument(
+        "--log-level", choices=["DEBUG", "INFO", "WARNING", "ERROR"], default="DEBUG",
+        help="minimum audit event level (default: DEBUG)"
+    )
+    parser.add_argument(
+        "--metrics-file", metavar="PATH",
+        help="write latency histograms and counters at exit (.json snapshot, otherwise Prometheus text)"
+    )
+    args = parser.parse_args(argv)
+    missing = [path for path in args.inputs if path != "-" and not os.path.exists(path)]
+    missing += [path for path in (args.ledger or []) + (args.accounts or []) if not os.path.isfile(path)]
+    if missing:
+        parser.error(f"no such file or directory: {', '.join(missing)}")
+    if args.resume and not args.journal:
+        parser.error("--resume requires --journal")
+    if args.shards > 1:
+        conflicting = [
+            option for option, used in (
+                ("--workers", args.workers > 1), ("--journal", args.journal),
+                ("--schedule", args.schedule), ("--coalesce-window", args.coalesce_window > 0)
+            ) if used
+        ]
+        if conflicting:
+            parser.error(f"--shards cannot be combined with {', '.join(conflicting)}")
+    if args.what_if_report and not args.what_if:
+        parser.error("--what-if-report requires --what-if")
+    if args.what_if:
+        conflicting = [
+            option for option, used in (
+                ("--workers", args.workers > 1), ("--shards", args.shards > 1),
+                ("--journal", args.journal), ("--schedule", args.schedule),
+                ("--coalesce-window", args.coalesce_window > 0), ("--dispatch", args.dispatch),
+                ("--decision-memo", args.decision_memo is not None)
+            ) if used
+        ]
+        if conflicting:
+            parser.error(f"--what-if cannot be combined with {', '.join(conflicting)}")
+    return args
+
+
+def setup_logging(args):
+    """Build the audit trail sinks requested on the command line"""
+    from utils import ConsoleSink, JsonlFileSink, configure_logging, log_sinks
+
+    sinks = [] if args.quiet else [ConsoleSink()]
+    if args.log_file:
+        sinks.append(JsonlFileSink(args.log_file))
+    configure_logging(sinks=sinks, level=getattr(log_sinks, args.log_level))
+
+
+def build_dispatcher(channel_latency):
+    """--dispatch delivery pool - an alert is logged complete once its action was delivered"""
+    from actions import ActionDispatcher, local_transports
+    from utils import AuditLogger
+
+    logger = AuditLogger()
+    dispatcher = ActionDispatcher(local_transports(channel_latency))
+    dispatcher.subscribe(lambda request: logger.log_alert_complete(request.alert_id))
+    return dispatcher
+
+
+def shard_executor(dispatch, channel_latency):
+    """ActionExecutor of one --shards node (with its own dispatcher under --dispatch)"""
+    from actions import ActionExecutor
+
+    return ActionExecutor(dispatcher=build_dispatcher(channel_latency) if dispatch else None)
+
+
+SAMPLE_ALERTS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "sample_alerts.jsonl")
+
+
+def run_what_if(args, alerts):
+    """Replay alerts under the active and the candidate rule set and print the diff"""
+    from agents import RuleCompileError, get_rule_set, load_rule_set, replay
+
+    try:
+        candidate = load_rule_set(args.what_if)
+    except (OSError, RuleCompileError) as e:
+        raise SystemExit(f"error: cannot load candidate rule set: {e}")
+    report = replay(alerts, get_rule_set(), candidate)
+    print(report.to_text(), end="")
+    if args.what_if_report:
+        with open(args.what_if_report, "w", encoding="utf-8") as stream:
+            stream.write(report.to_json() + "\n")
+
+    print("\n" + "="*70)
+    print("WHAT-IF REPLAY COMPLETE")
+    print(f"Alerts Ingested: {alerts.accepted} | Rejected at Ingestion: {alerts.rejected}")
+    print("="*70)
 
 
-def main():
+def main(argv=None):
     """Main execution function"""
+    from data import AlertStream, set_fact_index, set_feature_engine, set_kyc_store, warm_up
+    from agents import OrchestratorAgent
+    from actions import ActionExecutor
+    from utils import AuditLogger, configure_logging, get_metrics, shutdown_logging
+
+    args = parse_args(argv)
+    if args.what_if:
+        # Replay is decisions only - no audit trail, no actions
+        configure_logging(quiet=True)
+    else:
+        setup_logging(args)
+    if args.kyc_db:
+        from data import CachedKycStore, SqliteKycStore
+
+        store = SqliteKycStore(args.kyc_db)
+        if args.kyc_cache_size > 0:
+            store = CachedKycStore(store, args.kyc_cache_size, args.kyc_cache_ttl)
+        set_kyc_store(store)
+    if args.fact_index:
+        from data import MappedFactIndex
+
+        set_fact_index(MappedFactIndex(args.fact_index))
+    if args.ledger:
+        from data import FeatureEngine, load_accounts, load_ledger
+
+        graph = load_accounts(args.accounts) if args.accounts else None
+        set_feature_engine(load_ledger(args.ledger, FeatureEngine(graph)))
+    preload_seconds = sum(warm_up().values()) if args.preload else None
+    watcher = None
+    if args.rules:
+        from agents import RuleCompileError, RuleSetWatcher
+
+        try:
+            # A replay compares against one fixed current rule set - no reloading
+            watcher = RuleSetWatcher(args.rules, 0 if args.what_if else args.rules_poll)
+        except (OSError, RuleCompileError) as e:
+            raise SystemExit(f"error: cannot load rule set: {e}")
+
+    memo = None
+    if args.decision_memo is not None:
+        from agents import DecisionMemo, set_decision_memo
+
+        memo = DecisionMemo(args.decision_memo_size, args.decision_memo or None)
+        set_decision_memo(memo)
+
     # Initialize components
     orchestrator = OrchestratorAgent()
-    action_executor = ActionExecutor()
+    journal = None
+    if args.journal:
+        from utils import ProgressJournal
+
+        journal = ProgressJournal(args.journal)
+    sharded = args.shards > 1
+    dispatcher = None
+    if args.dispatch and not sharded:
+        dispatcher = build_dispatcher(args.channel_latency)
+    action_executor = ActionExecutor(dispatcher=dispatcher, journal=journal)
     logger = AuditLogger()
-    
+
     print("\n" + "="*70)
     print("AGENTIC ALERT RESOLUTION SYSTEM (AARS)")
     print("="*70)
-    print(f"Total Alerts to Process: {len(ALERTS)}")
+    alerts = AlertStream(
+        args.inputs or [SAMPLE_ALERTS],
+        stdin_format=args.input_format,
+        follow=args.follow,
+        records=args.compact_records
+    )
+    print(f"Alert Input: {', '.join(args.inputs) if args.inputs else 'bundled sample alerts'}")
+    if watcher is not None:
+        print(f"Rule Set: {watcher.rule_set.version} ({args.rules}"
+              + (f", hot-reloaded every {watcher.interval:g}s)" if watcher.interval > 0 else ")"))
+    if args.what_if:
+        print(f"What-If Candidate: {args.what_if}")
+    if preload_seconds is not None:
+        print(f"Data Preloaded: {preload_seconds * 1e3:.1f} ms")
+    if args.workers > 1:
+        print(f"Batch Mode: {args.workers} worker processes")
+    if sharded:
+        print(f"Shard Mode: {args.shards} shard processes, alerts partitioned by subject")
     print("="*70 + "\n")
-    
-    # Process each alert
-    for alert in ALERTS:
+
+    if args.what_if:
+        run_what_if(args, alerts)
+        if watcher is not None:
+            watcher.close()
+        return
+
+    # Step 1: Orchestrator coordinates investigation (per-alert errors are isolated)
+    coalescer = scheduler = coordinator = None
+    if args.coalesce_window > 0:
+        from agents import AlertCoalescer
+
+        coalescer = AlertCoalescer(args.coalesce_window)
+    if args.schedule:
+        from agents import AlertScheduler
+
+        scheduler = AlertScheduler()
+    if sharded:
+        from agents import ShardCoordinator
+
+        # Shard nodes execute their own actions - only errors come back here
+        coordinator = ShardCoordinator(
+            args.shards, executor_factory=partial(shard_executor, args.dispatch, args.channel_latency)
+        )
+        results = coordinator.process(alerts)
+    else:
+        results = orchestrator.process_batch(
+            alerts, workers=args.workers, ordered=not args.unordered, coalescer=coalescer,
+            scheduler=scheduler, journal=journal if args.resume else None
+        )
+    for alert, decision, error in results:
+        if error is not None:
+            print(f"\n❌ ERROR processing alert {alert['alert_id']}: {error}\n")
+            continue
+        if sharded:
+            continue
+
+        if journal is not None:
+            journal.record_decision(alert["alert_id"], decision)
         try:
-            # Step 1: Orchestrator coordinates investigation
-            decision = orchestrator.process_alert(alert)
-            
             # Step 2: Execute action based on decision
             action_executor.execute(decision, alert)
-            
-            # Mark alert as complete
-            logger.log_alert_complete(alert["alert_id"])
-            
+
+            # Mark alert as complete (a dispatched action once it was delivered)
+            if dispatcher is None:
+                logger.log_alert_complete(alert["alert_id"])
+
         except Exception as e:
             print(f"\n❌ ERROR processing alert {alert['alert_id']}: {str(e)}\n")
             continue
-    
+
+    orchestrator.close()
+    if watcher is not None:
+        watcher.close()
+    undelivered = []
+    if dispatcher is not None:
+        undelivered = [
+            (request.alert_id, request.action, f"{type(error).__name__}: {error}")
+            for request, error in dispatcher.close()
+        ]
+    if coordinator is not None:
+        undelivered += coordinator.undelivered
+    if journal is not None:
+        journal.close()
+    if memo is not None:
+        memo.close()
+    shutdown_logging()
+    if args.metrics_file:
+        get_metrics().write(args.metrics_file)
 
     print("\n" + "="*70)
-    print("ALL ALERTS PROCESSED SUCCESSFULLY")
+    print("ALERTS PROCESSED - SOME ACTIONS WERE NOT DELIVERED" if undelivered
+          else "ALL ALERTS PROCESSED SUCCESSFULLY")
+    print(f"Alerts Ingested: {alerts.accepted} | Rejected at Ingestion: {alerts.rejected}")
+    if args.resume:
+        print(f"Resumed: {journal.skipped} alerts already completed in {args.journal} were skipped, "
+              f"{journal.reused} decided ones actioned from their journaled decision")
+    if memo is not None and args.workers <= 1 and not sharded:
+        # Worker processes keep their own counters - see aars_decision_memo_total
+        stats = memo.stats()
+        print(f"Decision Memo: {stats['memory_hits'] + stats['disk_hits']} hits / "
+              f"{stats['misses']} computed (hit rate {stats['hit_rate']:.1%})")
+    if watcher is not None and watcher.applied + watcher.rejected:
+        print(f"Rule Set Reloads: {watcher.applied} applied, {watcher.rejected} rejected "
+              f"(now {watcher.rule_set.version})")
+    if coordinator is not None:
+        print("Shard Load: " + ", ".join(
+            f"shard {shard}: {counts['routed']}" + (f" ({counts['failed']} failed)" if counts["failed"] else "")
+            for shard, counts in coordinator.stats().items()
+        ))
+    if scheduler is not None:
+        print("SLA Misses: " + ", ".join(
+            f"{name} {counts['sla_missed']}/{counts['completed']}"
+            for name, counts in scheduler.stats().items()
+        ))
+    if coalescer is not None:
+        print(f"Alerts Coalesced: {coalescer.coalesced} (decision reused, not re-investigated)")
+    if undelivered:
+        print(f"Undelivered Actions: {len(undelivered)} (retries exhausted)")
+        for alert_id, action, error in undelivered:
+            print(f"  ❌ {alert_id} {action}: {error}")
     print("="*70)
+    if undelivered:
+        raise SystemExit(1)
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
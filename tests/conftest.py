@@ -0,0 +1,15 @@
+"""
+Shared test fixtures
+Keeps audit output off so tests only see their own results
+"""
+
+import pytest
+
+from utils import configure_logging
+
+
+@pytest.fixture(autouse=True, scope="session")
+def quiet_audit_trail():
+    configure_logging(quiet=True)
+    yield
+    configure_logging()
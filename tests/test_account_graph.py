@@ -0,0 +1,41 @@
+"""
+Linked-account graph tests
+A reportable deposit on any linked account keeps RUL-A002 from calling the cluster structuring
+"""
+
+from agents.rule_engine import default_rules
+from data import FeatureEngine
+from data.account_graph import LinkedAccountGraph
+
+KYC = {"occupation": "Teacher", "source_of_funds": "Salary"}
+
+
+def deposit(subject_id, amount, day):
+    return {"subject_id": subject_id, "amount": amount, "txn_type": "cash_deposit",
+            "timestamp": f"2024-03-0{day}T10:00:00Z"}
+
+
+def structuring_action(linked_amount):
+    graph = LinkedAccountGraph()
+    graph.add_account("CUST-1", {"phone": "555-0100"})
+    graph.add_account("CUST-2", {"phone": "(555) 0100"})
+    engine = FeatureEngine(graph)
+    engine.ingest_many([deposit("CUST-1", 9500, 1), deposit("CUST-1", 9800, 2),
+                        deposit("CUST-2", linked_amount, 3)])
+    facts = engine.lookup("STRUCTURING", "CUST-1")
+    rule = default_rules()["STRUCTURING"]
+    index, _ = rule.evaluate({"scenario_code": "STRUCTURING"}, facts, KYC)
+    return facts, rule.paths[index].action
+
+
+def test_linked_deposits_below_threshold_escalate():
+    facts, action = structuring_action(9900)
+    assert facts["linked_accounts_total"] == 29200
+    assert facts["linked_reportable_deposits"] == 0
+    assert action == "ESCALATE_FOR_SAR"
+
+
+def test_linked_reportable_deposit_is_not_structuring():
+    facts, action = structuring_action(12000)
+    assert facts["linked_reportable_deposits"] == 1
+    assert action == "CLOSE_FALSE_POSITIVE"
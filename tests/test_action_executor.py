@@ -0,0 +1,34 @@
+"""
+Action executor tests
+Action messages, and the rationales they quote, are only rendered for an audit trail that shows them
+"""
+
+from actions import ActionExecutor
+from data import InMemoryKycStore
+from data.records import ABSENT, Decision
+from utils import ConsoleSink, configure_logging
+
+ALERT = {"alert_id": "A-1", "scenario_code": "STRUCTURING", "subject_id": "CUST-102"}
+
+
+def deferred(recommendation):
+    return Decision.from_fields(
+        "A-1", recommendation, ("Total {0:,}", (29500,)), 0.9, "RUL-A002", ABSENT, ABSENT, None
+    )
+
+
+def test_quiet_run_leaves_rationales_unrendered():
+    executor = ActionExecutor(store=InMemoryKycStore())
+    for recommendation in ("ESCALATE_FOR_SAR", "CLOSE_FALSE_POSITIVE"):
+        decision = deferred(recommendation)
+        executor.execute(decision, ALERT)
+        assert decision._rationale == ("Total {0:,}", (29500,))
+
+
+def test_audited_run_renders_rationale(capsys):
+    configure_logging(sinks=[ConsoleSink()])
+    try:
+        ActionExecutor(store=InMemoryKycStore()).execute(deferred("CLOSE_FALSE_POSITIVE"), ALERT)
+    finally:
+        configure_logging(quiet=True)
+    assert "Reason: Total 29,500" in capsys.readouterr().out
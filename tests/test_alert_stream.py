@@ -0,0 +1,32 @@
+"""
+Alert stream tests
+Following a directory reads every file dropped into it, including during the first pass
+"""
+
+import json
+import threading
+from itertools import islice
+
+from data import AlertStream
+
+
+def drop(directory, name, alert_ids):
+    (directory / name).write_text("".join(
+        json.dumps({"alert_id": alert_id, "scenario_code": "VELOCITY_SPIKE", "subject_id": "CUST-101"}) + "\n"
+        for alert_id in alert_ids
+    ))
+
+
+def test_file_dropped_during_first_pass_is_read(tmp_path):
+    drop(tmp_path, "a.jsonl", ["A-1", "A-2"])
+    stream = iter(AlertStream([str(tmp_path)], follow=True, poll_interval=0.01))
+    assert next(stream)["alert_id"] == "A-1"
+    drop(tmp_path, "b.jsonl", ["B-1"])
+    # A later file ends the wait either way, so a missed B-1 fails instead of hanging
+    later = threading.Timer(0.2, drop, (tmp_path, "c.jsonl", ["C-1"]))
+    later.start()
+    try:
+        assert [alert["alert_id"] for alert in islice(stream, 2)] == ["A-2", "B-1"]
+        assert next(stream)["alert_id"] == "C-1"
+    finally:
+        later.cancel()
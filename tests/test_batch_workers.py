@@ -0,0 +1,86 @@
+"""
+Batch worker tests
+Worker and shard processes decide under the parent's configuration whatever the default start method
+"""
+
+import multiprocessing
+
+import pytest
+
+from agents import OrchestratorAgent, ShardCoordinator
+from agents.rule_engine import compile_rules
+from agents.rule_sets import set_rule_set
+from config import SOP_RULES
+from data import InMemoryKycStore, set_kyc_store
+from data.kyc_db import KYC_DB
+
+pytestmark = pytest.mark.skipif(
+    "fork" not in multiprocessing.get_all_start_methods(), reason="workers need fork"
+)
+
+
+@pytest.fixture
+def custom_rule_set():
+    previous = set_rule_set(compile_rules(SOP_RULES, version="custom-1"))
+    yield
+    set_rule_set(previous)
+
+
+@pytest.fixture
+def spawn_by_default():
+    method = multiprocessing.get_start_method(allow_none=True)
+    multiprocessing.set_start_method("spawn", force=True)
+    yield
+    multiprocessing.set_start_method(method, force=True)
+
+
+def test_workers_inherit_configuration(custom_rule_set, spawn_by_default):
+    alerts = [
+        {"alert_id": f"A-{i}", "scenario_code": "VELOCITY_SPIKE", "subject_id": "CUST-101"}
+        for i in range(8)
+    ]
+    orchestrator = OrchestratorAgent()
+    try:
+        results = list(orchestrator.process_batch(alerts, workers=2, chunksize=2))
+    finally:
+        orchestrator.close()
+    assert [result.error for result in results] == [None] * len(alerts)
+    assert {result.decision["rule_set_version"] for result in results} == {"custom-1"}
+
+
+@pytest.fixture
+def custom_kyc_store():
+    profiles = dict(KYC_DB, **{"CUST-102": dict(KYC_DB["CUST-102"], occupation="Teacher")})
+    previous = set_kyc_store(InMemoryKycStore(profiles))
+    yield
+    set_kyc_store(previous)
+
+
+def test_shard_nodes_inherit_configuration(custom_kyc_store, spawn_by_default):
+    alerts = [
+        {"alert_id": f"A-{i}", "scenario_code": "STRUCTURING", "subject_id": "CUST-102"}
+        for i in range(4)
+    ]
+    in_process = OrchestratorAgent()
+    try:
+        expected = in_process.process_alert(alerts[0])["recommendation"]
+    finally:
+        in_process.close()
+    # The default profile would make this REQUEST_INFORMATION
+    assert expected == "ESCALATE_FOR_SAR"
+    results = list(ShardCoordinator(2, chunksize=2).process(alerts))
+    assert [result.error for result in results] == [None] * len(alerts)
+    assert {result.decision["recommendation"] for result in results} == {expected}
+
+
+def test_shards_without_fork_run_in_process(custom_kyc_store, monkeypatch):
+    monkeypatch.setattr("agents.sharding.get_all_start_methods", lambda: ["spawn"])
+    alerts = [
+        {"alert_id": f"A-{i}", "scenario_code": "STRUCTURING", "subject_id": f"CUST-10{i % 3}"}
+        for i in range(5)
+    ]
+    coordinator = ShardCoordinator(2, chunksize=2)
+    results = list(coordinator.process(alerts))
+    assert [result.alert["alert_id"] for result in results] == [alert["alert_id"] for alert in alerts]
+    assert results[2].decision["recommendation"] == "ESCALATE_FOR_SAR"
+    assert sum(stats["routed"] for stats in coordinator.stats().values()) == len(alerts)
@@ -0,0 +1,83 @@
+"""
+Alert coalescing tests
+Every alert that goes into a coalesced batch comes out with exactly one result
+"""
+
+from collections import Counter
+
+from agents import AlertCoalescer, OrchestratorAgent
+from agents.orchestrator import BatchResult
+
+SCENARIOS = ("VELOCITY_SPIKE", "STRUCTURING", "KYC_INCONSISTENCY", "SANCTIONS_MATCH", "DORMANT_ACCOUNT")
+
+
+def make_alerts(count):
+    return [
+        {"alert_id": f"A-{i:03d}", "scenario_code": SCENARIOS[i % len(SCENARIOS)],
+         "subject_id": f"CUST-{100 + i}"}
+        for i in range(count)
+    ]
+
+
+def duplicate(alert, alert_id):
+    return dict(alert, alert_id=alert_id)
+
+
+def run(alerts, **kwargs):
+    orchestrator = OrchestratorAgent()
+    try:
+        return list(orchestrator.process_batch(
+            alerts, workers=1, coalescer=AlertCoalescer(), **kwargs
+        ))
+    finally:
+        orchestrator.close()
+
+
+def assert_complete(alerts, results):
+    assert len(results) == len(alerts)
+    assert Counter(r.alert["alert_id"] for r in results) == Counter(a["alert_id"] for a in alerts)
+    for result in results:
+        assert (result.decision is None) != (result.error is None)
+
+
+def test_trailing_duplicate_of_answered_leader():
+    alerts = make_alerts(32)
+    alerts.append(duplicate(alerts[0], "A-DUP"))
+    results = run(alerts)
+    assert_complete(alerts, results)
+    member = next(r for r in results if r.alert["alert_id"] == "A-DUP")
+    assert member.decision["alert_id"] == "A-DUP"
+    assert member.decision["coalesced_with"] == "A-000"
+
+
+def test_several_trailing_duplicates_across_chunks():
+    alerts = make_alerts(70)
+    alerts += [duplicate(alerts[i], f"A-DUP-{i}") for i in (0, 5, 33, 69)]
+    assert_complete(alerts, run(alerts, chunksize=8))
+
+
+def test_duplicates_waiting_and_ready_are_all_fanned_out():
+    alerts = make_alerts(10)
+    alerts.insert(3, duplicate(alerts[1], "A-EARLY"))
+    alerts += [duplicate(alerts[2], "A-LATE-1"), duplicate(alerts[2], "A-LATE-2")]
+    coalescer = AlertCoalescer()
+    orchestrator = OrchestratorAgent()
+    try:
+        results = list(orchestrator.process_batch(alerts, workers=1, chunksize=4, coalescer=coalescer))
+    finally:
+        orchestrator.close()
+    assert_complete(alerts, results)
+    assert coalescer.coalesced == 3
+
+
+def test_leader_error_reaches_trailing_members():
+    alerts = make_alerts(3)
+    alerts.append(duplicate(alerts[0], "A-DUP"))
+    coalescer = AlertCoalescer()
+    results = list(coalescer.fan_out(
+        BatchResult(alert, None, "boom") for alert in coalescer.leaders(alerts)
+    ))
+    assert_complete(alerts, results)
+    member = results[-1]
+    assert member.alert["alert_id"] == "A-DUP"
+    assert member.error == "coalesced with A-000: boom"
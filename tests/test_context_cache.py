@@ -0,0 +1,64 @@
+"""
+Context cache tests
+A profile updated while it is being read is never cached in its old version
+"""
+
+from data.context_cache import CachedKycStore
+from data.kyc_store import InMemoryKycStore
+
+
+class UpdatedDuringRead(InMemoryKycStore):
+    """Store whose profiles change (through the cache) while a read is in flight"""
+
+    def __init__(self, profiles):
+        super().__init__(profiles)
+        self.cached = None
+        self.updates = {}
+
+    def read(self, read):
+        stale = read()
+        if self.updates:
+            self.cached.put_many(self.updates.items())
+            self.updates = {}
+        return stale
+
+    def get(self, subject_id):
+        return self.read(lambda: super(UpdatedDuringRead, self).get(subject_id))
+
+    def get_many(self, subject_ids):
+        return self.read(lambda: super(UpdatedDuringRead, self).get_many(subject_ids))
+
+
+def cached_store():
+    store = UpdatedDuringRead({"C-1": {"risk": "LOW"}, "C-2": {"risk": "LOW"}})
+    store.cached = CachedKycStore(store)
+    return store
+
+
+def test_get_does_not_cache_value_invalidated_during_load():
+    store = cached_store()
+    store.updates = {"C-1": {"risk": "HIGH"}}
+    assert store.cached.get("C-1") == {"risk": "LOW"}
+    assert store.cached.get("C-1") == {"risk": "HIGH"}
+    assert store.cached.get("C-1") == {"risk": "HIGH"}
+    assert store.cached.cache.stats()["hits"] == 1
+
+
+def test_get_many_caches_only_keys_not_invalidated():
+    store = cached_store()
+    store.updates = {"C-2": {"risk": "HIGH"}}
+    store.cached.get_many(["C-1", "C-2", "C-3"])
+    assert store.cached.get_many(["C-1", "C-2"]) == {"C-1": {"risk": "LOW"}, "C-2": {"risk": "HIGH"}}
+    # C-1 and the unknown C-3 were cached, C-2 had to be read again
+    assert store.cached.cache.stats()["hits"] == 1
+    assert store.cached.get("C-3") is None
+    assert store.cached.cache.stats()["hits"] == 2
+    assert not store.cached.cache._loading and not store.cached.cache._generations
+
+
+def test_clear_during_load_drops_every_result():
+    store = cached_store()
+    cache = store.cached.cache
+    loaded = cache.load_many(["C-1", "C-2"], lambda keys: (cache.clear(), {"C-1": 1})[1])
+    assert loaded == {"C-1": 1}
+    assert len(cache) == 0
@@ -0,0 +1,33 @@
+"""
+Decision memo tests
+Persisted decisions keep their rationale unrendered and render identically when loaded back
+"""
+
+from agents.decision_memo import DecisionMemo
+from agents.rule_engine import default_rules
+
+CASE = (
+    {"alert_id": "A-1", "scenario_code": "STRUCTURING", "subject_id": "CUST-102"},
+    {"status": "success", "data": {"cash_deposits_7d": [9800, 9500], "linked_accounts_total": 29500}},
+    {"status": "success", "data": {"occupation": "Teacher", "source_of_funds": "Salary"}}
+)
+
+
+def test_disk_tier_stores_rationale_unrendered(tmp_path):
+    rule = default_rules()["STRUCTURING"]
+    path = str(tmp_path / "memo.db")
+    memo = DecisionMemo(path=path)
+    decision = memo.decide(rule, *CASE)
+    memo.close()
+    assert decision._rationale.__class__ is tuple
+
+    reloaded = DecisionMemo(path=path)
+    try:
+        loaded = reloaded.decide(rule, {**CASE[0], "alert_id": "A-2"}, *CASE[1:])
+    finally:
+        reloaded.close()
+    assert reloaded.disk_hits == 1
+    assert loaded._rationale.__class__ is tuple
+    assert loaded["alert_id"] == "A-2"
+    assert loaded["rationale"] == rule.decide(*CASE)["rationale"]
+    assert loaded["recommendation"] == decision["recommendation"] == "ESCALATE_FOR_SAR"
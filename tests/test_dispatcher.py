@@ -0,0 +1,101 @@
+"""
+Action dispatcher tests
+Failed sends are retried with capped exponential backoff, queued actions are delivered
+in batches, and actions still failing after their retries are returned by close()
+"""
+
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from actions import ActionDispatcher, ActionRequest, SimulatedTransport, TransportError
+
+
+class FlakyTransport(SimulatedTransport):
+    """Fails the first `failures` sends, then delivers - recording every batch size"""
+
+    def __init__(self, failures=0, **options):
+        super().__init__(**options)
+        self.failures = failures
+        self.batches = []
+
+    def send(self, connection, requests):
+        self.batches.append(len(requests))
+        if self.failures:
+            self.failures -= 1
+            raise TransportError("unavailable")
+        super().send(connection, requests)
+
+
+def requests(count, action="CLOSE"):
+    return [
+        ActionRequest(action, f"A-{i}", "CUST-101", "Customer", {}, [], f"key-{i}")
+        for i in range(count)
+    ]
+
+
+def dispatcher(transport, **options):
+    transports = {
+        "case_management": transport,
+        "email": SimulatedTransport(latency=0.0),
+        "ivr": SimulatedTransport(latency=0.0)
+    }
+    return ActionDispatcher(transports, workers=1, **options)
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    # Backoff sleeps are recorded, not slept; transports keep the real clock
+    recorded = []
+    monkeypatch.setattr(
+        "actions.dispatcher.time", SimpleNamespace(monotonic=time.monotonic, sleep=recorded.append)
+    )
+    return recorded
+
+
+def test_failed_send_is_retried_on_a_fresh_connection(sleeps):
+    transport = FlakyTransport(failures=2, latency=0.0)
+    with dispatcher(transport, retries=3, backoff=0.1) as pool:
+        pool.submit(requests(1)[0])
+        pool.flush()
+        assert pool.stats()["case_management"] == {"delivered": 1, "failed": 0, "retries": 2, "queued": 0}
+    assert [request.alert_id for request in transport.delivered] == ["A-0"]
+    assert transport.connections == 3
+    assert pool.close() == []
+
+
+def test_backoff_doubles_up_to_the_cap(sleeps):
+    transport = FlakyTransport(failures=10, latency=0.0)
+    pool = dispatcher(transport, retries=4, backoff=0.1, max_backoff=0.3)
+    pool.submit(requests(1)[0])
+    failures = pool.close()
+    # Jitter scales each delay by 0.5 - 1.0
+    for delay, nominal in zip(sleeps, [0.1, 0.2, 0.3, 0.3]):
+        assert nominal * 0.5 <= delay <= nominal
+    assert len(sleeps) == 4 and len(transport.batches) == 5
+    assert [(request.alert_id, str(error)) for request, error in failures] == [("A-0", "unavailable")]
+
+
+def test_queued_actions_are_sent_in_batches():
+    transport = FlakyTransport(latency=0.05, max_batch=10)
+    with dispatcher(transport) as pool:
+        for request in requests(25):
+            pool.submit(request)
+        pool.flush()
+    # The first send holds the worker while the rest queue up behind it
+    assert max(transport.batches) == 10 and len(transport.batches) < 25
+    assert sorted(request.alert_id for request in transport.delivered) == sorted(
+        f"A-{i}" for i in range(25)
+    )
+
+
+def test_close_reports_undelivered_actions_without_a_callback():
+    transport = FlakyTransport(failures=100, latency=0.0)
+    pool = dispatcher(transport, retries=1, backoff=0.0)
+    for request in requests(3):
+        pool.submit(request)
+    failures = pool.close()
+    assert sorted(request.alert_id for request, _ in failures) == ["A-0", "A-1", "A-2"]
+    assert all(isinstance(error, TransportError) for _, error in failures)
+    assert pool.close() == failures
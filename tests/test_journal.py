@@ -0,0 +1,88 @@
+"""
+Progress journal tests
+Torn records are dropped on reopen, a resumed run skips completed alerts and actions
+decided ones from the journal, and action claims survive a restart
+"""
+
+from agents import OrchestratorAgent
+from utils import ProgressJournal, idempotency_key
+
+
+def alert(alert_id, subject_id="CUST-101"):
+    return {"alert_id": alert_id, "scenario_code": "VELOCITY_SPIKE", "subject_id": subject_id}
+
+
+def test_torn_final_line_is_dropped(tmp_path):
+    path = tmp_path / "journal.jsonl"
+    with ProgressJournal(str(path)) as journal:
+        journal.record_action("key-1", "A-1", "CLOSE")
+    with open(path, "a", encoding="utf-8") as stream:
+        stream.write('{"stage":"actioned","alert_id":"A-2"')
+    with ProgressJournal(str(path)) as journal:
+        assert journal.completed == {"A-1"}
+        journal.record_action("key-3", "A-3", "CLOSE")
+    with ProgressJournal(str(path)) as journal:
+        assert journal.completed == {"A-1", "A-3"}
+    assert path.read_text(encoding="utf-8").count("\n") == 2
+
+
+def test_resume_skips_completed_and_reuses_decisions(tmp_path):
+    path = str(tmp_path / "journal.jsonl")
+    orchestrator = OrchestratorAgent()
+    try:
+        decided = orchestrator.process_alert(alert("A-2"))
+    finally:
+        orchestrator.close()
+    with ProgressJournal(path) as journal:
+        journal.record_decision("A-1", {"alert_id": "A-1", "recommendation": "CLOSE_FALSE_POSITIVE"})
+        journal.record_action("key-1", "A-1", "CLOSE")
+        journal.record_decision("A-2", decided)
+
+    alerts = [alert("A-1"), alert("A-2"), alert("A-3")]
+    orchestrator = OrchestratorAgent()
+    investigated = []
+    investigate = orchestrator.investigator.investigate
+    orchestrator.investigator.investigate = lambda data: investigated.append(data["alert_id"]) or investigate(data)
+    try:
+        with ProgressJournal(path) as journal:
+            results = list(orchestrator.process_batch(alerts, workers=1, journal=journal))
+    finally:
+        orchestrator.close()
+    assert [result.alert["alert_id"] for result in results] == ["A-2", "A-3"]
+    assert investigated == ["A-3"]
+    assert [result.error for result in results] == [None, None]
+    assert results[0].decision["rationale"] == decided["rationale"]
+    assert results[0].decision["recommendation"] == decided["recommendation"]
+    assert (journal.skipped, journal.reused) == (1, 1)
+
+
+def test_claims_survive_a_restart(tmp_path):
+    path = str(tmp_path / "journal.jsonl")
+    done, failed, crashed = (idempotency_key(f"A-{i}", "CLOSE") for i in range(3))
+    with ProgressJournal(path) as journal:
+        assert journal.claim(done) and not journal.claim(done)
+        journal.record_action(done, "A-0", "CLOSE")
+        assert journal.claim(failed)
+        journal.release(failed)
+        # Claimed but never recorded - the run died before the action finished
+        assert journal.claim(crashed)
+    with ProgressJournal(path) as journal:
+        assert not journal.claim(done)
+        assert journal.claim(failed)
+        assert journal.claim(crashed)
+
+
+def test_reused_decisions_keep_input_order(tmp_path):
+    path = str(tmp_path / "journal.jsonl")
+    with ProgressJournal(path) as journal:
+        for alert_id in ("A-1", "A-3", "A-4"):
+            journal.record_decision(alert_id, {"alert_id": alert_id, "recommendation": "CLOSE_FALSE_POSITIVE"})
+    alerts = [alert(f"A-{i}") for i in range(1, 5)]
+    orchestrator = OrchestratorAgent()
+    try:
+        with ProgressJournal(path) as journal:
+            # Full one-alert chunks: A-3 and A-4 are read only after A-2's result is out
+            results = list(orchestrator.process_batch(alerts, workers=1, chunksize=1, journal=journal))
+    finally:
+        orchestrator.close()
+    assert [result.alert["alert_id"] for result in results] == ["A-1", "A-2", "A-3", "A-4"]
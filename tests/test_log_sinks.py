@@ -0,0 +1,49 @@
+"""
+Log sink tests
+A failing write drops its events but never kills the JSONL writer thread
+"""
+
+import json
+import threading
+
+from utils.log_sinks import JsonlFileSink
+
+
+class FailingFile:
+    """File stand-in whose writes fail like a full disk"""
+
+    def write(self, text):
+        raise OSError(28, "No space left on device")
+
+    def flush(self):
+        pass
+
+    def close(self):
+        pass
+
+
+def flushed(sink, timeout=5.0):
+    """True when flush() returns within the timeout"""
+    thread = threading.Thread(target=sink.flush, daemon=True)
+    thread.start()
+    thread.join(timeout)
+    return not thread.is_alive()
+
+
+def test_write_errors_are_counted_and_writer_keeps_draining(tmp_path):
+    path = tmp_path / "audit.jsonl"
+    sink = JsonlFileSink(str(path), flush_interval=0.05)
+    try:
+        healthy, sink._file = sink._file, FailingFile()
+        for i in range(3):
+            sink.emit({"event": "lost", "n": i})
+        assert flushed(sink)
+        assert sink.dropped == 3
+
+        sink._file = healthy
+        sink.emit({"event": "kept"})
+        assert flushed(sink)
+    finally:
+        sink.close()
+    events = [json.loads(line) for line in path.read_text().splitlines()]
+    assert events == [{"event": "kept"}]
@@ -0,0 +1,65 @@
+"""
+Command line tests
+Missing input files are reported by the parser before anything runs, start-up stays light,
+and undelivered actions fail the run
+"""
+
+import os
+import subprocess
+import sys
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from actions import ACTION_CHANNELS, SimulatedTransport
+from main import SAMPLE_ALERTS, main, parse_args
+
+
+def test_missing_input_is_a_usage_error(tmp_path, capsys):
+    missing = str(tmp_path / "missing.jsonl")
+    with pytest.raises(SystemExit) as exit_info:
+        parse_args([SAMPLE_ALERTS, missing])
+    assert exit_info.value.code == 2
+    assert missing in capsys.readouterr().err
+
+
+def test_existing_inputs_and_stdin_accepted(tmp_path):
+    args = parse_args([SAMPLE_ALERTS, str(tmp_path), "-"])
+    assert args.inputs == [SAMPLE_ALERTS, str(tmp_path), "-"]
+
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def run_python(code):
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True,
+                            cwd=REPO_ROOT)
+    return result.stdout.strip().splitlines()[-1]
+
+
+def test_import_does_not_load_numpy():
+    # NumPy is optional - only the sanctions screener loads it, on first use
+    assert run_python("import sys, main; print('numpy' in sys.modules)") == "False"
+
+
+def test_sample_run_loads_only_what_it_uses():
+    # One process, in-memory stores, short sanctions list: no event loop, pool, SQLite or NumPy
+    code = (
+        "import sys, main; main.main(['--quiet']); "
+        "print(sorted({'asyncio', 'multiprocessing', 'sqlite3', 'numpy', 'logging'} & set(sys.modules)))"
+    )
+    assert run_python(code) == "[]"
+
+
+def test_undelivered_actions_fail_the_run(monkeypatch, capsys):
+    monkeypatch.setattr("actions.local_transports", lambda latency=0.0: {
+        channel: SimulatedTransport(latency=0.0, failure_rate=1.0) for channel in ACTION_CHANNELS.values()
+    })
+    monkeypatch.setattr("actions.dispatcher.time", SimpleNamespace(monotonic=time.monotonic, sleep=lambda _: None))
+    with pytest.raises(SystemExit) as exit_info:
+        main(["--quiet", "--dispatch"])
+    assert exit_info.value.code == 1
+    output = capsys.readouterr().out
+    assert "ALL ALERTS PROCESSED SUCCESSFULLY" not in output
+    assert "Undelivered Actions: 5" in output and "A-001 SAR_PREP: TransportError" in output
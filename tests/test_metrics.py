@@ -0,0 +1,75 @@
+"""
+Metrics tests
+Draining counters and histograms while other threads record loses no observation
+"""
+
+import sys
+import threading
+
+import pytest
+
+from utils.metrics import Counter, Histogram
+
+THREADS = 4
+PER_THREAD = 20000
+
+
+@pytest.fixture
+def frequent_thread_switches():
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    yield
+    sys.setswitchinterval(interval)
+
+
+def record_while_taking(record, take):
+    done = threading.Event()
+    taken = []
+
+    def drain():
+        while not done.is_set():
+            taken.append(take())
+
+    def work():
+        for _ in range(PER_THREAD):
+            record()
+
+    drainer = threading.Thread(target=drain)
+    workers = [threading.Thread(target=work) for _ in range(THREADS)]
+    drainer.start()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    done.set()
+    drainer.join()
+    return taken + [take()]
+
+
+def test_counter_take_loses_no_increment(frequent_thread_switches):
+    counter = Counter()
+    taken = record_while_taking(counter.inc, counter.take)
+    assert sum(taken) == THREADS * PER_THREAD
+    assert counter.value == 0
+
+
+def test_histogram_take_loses_no_observation(frequent_thread_switches):
+    histogram = Histogram(bounds=(1.0,))
+    taken = record_while_taking(lambda: histogram.observe(0.5), histogram.take)
+    assert sum(counts[0] for counts, _ in taken) == THREADS * PER_THREAD
+    assert sum(total for _, total in taken) == THREADS * PER_THREAD * 0.5
+    assert histogram.count == 0
+
+
+def test_take_resets_state():
+    counter = Counter()
+    counter.inc(3)
+    assert counter.take() == 3
+    counter.inc(2)
+    assert counter.value == 2 and counter.state() == 2
+    histogram = Histogram(bounds=(1.0, 2.0))
+    histogram.observe(1.5)
+    histogram.merge(([1, 0, 1], 3.5))
+    assert histogram.take() == ([1, 1, 1], 5.0)
+    histogram.observe(0.5)
+    assert histogram.state() == ([1, 0, 0], 0.5)
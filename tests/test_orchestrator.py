@@ -0,0 +1,52 @@
+"""
+Orchestrator tests
+In-memory lookups are made directly; only stores that block go through the event loop and I/O threads
+"""
+
+import pytest
+
+from agents import OrchestratorAgent
+from agents.context_agent import ContextGathererAgent
+from data import CachedKycStore, InMemoryKycStore, SqliteKycStore
+from data.kyc_db import KYC_DB
+
+ALERT = {"alert_id": "A-1", "scenario_code": "STRUCTURING", "subject_id": "CUST-102"}
+
+
+@pytest.fixture
+def sqlite_store(tmp_path):
+    store = SqliteKycStore(str(tmp_path / "kyc.db"))
+    store.put_many(KYC_DB.items())
+    yield store
+    store.close()
+
+
+def decide(store):
+    orchestrator = OrchestratorAgent()
+    orchestrator.context_gatherer = ContextGathererAgent(store)
+    try:
+        decision = orchestrator.process_alert(ALERT)
+        return decision, orchestrator._loop is not None, orchestrator._io_executor is not None
+    finally:
+        orchestrator.close()
+
+
+def test_in_memory_store_skips_event_loop():
+    decision, used_loop, used_threads = decide(InMemoryKycStore())
+    assert decision["recommendation"] == "REQUEST_INFORMATION"
+    assert not used_loop and not used_threads
+
+
+@pytest.mark.parametrize("cached", [False, True])
+def test_blocking_store_runs_on_io_threads(sqlite_store, cached):
+    store = CachedKycStore(sqlite_store) if cached else sqlite_store
+    decision, used_loop, used_threads = decide(store)
+    assert decision["recommendation"] == "REQUEST_INFORMATION"
+    assert used_loop and used_threads
+
+
+def test_prefetched_subject_does_not_block(sqlite_store):
+    gatherer = ContextGathererAgent(sqlite_store)
+    assert gatherer.blocking("CUST-102")
+    gatherer.prefetch(["CUST-102"])
+    assert not gatherer.blocking("CUST-102")
@@ -0,0 +1,48 @@
+"""
+Record tests
+Deferred decision rationales render exactly like str.format and only once
+"""
+
+import pickle
+
+import pytest
+
+from data.records import ABSENT, Decision, _compile_renderer
+
+TEMPLATES = [
+    ("Volume (${0:,.0f}) vs income (${1:,}) from {2!r}", (9000.0, 50000, "Salary")),
+    ("{{literal}} {1} before {0}, quotes ' \" and \\n kept", ("a", "b")),
+    ("no fields at all", ()),
+    ("{0:>8.2%}|{0!s:<6}|{0!a}", (0.5,)),
+    # Not expressible as a safe f-string - rendered by str.format itself
+    ("{}", (1,)),
+    ("{0:{1}}", (3, 5)),
+    ("{0:'^5}", ("x",)),
+    ("{0[0]}", ([7],)),
+]
+
+
+@pytest.mark.parametrize("template, params", TEMPLATES)
+def test_renderer_matches_str_format(template, params):
+    assert _compile_renderer(template)(*params) == template.format(*params)
+
+
+def deferred(template, params):
+    return Decision.from_fields(
+        "A-1", "CLOSE_FALSE_POSITIVE", (template, params), 0.9, "RUL-X", ABSENT, ABSENT, None
+    )
+
+
+def test_rationale_rendered_once_and_cached():
+    decision = deferred("{0} of {1}", (1, 2))
+    assert decision["rationale"] == "1 of 2"
+    assert decision._rationale == "1 of 2"
+    assert decision.get("rationale") is decision["rationale"]
+    assert decision.to_dict()["rationale"] == "1 of 2"
+
+
+def test_pickled_decision_keeps_rationale_deferred():
+    decision = pickle.loads(pickle.dumps(deferred("{0:,}", (1234567,))))
+    assert decision._rationale == ("{0:,}", (1234567,))
+    assert decision["rationale"] == "1,234,567"
+    assert "rule_set_version" not in decision
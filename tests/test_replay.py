@@ -0,0 +1,60 @@
+"""
+What-if replay tests
+An alert whose rule raises is counted as an error without losing the rest of its chunk
+"""
+
+from agents.replay import replay
+from agents.rule_engine import compile_rules
+
+
+def rules(threshold):
+    return compile_rules({
+        "TEST": {
+            "rule_id": "RUL-T001",
+            "inputs": {"Amount": ["investigation", "amount", 0]},
+            "decision_paths": [{
+                "conditions": [f"Amount > {threshold}"],
+                "action": "ESCALATE_FOR_SAR",
+                "confidence": 0.9,
+                "rationale": "Amount {Amount}"
+            }],
+            "default_path": {
+                "action": "CLOSE_FALSE_POSITIVE", "confidence": 0.5, "rationale": "Small"
+            }
+        }
+    }, version=f"above-{threshold}")
+
+
+class Spoke:
+    """Investigator / Context Gatherer stand-in serving fixed facts"""
+
+    def __init__(self, facts):
+        self.facts = facts
+
+    def prefetch(self, subject_ids):
+        pass
+
+    def clear_prefetch(self):
+        pass
+
+    def investigate(self, alert):
+        return {"status": "success", "data": self.facts[alert["subject_id"]]}
+
+    def gather_context(self, alert):
+        return {"status": "success", "data": {}}
+
+
+def test_failing_alert_counted_as_error():
+    amounts = [5, 50, 500] * 20 + [None]
+    alerts = [
+        {"alert_id": f"T-{i}", "scenario_code": "TEST", "subject_id": f"S-{i}"}
+        for i in range(len(amounts))
+    ]
+    spoke = Spoke({f"S-{i}": {"amount": amount} for i, amount in enumerate(amounts)})
+    report = replay(
+        alerts, rules(10), rules(100), chunksize=16,
+        investigator=spoke, context_gatherer=spoke
+    )
+    assert report.errors == 1
+    assert report.alerts == 60
+    assert report.flipped == 20
@@ -0,0 +1,32 @@
+"""
+Rule engine tests
+A compiled rule set cannot be changed in place, but still pickles for shard nodes
+"""
+
+import pickle
+
+import pytest
+
+from agents.rule_engine import default_rules
+
+
+@pytest.mark.parametrize("mutate", [
+    lambda rules: rules.__setitem__("NEW", None),
+    lambda rules: rules.__delitem__("STRUCTURING"),
+    lambda rules: rules.update({}),
+    lambda rules: rules.pop("STRUCTURING"),
+    lambda rules: rules.clear(),
+    lambda rules: setattr(rules, "version", "other"),
+])
+def test_rule_set_is_immutable(mutate):
+    rules = default_rules()
+    with pytest.raises(TypeError):
+        mutate(rules)
+    assert len(rules) == 5 and "NEW" not in rules
+
+
+def test_rule_set_pickles():
+    rules = default_rules()
+    copy = pickle.loads(pickle.dumps(rules))
+    assert type(copy) is type(rules)
+    assert (copy.version, copy.source, sorted(copy)) == (rules.version, rules.source, sorted(rules))
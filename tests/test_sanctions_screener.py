@@ -0,0 +1,41 @@
+"""
+Sanctions screener tests
+The NumPy and pure-Python scorers prune to the same candidates and agree with brute force
+"""
+
+import random
+
+import pytest
+
+from benchmarks.bench_sanctions import brute_force, perturb, synthetic_list
+from data.sanctions_screener import SanctionsScreener, _numpy, normalize_name, trigrams
+
+
+@pytest.fixture(scope="module")
+def entries():
+    return synthetic_list(2000)
+
+
+def queries(entries, count=200):
+    rng = random.Random(3)
+    return [perturb(rng.choice(entries).name, rng) for _ in range(count)] + ["", "ZZ", "TRADING"]
+
+
+@pytest.mark.parametrize("min_score", [0.5, 0.7, 0.9])
+def test_numpy_and_python_scores_match(entries, min_score):
+    if _numpy() is None:
+        pytest.skip("NumPy not installed")
+    screener = SanctionsScreener(entries)
+    for name in queries(entries):
+        query = trigrams(normalize_name(name))
+        if not query:
+            continue
+        expected = sorted(screener._score_python(query, min_score))
+        assert sorted(screener._score_numpy(query, min_score)) == expected
+
+
+def test_best_score_matches_brute_force(entries):
+    small = entries[:300]
+    screener = SanctionsScreener(small)
+    for name in queries(small, 50):
+        assert screener.best_score(name, 0.6) == brute_force(small, name, 0.6)
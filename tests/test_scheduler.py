@@ -0,0 +1,32 @@
+"""
+Scheduler tests
+An alert whose ticket cannot be computed still runs, under the default class and deadline
+"""
+
+from agents import AlertScheduler, OrchestratorAgent
+from config import DEFAULT_PRIORITY_CLASS
+
+
+class BrokenStore:
+    """KYC store whose lookups fail"""
+
+    def get(self, subject_id):
+        raise OSError("KYC store unavailable")
+
+
+def test_ticket_errors_fall_back_to_default_ticket():
+    alerts = [
+        {"alert_id": f"A-{i}", "scenario_code": "SANCTIONS_MATCH", "subject_id": f"CUST-{i}"}
+        for i in range(4)
+    ]
+    alerts[1]["risk_rating"] = "HIGH"   # needs no store lookup
+    scheduler = AlertScheduler(store=BrokenStore())
+    orchestrator = OrchestratorAgent()
+    try:
+        results = list(orchestrator.process_batch(alerts, workers=1, scheduler=scheduler))
+    finally:
+        orchestrator.close()
+    assert sorted(result.alert["alert_id"] for result in results) == [a["alert_id"] for a in alerts]
+    assert all(result.error is None for result in results)
+    assert scheduler.ticket_errors == 3
+    assert scheduler.completed[DEFAULT_PRIORITY_CLASS] == 3
@@ -0,0 +1,49 @@
+"""
+Shard rule set tests
+Shard nodes decide under the coordinator's active rule set, even when spawned and after a reload
+"""
+
+import multiprocessing
+import pickle
+
+from agents import ShardCoordinator
+from agents.rule_engine import compile_rules
+from agents.rule_sets import set_rule_set
+from config import SOP_RULES
+
+
+def alerts(prefix, count):
+    return [
+        {"alert_id": f"{prefix}-{i}", "scenario_code": "DORMANT_ACCOUNT",
+         "subject_id": f"CUST-{i}"}
+        for i in range(count)
+    ]
+
+
+def test_rule_set_pickles_as_definitions():
+    rule_set = compile_rules(SOP_RULES, version="pickled")
+    copy = pickle.loads(pickle.dumps(rule_set))
+    assert copy.version == "pickled" and sorted(copy) == sorted(rule_set)
+    case = ({"alert_id": "A-1", "scenario_code": "STRUCTURING"}, {"data": {}}, {"data": {}})
+    assert copy["STRUCTURING"].decide(*case) == rule_set["STRUCTURING"].decide(*case)
+
+
+def test_spawned_nodes_follow_the_active_rule_set():
+    previous = set_rule_set(compile_rules(SOP_RULES, version="v1"))
+    coordinator = ShardCoordinator(
+        2, chunksize=2, max_in_flight=1, mp_context=multiprocessing.get_context("spawn")
+    )
+
+    def stream():
+        yield from alerts("A", 4)
+        # Hot reload mid-run - later chunks must be decided under v2
+        set_rule_set(compile_rules(SOP_RULES, version="v2"))
+        yield from alerts("B", 4)
+
+    try:
+        results = list(coordinator.process(stream()))
+    finally:
+        set_rule_set(previous)
+    versions = {result.alert["alert_id"]: result.decision["rule_set_version"] for result in results}
+    assert [result.error for result in results] == [None] * 8
+    assert {versions[f"B-{i}"] for i in range(4)} == {"v2"}
@@ -1,7 +1,42 @@
 """
 Utilities module initialization
+
+Exports are resolved on first access (PEP 562), like the data and agents packages.
 """
 
-from .logger import AuditLogger
+import importlib
+
+# Exported name -> submodule defining it
+_EXPORTS = {
+    'AuditLogger': 'logger',
+    'configure_logging': 'logger',
+    'shutdown_logging': 'logger',
+    'LogSink': 'log_sinks',
+    'ConsoleSink': 'log_sinks',
+    'JsonlFileSink': 'log_sinks',
+    'Counter': 'metrics',
+    'Histogram': 'metrics',
+    'MetricsRegistry': 'metrics',
+    'get_metrics': 'metrics',
+    'ProgressJournal': 'journal',
+    'idempotency_key': 'journal',
+    'DEBUG': 'logger',
+    'INFO': 'logger',
+    'WARNING': 'logger',
+    'ERROR': 'logger'
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
 
-__all__ = ['AuditLogger']
\ No newline at end of file
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
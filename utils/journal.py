@@ -0,0 +1,172 @@
+"""
+Progress Journal
+Append-only, fsync-batched record of per-alert progress for checkpoint / resume
+
+Every adjudicated alert appends a "decided" record holding its decision and
+every executed action an "actioned" record carrying the action's
+idempotency key. On open the journal is replayed into in-memory sets, so a
+resumed run skips completed alerts and already executed actions with one set
+lookup each, and actions an alert decided but not actioned by an earlier run
+from its journaled decision instead of investigating it again.
+
+Records are flushed and fsync'ed every `fsync_every` records or
+`fsync_interval` seconds, whichever comes first, and on close - a crash can
+lose at most that last unsynced batch. Actions in it would be repeated after
+a restart, which is why each action carries an idempotency key that
+downstream systems can deduplicate on. A torn final line left by a crash is
+dropped when the journal is reopened.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+
+
+def idempotency_key(alert_id, action):
+    """Stable key of one action for one alert - the same across runs and restarts"""
+    return hashlib.sha256(f"{alert_id}\x1f{action}".encode("utf-8")).hexdigest()[:32]
+
+
+class ProgressJournal:
+    """Append-only JSONL journal of decided alerts and executed actions"""
+
+    def __init__(self, path, fsync_every=64, fsync_interval=1.0, clock=time.monotonic):
+        """
+        Args:
+            path: Journal file (created if missing, appended to otherwise)
+            fsync_every: Records written between fsyncs
+            fsync_interval: Longest time in seconds a record may stay unsynced
+                            (checked as records are written)
+            clock: Monotonic time source
+        """
+        self.path = path
+        self.fsync_every = fsync_every
+        self.fsync_interval = fsync_interval
+        self.clock = clock
+        self.decided = {}       # alert_id -> journaled decision fields
+        self.completed = set()  # alert_ids with an executed action
+        self.actioned = set()   # idempotency keys of executed actions
+        self.skipped = 0
+        self.reused = 0
+        self._claimed = set()   # keys handed to the executor but not yet recorded
+        self._unsynced = 0
+        self._lock = threading.Lock()
+        self._replay()
+        self._file = open(path, "a", encoding="utf-8")
+        self._last_sync = clock()
+
+    def pending(self, alerts):
+        """Yield the alerts that have not completed yet (counts the rest in `skipped`)"""
+        completed = self.completed
+        for alert in alerts:
+            if alert["alert_id"] in completed:
+                self.skipped += 1
+                continue
+            yield alert
+
+    def reuse_decision(self, alert_id):
+        """
+        The decision an earlier run journaled for an alert it did not action
+
+        Returns:
+            Dict of the decision's fields (counted in `reused`), or None
+        """
+        decision = self.decided.get(alert_id)
+        if decision is None or alert_id in self.completed:
+            return None
+        self.reused += 1
+        return decision
+
+    def record_decision(self, alert_id, decision):
+        """Journal that an alert was adjudicated"""
+        # A deferred rationale is journaled unrendered, as (template, params)
+        fields = decision.to_dict(render=False) if hasattr(decision, "to_dict") else dict(decision)
+        with self._lock:
+            self.decided[alert_id] = fields
+            self._write({"stage": "decided", "alert_id": alert_id, "decision": fields})
+
+    def claim(self, key):
+        """
+        Reserve an action for execution
+
+        Returns:
+            False if the action already ran (in this or an earlier run) or is in flight
+        """
+        with self._lock:
+            if key in self.actioned or key in self._claimed:
+                return False
+            self._claimed.add(key)
+            return True
+
+    def record_action(self, key, alert_id, action):
+        """Journal that an action was executed (or delivered downstream)"""
+        with self._lock:
+            self._claimed.discard(key)
+            self.actioned.add(key)
+            self.completed.add(alert_id)
+            self._write({"stage": "actioned", "alert_id": alert_id, "action": action, "key": key})
+
+    def release(self, key):
+        """Give up a claim whose action failed, so a later run retries it"""
+        with self._lock:
+            self._claimed.discard(key)
+
+    def sync(self):
+        """Flush and fsync everything written so far"""
+        with self._lock:
+            self._sync_locked()
+
+    def close(self):
+        with self._lock:
+            if self._file.closed:
+                return
+            self._sync_locked()
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _write(self, record):
+        self._file.write(json.dumps(record, separators=(",", ":")) + "\n")
+        self._unsynced += 1
+        if (self._unsynced >= self.fsync_every
+                or self.clock() - self._last_sync >= self.fsync_interval):
+            self._sync_locked()
+
+    def _sync_locked(self):
+        if self._unsynced:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._unsynced = 0
+        self._last_sync = self.clock()
+
+    def _replay(self):
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "rb+") as stream:
+            data = stream.read()
+            end = data.rfind(b"\n") + 1
+            if end < len(data):
+                # Torn write from a crash - drop the partial record
+                stream.truncate(end)
+        for line in data[:end].splitlines():
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            if record["stage"] == "decided":
+                decision = record.get("decision")
+                if decision is None:
+                    # Written before decisions were journaled - the alert is decided again
+                    continue
+                rationale = decision.get("rationale")
+                if isinstance(rationale, list):
+                    decision["rationale"] = (rationale[0], tuple(rationale[1]))
+                self.decided[record["alert_id"]] = decision
+            elif record["stage"] == "actioned":
+                self.actioned.add(record["key"])
+                self.completed.add(record["alert_id"])
@@ -0,0 +1,250 @@
+"""
+Audit Trail Sinks
+Destinations for audit events emitted by AuditLogger - console text and buffered JSONL files
+"""
+
+import atexit
+import json
+import os
+import queue
+import sys
+import threading
+import time
+from collections.abc import Mapping
+
+# Event levels - the logging module's values, without importing it at startup
+DEBUG = 10
+INFO = 20
+WARNING = 30
+ERROR = 40
+CRITICAL = 50
+
+
+def _json_default(value):
+    # Dict-like records (alerts, evidence, decisions) serialise as objects
+    if isinstance(value, Mapping):
+        return dict(value)
+    return str(value)
+
+
+def render_message(event):
+    """Interpolate deferred printf-style args of an agent_action event"""
+    args = event.get("args")
+    return event["message"] % args if args else event["message"]
+
+
+class LogSink:
+    """Base sink - receives structured audit events at or above its level"""
+
+    def __init__(self, level=DEBUG):
+        self.level = level
+
+    def emit(self, event):
+        """Consume one event dictionary (must be cheap - called on the hot path)"""
+        raise NotImplementedError
+
+    def flush(self):
+        """Push any buffered events to their destination"""
+
+    def close(self):
+        """Flush and release resources"""
+        self.flush()
+
+
+class ConsoleSink(LogSink):
+    """Renders events as the human-readable console audit trail"""
+
+    def __init__(self, stream=None, level=DEBUG):
+        super().__init__(level)
+        self.stream = stream
+        self._ts_second = None
+        self._ts_text = ""
+
+    def emit(self, event):
+        render = getattr(self, "_render_" + event["event"], None)
+        if render is None:
+            return
+        stream = self.stream or sys.stdout
+        stream.write(render(event))
+
+    def flush(self):
+        (self.stream or sys.stdout).flush()
+
+    def _clock(self, ts):
+        # strftime only once per wall-clock second
+        second = int(ts)
+        if second != self._ts_second:
+            self._ts_second = second
+            self._ts_text = time.strftime("%H:%M:%S", time.localtime(second))
+        return self._ts_text
+
+    def _render_alert_start(self, event):
+        return (
+            "\n" + "=" * 70 + "\n"
+            f" PROCESSING ALERT: {event['alert_id']} | Scenario: {event['scenario_code']}\n"
+            + "=" * 70 + "\n"
+        )
+
+    def _render_agent_action(self, event):
+        return f"[{self._clock(event['ts'])}] [{event['agent']}] {render_message(event)}\n"
+
+    def _render_data_retrieval(self, event):
+        lines = [f"    └─  Data Retrieved from {event['source']}:"]
+        for key, value in event["data"].items():
+            lines.append(f"       • {key}: {value}")
+        return "\n".join(lines) + "\n"
+
+    def _render_decision(self, event):
+        decision = event["decision"]
+        return (
+            "\n" + "-" * 70 + "\n"
+            "ADJUDICATION DECISION\n"
+            + "-" * 70 + "\n"
+            f"Recommendation: {decision['recommendation']}\n"
+            f"Confidence: {decision['confidence'] * 100:.1f}%\n"
+            f"Rationale: {decision['rationale']}\n"
+            + "-" * 70 + "\n"
+        )
+
+    def _render_action_execution(self, event):
+        return (
+            "\n" + "ACTION EXECUTION" + "\n" + "=" * 70 + "\n"
+            f"Action Type: {event['action_type']}\n"
+            f"Details:\n{event['details']}\n"
+            + "=" * 70 + "\n\n"
+        )
+
+    def _render_action_result(self, event):
+        return (
+            "\n" + "=" * 70 + "\n"
+            "ACTION EXECUTION\n"
+            + "=" * 70 + "\n"
+            + "".join(line + "\n" for line in event["lines"])
+            + "=" * 70 + "\n\n"
+        )
+
+    def _render_alert_linked(self, event):
+        return (
+            f"[{self._clock(event['ts'])}] Alert {event['alert_id']} coalesced with "
+            f"{event['leader_id']} ({event['subject_id']} / {event['scenario_code']}) - decision reused\n"
+        )
+
+    def _render_alert_complete(self, event):
+        return f"Alert {event['alert_id']} processing complete.\n\n"
+
+
+class JsonlFileSink(LogSink):
+    """
+    Appends events as JSON lines via a bounded queue and a background writer thread
+
+    emit() only enqueues; serialization and file I/O happen on the writer
+    thread in batches. Event payloads must not be mutated after logging.
+    When the queue is full, emit() blocks (block=True) or drops the event
+    and counts it in `dropped`. Events that cannot be serialized or written
+    (a disk error) are dropped and counted too; the writer keeps draining.
+    """
+
+    _STOP = object()
+
+    def __init__(self, path, level=DEBUG, max_queue=10000,
+                 batch_size=512, flush_interval=0.5, block=True):
+        super().__init__(level)
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.block = block
+        self.dropped = 0
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._closed = False
+        self._start()
+        atexit.register(self.close)
+        if hasattr(os, "register_at_fork"):
+            # Forked workers (process_batch) get their own queue and writer thread
+            os.register_at_fork(after_in_child=self._after_fork)
+
+    def emit(self, event):
+        try:
+            self._queue.put(event, block=self.block)
+        except queue.Full:
+            self.dropped += 1
+
+    def flush(self):
+        """Block until every event emitted so far has been written"""
+        if not self._closed:
+            self._queue.join()
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(self._STOP)
+        self._writer.join()
+        self._file.close()
+
+    def _start(self):
+        if self._closed:
+            return
+        self._queue = queue.Queue(maxsize=self._queue.maxsize)
+        self._file = open(self.path, "a", encoding="utf-8")
+        self._writer = threading.Thread(
+            target=self._run, name="aars-jsonl-writer", daemon=True
+        )
+        self._writer.start()
+
+    def _after_fork(self):
+        import multiprocessing.util
+
+        self._start()
+        # atexit does not run in multiprocessing children - their finalizers do
+        multiprocessing.util.Finalize(self, self.close, exitpriority=10)
+
+    def _run(self):
+        batch = []
+        stopping = False
+        while not stopping:
+            try:
+                item = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                continue
+            while True:
+                if item is self._STOP:
+                    self._queue.task_done()
+                    stopping = True
+                    break
+                batch.append(item)
+                if len(batch) >= self.batch_size:
+                    break
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+            if batch:
+                self._write(batch)
+                batch = []
+
+    def _write(self, batch):
+        # Every event is marked done whatever happens, or flush() / close() would hang
+        try:
+            lines = []
+            for event in batch:
+                try:
+                    lines.append(json.dumps(self._encode(event), default=_json_default) + "\n")
+                except Exception:
+                    self.dropped += 1
+            try:
+                self._file.write("".join(lines))
+                self._file.flush()
+            except Exception:
+                self.dropped += len(lines)
+        finally:
+            for _ in batch:
+                self._queue.task_done()
+
+    @staticmethod
+    def _encode(event):
+        if "args" not in event:
+            return event
+        event = dict(event)
+        event["message"] = render_message(event)
+        del event["args"]
+        return event
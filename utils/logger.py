@@ -1,54 +1,145 @@
 """
 Audit Trail Logger
-Provides formatted console output for tracking agent actions and decisions
+Emits structured audit events for agent actions and decisions to pluggable sinks
+
+By default events are rendered to the console. configure_logging() swaps in
+other sinks (e.g. a buffered JSONL file), raises the level threshold, or
+turns logging off entirely (quiet mode) so events are never even built.
 """
 
-from datetime import datetime
+import time
+
+from .log_sinks import CRITICAL, DEBUG, ERROR, INFO, WARNING, ConsoleSink
+
+# Above every level - nothing gets built or formatted
+_DISABLED = CRITICAL + 1
+
+_sinks = (ConsoleSink(),)
+_min_level = DEBUG
+
+
+def configure_logging(sinks=None, level=DEBUG, quiet=False):
+    """
+    Replace the active sinks shared by every AuditLogger
+
+    Args:
+        sinks: Iterable of LogSink instances (defaults to a single ConsoleSink)
+        level: Global threshold - events below it are dropped before formatting
+        quiet: Disable all audit output (no event is built or formatted)
+    """
+    global _sinks, _min_level
+    new_sinks = () if quiet else tuple(sinks if sinks is not None else (ConsoleSink(),))
+    old_sinks = _sinks
+    _sinks = new_sinks
+    _min_level = max(level, min((sink.level for sink in new_sinks), default=_DISABLED))
+    for sink in old_sinks:
+        if sink not in new_sinks:
+            sink.close()
+
+
+def shutdown_logging():
+    """Flush and close all sinks - subsequent events are discarded"""
+    configure_logging(quiet=True)
+
+
+def _emit(level, event):
+    for sink in _sinks:
+        if level >= sink.level:
+            sink.emit(event)
 
 
 class AuditLogger:
-    """Centralized logger for audit trail and console output"""
-    
+    """
+    Centralized logger for audit trail output
+
+    Instances are stateless handles - every agent's AuditLogger shares the
+    module-level sink configuration.
+    """
+
+    @staticmethod
+    def enabled(level=INFO):
+        """True when an event at this level would reach at least one sink"""
+        return level >= _min_level
+
     @staticmethod
     def log_alert_start(alert_id, scenario_code):
         """Log the beginning of alert processing"""
-        print("\n" + "=" * 70)
-        print(f" PROCESSING ALERT: {alert_id} | Scenario: {scenario_code}")
-        print("=" * 70)
-    
+        if INFO < _min_level:
+            return
+        _emit(INFO, {
+            "event": "alert_start", "ts": time.time(),
+            "alert_id": alert_id, "scenario_code": scenario_code
+        })
+
     @staticmethod
-    def log_agent_action(agent_name, message):
-        """Log an agent's action or decision"""
-        timestamp = datetime.now().strftime("%H:%M:%S")
-        print(f"[{timestamp}] [{agent_name}] {message}")
-    
+    def log_agent_action(agent_name, message, *args, level=INFO):
+        """
+        Log an agent's action or decision
+
+        Optional printf-style args are interpolated by the sink, so a
+        filtered-out message is never formatted.
+        """
+        if level < _min_level:
+            return
+        _emit(level, {
+            "event": "agent_action", "ts": time.time(), "level": level,
+            "agent": agent_name, "message": message, "args": args
+        })
+
     @staticmethod
     def log_data_retrieval(source, data_summary):
         """Log data retrieved from mock databases"""
-        print(f"    └─  Data Retrieved from {source}:")
-        for key, value in data_summary.items():
-            print(f"       • {key}: {value}")
-    
+        if DEBUG < _min_level:
+            return
+        _emit(DEBUG, {
+            "event": "data_retrieval", "ts": time.time(),
+            "source": source, "data": data_summary
+        })
+
     @staticmethod
     def log_decision(decision_data):
         """Log the adjudicator's final decision"""
-        print("\n" + "-" * 70)
-        print("ADJUDICATION DECISION")
-        print("-" * 70)
-        print(f"Recommendation: {decision_data['recommendation']}")
-        print(f"Confidence: {decision_data['confidence'] * 100:.1f}%")
-        print(f"Rationale: {decision_data['rationale']}")
-        print("-" * 70)
-    
+        if INFO < _min_level:
+            return
+        _emit(INFO, {
+            "event": "decision", "ts": time.time(), "decision": decision_data
+        })
+
     @staticmethod
     def log_action_execution(action_type, details):
         """Log simulated action execution"""
-        print("\n" + "ACTION EXECUTION" + "\n" + "=" * 70)
-        print(f"Action Type: {action_type}")
-        print(f"Details:\n{details}")
-        print("=" * 70 + "\n")
-    
+        if INFO < _min_level:
+            return
+        _emit(INFO, {
+            "event": "action_execution", "ts": time.time(),
+            "action_type": action_type, "details": details
+        })
+
+    @staticmethod
+    def log_action_result(alert_id, action, lines):
+        """Log the outcome of an executed resolution action"""
+        if INFO < _min_level:
+            return
+        _emit(INFO, {
+            "event": "action_result", "ts": time.time(),
+            "alert_id": alert_id, "action": action, "lines": lines
+        })
+
+    @staticmethod
+    def log_alert_linked(alert_id, leader_id, subject_id, scenario_code):
+        """Log an alert answered by the decision of an earlier duplicate"""
+        if INFO < _min_level:
+            return
+        _emit(INFO, {
+            "event": "alert_linked", "ts": time.time(), "alert_id": alert_id,
+            "leader_id": leader_id, "subject_id": subject_id, "scenario_code": scenario_code
+        })
+
     @staticmethod
     def log_alert_complete(alert_id):
         """Log completion of alert processing"""
-        print(f"Alert {alert_id} processing complete.\n")
\ No newline at end of file
+        if INFO < _min_level:
+            return
+        _emit(INFO, {
+            "event": "alert_complete", "ts": time.time(), "alert_id": alert_id
+        })
@@ -0,0 +1,319 @@
+"""
+Pipeline Metrics
+Low-overhead latency histograms and counters with Prometheus text and JSON export
+
+Metric families are registered once (usually at module import) on the
+process-wide registry; recording an observation is a bisect into fixed
+bucket bounds plus two additions. Each thread writes to its own shard,
+so the hot path takes no lock; readers sum the shards. Shards are never
+swapped out or reset under a writer - take() records how far each shard has
+been read instead. Worker processes drain their metrics back to the parent,
+which merges them, so batch runs report the whole pipeline.
+"""
+
+import json
+import math
+import threading
+from bisect import bisect_left
+from threading import get_ident
+
+# Seconds - 10µs to 10s
+DEFAULT_LATENCY_BUCKETS = (
+    0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005,
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+
+
+class Counter:
+    """Monotonically increasing count"""
+
+    def __init__(self):
+        self._shards = {}       # thread id -> [value, value already taken]
+        self._lock = threading.Lock()
+
+    @property
+    def value(self):
+        with self._lock:
+            return sum(shard[0] - shard[1] for shard in self._shards.values())
+
+    def inc(self, amount=1):
+        shard = self._shards.get(get_ident())
+        if shard is None:
+            shard = self._new_shard()
+        shard[0] += amount
+
+    def state(self):
+        return self.value
+
+    def take(self):
+        """Return the current state and reset"""
+        taken = 0
+        with self._lock:
+            for shard in self._shards.values():
+                value = shard[0]
+                taken += value - shard[1]
+                shard[1] = value
+        return taken
+
+    def merge(self, state):
+        self.inc(state)
+
+    def reset(self):
+        self.take()
+
+    def _new_shard(self):
+        with self._lock:
+            return self._shards.setdefault(get_ident(), [0, 0])
+
+
+class Histogram:
+    """Fixed-bucket histogram (buckets count observations <= their upper bound)"""
+
+    def __init__(self, bounds=DEFAULT_LATENCY_BUCKETS):
+        self.bounds = tuple(bounds)
+        self._shards = {}       # thread id -> bucket counts (+Inf last) followed by the sum
+        self._taken = {}        # thread id -> copy of its shard at the last take()
+        self._lock = threading.Lock()
+
+    @property
+    def counts(self):
+        return self._totals()[:-1]
+
+    @property
+    def sum(self):
+        return self._totals()[-1]
+
+    @property
+    def count(self):
+        return sum(self._totals()[:-1])
+
+    def observe(self, value):
+        shard = self._shards.get(get_ident())
+        if shard is None:
+            shard = self._new_shard()
+        shard[bisect_left(self.bounds, value)] += 1
+        shard[-1] += value
+
+    def quantile(self, fraction):
+        """Estimated quantile, interpolated linearly inside its bucket (None if empty)"""
+        counts = self.counts
+        total = sum(counts)
+        if not total:
+            return None
+        rank = fraction * total
+        seen = 0
+        for index, count in enumerate(counts):
+            if count and seen + count >= rank:
+                lower = self.bounds[index - 1] if index else 0.0
+                if index == len(self.bounds):
+                    return lower
+                return lower + (self.bounds[index] - lower) * (rank - seen) / count
+            seen += count
+        return self.bounds[-1]
+
+    def state(self):
+        totals = self._totals()
+        return (totals[:-1], totals[-1])
+
+    def take(self):
+        """Return the current state and reset"""
+        with self._lock:
+            shards = self._copy_shards()
+            totals = self._sum_shards(shards)
+            self._taken.update(shards)
+        return (totals[:-1], totals[-1])
+
+    def merge(self, state):
+        counts, total = state
+        shard = self._shards.get(get_ident())
+        if shard is None:
+            shard = self._new_shard()
+        for index, count in enumerate(counts):
+            shard[index] += count
+        shard[-1] += total
+
+    def reset(self):
+        self.take()
+
+    def _new_shard(self):
+        with self._lock:
+            return self._shards.setdefault(get_ident(), [0] * (len(self.bounds) + 1) + [0.0])
+
+    def _totals(self):
+        with self._lock:
+            return self._sum_shards(self._copy_shards())
+
+    def _copy_shards(self):
+        # One copy per shard, so take() marks as taken exactly what it returns
+        return {ident: shard[:] for ident, shard in self._shards.items()}
+
+    def _sum_shards(self, shards):
+        """Growth of the copied shards since the last take()"""
+        totals = [0] * (len(self.bounds) + 1) + [0.0]
+        for ident, shard in shards.items():
+            taken = self._taken.get(ident)
+            for index, value in enumerate(shard):
+                totals[index] += value if taken is None else value - taken[index]
+        return totals
+
+
+class MetricFamily:
+    """A named metric with one child per distinct set of label values"""
+
+    def __init__(self, kind, name, help_text, label_names, factory):
+        self.kind = kind
+        self.name = name
+        self.help = help_text
+        self.label_names = tuple(label_names)
+        self.children = {}
+        self._factory = factory
+        self._lock = threading.Lock()
+
+    def labels(self, *values):
+        """Child for these label values (positional, in label_names order)"""
+        child = self.children.get(values)
+        if child is None:
+            if len(values) != len(self.label_names):
+                raise ValueError(f"{self.name} expects labels {self.label_names}, got {values}")
+            with self._lock:
+                child = self.children.setdefault(values, self._factory())
+        return child
+
+
+class MetricsRegistry:
+    """Collection of metric families with export, drain and merge"""
+
+    def __init__(self):
+        self.families = {}
+        self._lock = threading.Lock()
+
+    def counter(self, name, help_text, label_names=()):
+        """Register (or fetch) a counter family - names should end in _total"""
+        return self._register("counter", name, help_text, label_names, Counter)
+
+    def histogram(self, name, help_text, label_names=(), bounds=DEFAULT_LATENCY_BUCKETS):
+        """Register (or fetch) a histogram family"""
+        return self._register("histogram", name, help_text, label_names, lambda: Histogram(bounds))
+
+    def _register(self, kind, name, help_text, label_names, factory):
+        with self._lock:
+            family = self.families.get(name)
+            if family is None:
+                family = self.families[name] = MetricFamily(kind, name, help_text, label_names, factory)
+            elif family.kind != kind or family.label_names != tuple(label_names):
+                raise ValueError(f"metric {name} already registered with a different type or labels")
+        return family
+
+    def drain(self):
+        """Picklable state of every series, resetting them (for shipping between processes)"""
+        drained = {}
+        for name, family in self.families.items():
+            series = []
+            for values, child in list(family.children.items()):
+                series.append((values, child.take()))
+            if series:
+                drained[name] = series
+        return drained
+
+    def merge(self, drained):
+        """Add state produced by drain() (e.g. in a worker process) into this registry"""
+        for name, series in drained.items():
+            family = self.families.get(name)
+            if family is None:
+                continue
+            for values, state in series:
+                family.labels(*values).merge(state)
+
+    def reset(self):
+        """Zero every series"""
+        for family in self.families.values():
+            for child in list(family.children.values()):
+                child.reset()
+
+    def snapshot(self):
+        """JSON-serialisable view of every series, with p50/p90/p99 estimates for histograms"""
+        result = {}
+        for name, family in sorted(self.families.items()):
+            series = []
+            for values, child in sorted(family.children.items()):
+                entry = {"labels": dict(zip(family.label_names, values))}
+                if family.kind == "counter":
+                    entry["value"] = child.value
+                else:
+                    entry.update({
+                        "count": child.count,
+                        "sum": child.sum,
+                        "p50": child.quantile(0.50),
+                        "p90": child.quantile(0.90),
+                        "p99": child.quantile(0.99),
+                        "buckets": dict(zip(
+                            [_format_bound(bound) for bound in child.bounds] + ["+Inf"],
+                            _cumulative(child.counts)
+                        ))
+                    })
+                series.append(entry)
+            result[name] = {"type": family.kind, "help": family.help, "series": series}
+        return result
+
+    def to_json(self, indent=2):
+        return json.dumps(self.snapshot(), indent=indent)
+
+    def to_prometheus(self):
+        """Prometheus text exposition format (version 0.0.4)"""
+        lines = []
+        for name, family in sorted(self.families.items()):
+            lines.append(f"# HELP {name} {_escape_help(family.help)}")
+            lines.append(f"# TYPE {name} {family.kind}")
+            for values, child in sorted(family.children.items()):
+                pairs = list(zip(family.label_names, values))
+                if family.kind == "counter":
+                    lines.append(f"{name}{_labels(pairs)} {child.value}")
+                    continue
+                cumulative = _cumulative(child.counts)
+                for bound, count in zip(child.bounds, cumulative):
+                    lines.append(f"{name}_bucket{_labels(pairs + [('le', _format_bound(bound))])} {count}")
+                lines.append(f"{name}_bucket{_labels(pairs + [('le', '+Inf')])} {cumulative[-1]}")
+                lines.append(f"{name}_sum{_labels(pairs)} {child.sum!r}")
+                lines.append(f"{name}_count{_labels(pairs)} {cumulative[-1]}")
+        return "\n".join(lines) + "\n"
+
+    def write(self, path):
+        """Write a JSON snapshot (.json) or Prometheus text (anything else) to path"""
+        text = self.to_json() + "\n" if path.endswith(".json") else self.to_prometheus()
+        with open(path, "w", encoding="utf-8") as stream:
+            stream.write(text)
+
+
+def _cumulative(counts):
+    total, result = 0, []
+    for count in counts:
+        total += count
+        result.append(total)
+    return result
+
+
+def _format_bound(bound):
+    return "+Inf" if math.isinf(bound) else repr(float(bound))
+
+
+def _escape_help(text):
+    return text.replace("\\", "\\\\").replace("\n", "\\n")
+
+
+def _escape_label(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(pairs):
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape_label(value)}"' for key, value in pairs) + "}"
+
+
+_registry = MetricsRegistry()
+
+
+def get_metrics():
+    """The process-wide metrics registry"""
+    return _registry